@@ -8,101 +8,9 @@ import os
 # Add parent directory to path to find modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import the TeamPredictionModel
-from ml_models.predict_winner import TeamPredictionModel
-from ml_models import player_availability, performance_factors
-from ml_models.player_availability import remove_players_and_get_team_data
-
-# Import other models
-from models.game_model import GameModel
-from models.prediction import PredictionModel
-from models.game_analysis import GameAnalysis
-from models.team_stats import TeamStats
-from models.player_stats import PlayerStats
-
-# Import NBA API packages
-from nba_api.stats.endpoints import teamdashboardbygeneralsplits, leaguedashteamstats
-from nba_api.stats.static import teams
-import pandas as pd
-
-# Dictionary to cache team stats to avoid repeated API calls
-team_stats_cache = {}
-
-# Load fallback data from CSV files
-def load_fallback_team_data():
-    try:
-        csv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'team_data.csv')
-        if os.path.exists(csv_path):
-            print(f"Loading fallback team data from {csv_path}")
-            df = pd.read_csv(csv_path)
-            
-            # Group by team and get the most recent data for each team
-            team_data = {}
-            for team_name, group in df.groupby('TEAM_NAME'):
-                # Get the most recent game data for this team
-                latest_data = group.sort_values('GAME_DATE', ascending=False).iloc[0]
-                
-                # Convert to the format our model expects
-                team_data[team_name] = {
-                    'W': int(latest_data['W']),
-                    'L': int(latest_data['L']),
-                    'W_PCT': float(latest_data['W_PCT']),
-                    'MIN': float(latest_data.get('MIN', 240)),
-                    'FGM': float(latest_data['FGM']),
-                    'FGA': float(latest_data['FGA']),
-                    'FG_PCT': float(latest_data['FG_PCT']),
-                    'FG3M': float(latest_data['FG3M']),
-                    'FG3A': float(latest_data['FG3A']),
-                    'FG3_PCT': float(latest_data['FG3_PCT']),
-                    'FTM': float(latest_data['FTM']),
-                    'FTA': float(latest_data['FTA']),
-                    'FT_PCT': float(latest_data['FT_PCT']),
-                    'OREB': float(latest_data['OREB']),
-                    'DREB': float(latest_data['DREB']),
-                    'REB': float(latest_data['REB']),
-                    'AST': float(latest_data['AST']),
-                    'STL': float(latest_data['STL']),
-                    'BLK': float(latest_data['BLK']),
-                    'TOV': float(latest_data['TOV']),
-                    'PF': float(latest_data['PF']),
-                    'PTS': float(latest_data['PTS']),
-                    'TEAM_ABBR': str(latest_data['TEAM_ABBREVIATION'])
-                }
-            return team_data
-        else:
-            print(f"Warning: Fallback team data file not found at {csv_path}")
-            return {}
-    except Exception as e:
-        print(f"Error loading fallback team data: {e}")
-        return {}
-
-# Load fallback data on startup
-fallback_team_data = load_fallback_team_data()
-
 app = Flask(__name__)
 CORS(app)
 
-# Initialize the ML prediction model
-try:
-    model_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml_models')
-    ml_prediction_model = TeamPredictionModel(
-        os.path.join(model_dir, "xgb_model.pkl"), 
-        os.path.join(model_dir, "scaler.pkl"), 
-        os.path.join(model_dir, "imputer.pkl"), 
-        os.path.join(model_dir, "x_columns.pkl")
-    )
-    print("ML prediction model loaded successfully")
-except Exception as e:
-    print(f"Error loading ML prediction model: {e}")
-    ml_prediction_model = None
-
-# Initialize other models
-game_model = GameModel()
-prediction_model = PredictionModel()
-game_analysis = GameAnalysis()
-team_stats = TeamStats()
-player_stats = PlayerStats()
-
 @app.route('/', methods=['GET'])
 def home():
     return jsonify({
@@ -115,16 +23,20 @@ def home():
             '/api/predict-winner',
             '/api/predict-teams',
             '/api/get-team-stats',
-            '/api/predict-with-performance-factors'
+            '/api/predict-with-performance-factors',
+            '/api/absence-scan'
         ]
     })
 
-# Import all the routes from the original app.py
+# Import all the routes from the original app.py; it loads models and data
+# lazily, so importing it does not pull in nba_api, pandas or the model
 from app import predict_winner, predict_teams, get_team_stats, predict_with_performance_factors
 from app import get_games, get_player_stats, get_prediction, run_simulation
-from app import get_teams, get_prediction_factors, get_game_analysis
+from app import get_teams, get_prediction_factors, get_game_analysis, absence_scan
 from app import get_team_standings, get_player_standings
 from app import get_team_offensive_stats, get_team_defensive_stats
+from app import reload_model, record_shadow_outcome, get_shadow_summary
+from app import get_metrics, start_request_timer, record_request_time
 
 # Map the routes to this app
 app.route('/api/predict-winner', methods=['POST'])(predict_winner)
@@ -138,10 +50,17 @@ app.route('/api/simulation', methods=['POST'])(run_simulation)
 app.route('/api/teams', methods=['GET'])(get_teams)
 app.route('/api/prediction-factors/<string:game_id>', methods=['GET'])(get_prediction_factors)
 app.route('/api/game-analysis/<string:game_id>', methods=['GET'])(get_game_analysis)
+app.route('/api/absence-scan', methods=['POST'])(absence_scan)
 app.route('/api/team-standings', methods=['GET'])(get_team_standings)
 app.route('/api/player-standings', methods=['GET'])(get_player_standings)
 app.route('/api/team-offensive-stats', methods=['GET'])(get_team_offensive_stats)
 app.route('/api/team-defensive-stats', methods=['GET'])(get_team_defensive_stats)
+app.route('/api/admin/reload-model', methods=['POST'])(reload_model)
+app.route('/api/admin/shadow-outcome', methods=['POST'])(record_shadow_outcome)
+app.route('/api/admin/shadow-summary', methods=['GET'])(get_shadow_summary)
+app.route('/api/metrics', methods=['GET'])(get_metrics)
+app.before_request(start_request_timer)
+app.teardown_request(record_request_time)
 
 # For Vercel serverless deployment
 def handler(request, context):
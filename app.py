@@ -1,39 +1,62 @@
-from flask import Flask, jsonify, request, send_from_directory, Response
+from flask import Flask, jsonify, request, send_from_directory, Response, g
 from flask_cors import CORS
 import random
 import datetime
+import importlib
+import importlib.util
 import os
 import json
-import pandas as pd
-import numpy as np
+import threading
+import time
 import traceback
 from urllib.parse import quote
 
-# NBA API imports
-try:
-    from nba_api.live.nba.endpoints import scoreboard
-    from nba_api.stats.static import teams
-    from nba_api.live.nba.endpoints import boxscore
-    from nba_api.stats.endpoints import teamdashboardbygeneralsplits, leaguedashteamstats, playercareerstats
-    NBA_API_AVAILABLE = True
-except ImportError:
+# nba_api endpoints, pandas, sklearn and xgboost are imported by the routes
+# that use them rather than here, so a cold start only pays for what the
+# first request needs (see benchmark_startup.py)
+NBA_API_AVAILABLE = importlib.util.find_spec('nba_api') is not None
+if not NBA_API_AVAILABLE:
     print("Warning: nba_api package not available. Will use fallback data.")
-    NBA_API_AVAILABLE = False
 
 # Import the TeamPredictionModel
 from ml_models.predict_winner import TeamPredictionModel
-from ml_models import player_availability, performance_factors
-from ml_models.player_availability import remove_players_and_get_team_data
+from ml_models.micro_batcher import PredictionBatcher
+from ml_models.feature_cache import TeamFeatureCache
+from ml_models.model_reloader import ModelReloader
+from ml_models.shadow import ShadowScorer, summarize_shadow_log
+from ml_models.metrics import metrics
+from ml_models.team_resolver import TeamResolver, get_team_resolver
 
-# Import other models
-from models.game_model import GameModel
-from models.prediction import PredictionModel
-from models.game_analysis import GameAnalysis
-from models.team_stats import TeamStats
-from models.player_stats import PlayerStats
+# The models/ helpers import nba_api, pandas and sklearn, so each one is
+# imported and constructed by the first route that needs it
+ROUTE_MODELS = {
+    'game_model': ('models.game_model', 'GameModel'),
+    'prediction_model': ('models.prediction', 'PredictionModel'),
+    'game_analysis': ('models.game_analysis', 'GameAnalysis'),
+    'team_stats': ('models.team_stats', 'TeamStats'),
+    'player_stats': ('models.player_stats', 'PlayerStats')
+}
+_route_models = {}
+_route_models_lock = threading.Lock()
+
+def get_route_model(name):
+    model = _route_models.get(name)
+    if model is None:
+        with _route_models_lock:
+            model = _route_models.get(name)
+            if model is None:
+                module_name, class_name = ROUTE_MODELS[name]
+                model = getattr(importlib.import_module(module_name), class_name)()
+                _route_models[name] = model
+    return model
 
 # Dictionary to cache team stats to avoid repeated API calls
 team_stats_cache = {}
+# Bumped whenever cached team stats are refreshed
+team_stats_version = 0
+
+# Resolves team names, nicknames, aliases, abbreviations and IDs in O(1)
+team_resolver = get_team_resolver() if NBA_API_AVAILABLE else TeamResolver(team_records=[])
 
 # Load fallback data from CSV files
 def load_fallback_team_data():
@@ -41,7 +64,8 @@ def load_fallback_team_data():
         csv_path = os.path.join('data', 'team_data.csv')
         if os.path.exists(csv_path):
             print(f"Loading fallback team data from {csv_path}")
-            df = pd.read_csv(csv_path)
+            from ml_models.data_store import get_data_store
+            df = get_data_store().team_games()
             
             # Group by team and get the most recent data for each team
             team_data = {}
@@ -83,31 +107,225 @@ def load_fallback_team_data():
         print(f"Error loading fallback team data: {e}")
         return {}
 
-# Load fallback data on startup
-fallback_team_data = load_fallback_team_data()
+# Fallback data is loaded by the first lookup that needs it
+fallback_team_data = None
+_fallback_lock = threading.Lock()
+
+def get_fallback_team_data():
+    global fallback_team_data
+    if fallback_team_data is None:
+        with _fallback_lock:
+            if fallback_team_data is None:
+                fallback_team_data = load_fallback_team_data()
+    return fallback_team_data
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize the ML prediction model
-try:
-    ml_prediction_model = TeamPredictionModel(
-        "ml_models/xgb_model.pkl", 
-        "ml_models/scaler.pkl", 
-        "ml_models/imputer.pkl", 
-        "ml_models/x_columns.pkl"
+# Time every request into a per-endpoint latency histogram
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.teardown_request
+def record_request_time(exc):
+    start = g.pop('request_start', None)
+    if start is not None:
+        metrics.record(f"endpoint.{request.endpoint or 'unmatched'}", time.perf_counter() - start)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Latency histograms (count, mean, p50/p95/p99, max in ms) for every instrumented stage"""
+    return jsonify(metrics.snapshot())
+
+# Load the ML prediction model
+def load_prediction_model():
+    try:
+        if os.path.exists("ml_models/model_bundle.bin"):
+            model = TeamPredictionModel.from_bundle(
+                "ml_models/model_bundle.bin",
+                backend=os.environ.get('MODEL_BACKEND', 'xgboost')
+            )
+        else:
+            model = TeamPredictionModel(
+                "ml_models/xgb_model.pkl", 
+                "ml_models/scaler.pkl", 
+                "ml_models/imputer.pkl", 
+                "ml_models/x_columns.pkl"
+            )
+        print("ML prediction model loaded successfully")
+        return model
+    except Exception as e:
+        print(f"Error loading ML prediction model: {e}")
+        return None
+
+# Optionally move model scoring into worker processes, off the request threads
+def start_inference_pool():
+    pool_workers = int(os.environ.get('INFERENCE_POOL_WORKERS', 0))
+    if pool_workers <= 0 or not os.path.exists("ml_models/model_bundle.bin"):
+        return None
+    try:
+        from ml_models.inference_pool import InferencePool
+        pool = InferencePool(
+            "ml_models/model_bundle.bin",
+            workers=pool_workers,
+            max_pending=int(os.environ.get('INFERENCE_POOL_MAX_PENDING', 32)),
+            backend=os.environ.get('MODEL_BACKEND', 'xgboost')
+        )
+        print(f"Inference pool started with {pool_workers} workers")
+        return pool
+    except Exception as e:
+        print(f"Error starting inference pool: {e}")
+        return None
+
+# Optionally score live traffic with a candidate model as well, off the request path
+def start_shadow_scorer():
+    if not os.environ.get('SHADOW_BUNDLE_PATH'):
+        return None
+    try:
+        scorer = ShadowScorer(
+            TeamPredictionModel.from_bundle(
+                os.environ['SHADOW_BUNDLE_PATH'],
+                backend=os.environ.get('MODEL_BACKEND', 'xgboost')
+            ),
+            os.environ.get('SHADOW_LOG_PATH', 'shadow_log.jsonl')
+        )
+        print(f"Shadow scoring with {os.environ['SHADOW_BUNDLE_PATH']}")
+        return scorer
+    except Exception as e:
+        print(f"Error loading shadow model: {e}")
+        return None
+
+# Batches the prediction batcher scores at once: scoring in this process is
+# done one batch at a time, while a pool needs a batch in flight per worker
+# process plus one being handed over
+def batcher_workers(pool):
+    if pool is None:
+        return 1
+    return int(os.environ.get('PREDICTION_BATCH_WORKERS', 2 * pool.workers))
+
+# Cache each team's preprocessed feature row between predictions
+def create_feature_cache(model, pool):
+    return TeamFeatureCache(
+        pool or model,
+        max_custom_entries=int(os.environ.get('FEATURE_CACHE_CUSTOM_ENTRIES', 256)),
+        shadow=shadow_scorer
     )
-    print("ML prediction model loaded successfully")
-except Exception as e:
-    print(f"Error loading ML prediction model: {e}")
-    ml_prediction_model = None
-
-# Initialize other models
-game_model = GameModel()
-prediction_model = PredictionModel()
-game_analysis = GameAnalysis()
-team_stats = TeamStats()
-player_stats = PlayerStats()
+
+# Every team the matchup matrix scores, by the name the scoreboard uses
+def matchup_matrix_teams():
+    return [team['nickname'] for team in team_resolver.teams()]
+
+# Cache win probabilities for every pair of teams, scored through the feature
+# cache from the same team stats as the per-request path and rebuilt in one
+# batch whenever those stats are refreshed
+def build_matchup_matrix(cache):
+    try:
+        from ml_models.matchup_matrix import MatchupMatrix
+        matrix = MatchupMatrix(cache, get_team_stats_from_api, lambda: team_stats_version, matchup_matrix_teams)
+        matrix.build()
+        return matrix
+    except Exception as e:
+        print(f"Error building matchup matrix: {e}")
+        return None
+
+# The model and everything built on it are created by the first request that
+# needs them (ensure_prediction_model); the matchup matrix by the first lookup
+ml_prediction_model = None
+shadow_scorer = None
+inference_pool = None
+feature_cache = None
+matchup_matrix = None
+_model_loaded = False
+_model_lock = threading.Lock()
+_matchup_matrix_lock = threading.Lock()
+
+# Coalesce concurrent prediction requests into batched model calls
+prediction_batcher = PredictionBatcher(
+    None,
+    max_batch_size=int(os.environ.get('PREDICTION_BATCH_SIZE', 64)),
+    max_wait=float(os.environ.get('PREDICTION_BATCH_WINDOW_MS', 2)) / 1000
+)
+
+def ensure_prediction_model():
+    """Loads the model, shadow scorer, inference pool and feature cache on first use and returns the model"""
+    global ml_prediction_model, shadow_scorer, inference_pool, feature_cache, _model_loaded
+    if _model_loaded:
+        return ml_prediction_model
+    with _model_lock:
+        if not _model_loaded:
+            model = load_prediction_model()
+            if model is not None:
+                shadow_scorer = start_shadow_scorer()
+                inference_pool = start_inference_pool()
+                feature_cache = create_feature_cache(model, inference_pool)
+                prediction_batcher.workers = batcher_workers(inference_pool)
+                prediction_batcher.model = feature_cache
+                if model_reloader.current_version is None:
+                    model_reloader.current_version = model.version
+            ml_prediction_model = model
+            _model_loaded = True
+    return ml_prediction_model
+
+def ensure_matchup_matrix():
+    """Builds the matchup matrix for every team on first use and returns it"""
+    global matchup_matrix
+    if matchup_matrix is None and ensure_prediction_model() is not None:
+        with _matchup_matrix_lock:
+            if matchup_matrix is None:
+                cache = feature_cache
+                matrix = build_matchup_matrix(cache)
+                with _model_lock:
+                    # A reload that swapped the cache meanwhile leaves this to the next lookup
+                    if feature_cache is cache:
+                        matchup_matrix = matrix
+    return matchup_matrix
+
+# Swap a freshly loaded and warmed model into service. Everything that depends
+# on the model is rebuilt first and then replaced by plain assignments, so
+# requests already in flight finish on the old objects.
+def swap_prediction_model(new_model):
+    global ml_prediction_model, shadow_scorer, inference_pool, feature_cache, matchup_matrix, _model_loaded
+    if not _model_loaded:
+        # First model served came from a reload rather than ensure_prediction_model()
+        shadow_scorer = start_shadow_scorer()
+    new_pool = start_inference_pool()
+    new_feature_cache = create_feature_cache(new_model, new_pool)
+    # Only rebuild the matrix if it was in use; otherwise the first lookup builds it
+    new_matchup_matrix = build_matchup_matrix(new_feature_cache) if matchup_matrix is not None else None
+
+    with _model_lock:
+        old_pool = inference_pool
+        ml_prediction_model = new_model
+        inference_pool = new_pool
+        feature_cache = new_feature_cache
+        matchup_matrix = new_matchup_matrix
+        prediction_batcher.workers = max(prediction_batcher.workers, batcher_workers(new_pool))
+        prediction_batcher.model = new_feature_cache
+        _model_loaded = True
+
+    if old_pool is not None:
+        # Let batches already queued on the old workers finish
+        old_pool.shutdown(wait=True)
+
+def smoke_matchups():
+    from ml_models.matchup_matrix import load_latest_team_stats
+    team_data = load_latest_team_stats(os.path.join('data', 'team_data.csv'))
+    abbrs = sorted(team_data)[:8]
+    return [(team_data[a], team_data[b]) for a, b in zip(abbrs[::2], abbrs[1::2])]
+
+# Reload the model from /admin/reload-model, when the bundle changes, or on
+# SIGHUP when app.py is run directly (installed in __main__ so that importing
+# the app does not take over a process-wide signal)
+model_reloader = ModelReloader(
+    "ml_models/model_bundle.bin",
+    swap_prediction_model,
+    smoke_matchups=smoke_matchups,
+    current_version=None,
+    backend=os.environ.get('MODEL_BACKEND', 'xgboost')
+)
+if float(os.environ.get('MODEL_RELOAD_POLL_SECONDS', 0)) > 0:
+    model_reloader.watch(float(os.environ['MODEL_RELOAD_POLL_SECONDS']))
 
 @app.route('/api/predict-winner', methods=['POST'])
 def predict_winner():
@@ -119,7 +337,10 @@ def predict_winner():
         if not team1_stats or not team2_stats:
             return jsonify({'error': 'Both team stats are required'}), 400
             
-        results = ml_prediction_model.predict(team1_stats, team2_stats)
+        if ensure_prediction_model() is None:
+            raise Exception("ML prediction model not loaded")
+            
+        results = prediction_batcher.predict(team1_stats, team2_stats)
         return jsonify(results)
     except Exception as e:
         print(f"Error in predict_winner: {e}")
@@ -166,6 +387,7 @@ def predict_teams():
 
 @app.route('/get-team-stats', methods=['POST'])
 def get_team_stats():
+    from ml_models.data_store import get_data_store
     data = request.get_json()
     team1_name = data.get('team1')
     team2_name = data.get('team2')
@@ -173,36 +395,21 @@ def get_team_stats():
     result = {'team_stats': {}}
     
     try:
-        # Load the team data
-        df_team = pd.read_csv('data/team_data.csv')
+        # Team game log indexed by team, parsed once per process
+        store = get_data_store()
         
-        # Get the most recent stats for each team
-        team1_recent = df_team[df_team['MATCHUP'].str.contains(team1_name)].iloc[-5:]
-        team2_recent = df_team[df_team['MATCHUP'].str.contains(team2_name)].iloc[-5:]
+        # Get the last 5 games for each team, by team ID or else abbreviation
+        def recent_games(team_name):
+            team = team_resolver.resolve(team_name, partial=True)
+            if team is None:
+                return store.last_team_games(team_name, 5)
+            recent = store.last_team_games(team['id'], 5)
+            if recent.empty:
+                recent = store.last_team_games(team['abbreviation'], 5)
+            return recent
         
-        # If we couldn't find data for the exact team names, try looking for abbreviations
-        if team1_recent.empty or team2_recent.empty:
-            # Sample NBA teams with abbreviations for fallback
-            team_abbrevs = {
-                'Lakers': 'LAL', 'Celtics': 'BOS', 'Warriors': 'GSW', 'Bucks': 'MIL',
-                'Heat': 'MIA', 'Suns': 'PHX', 'Mavericks': 'DAL', 'Nuggets': 'DEN',
-                'Cavaliers': 'CLE', 'Knicks': 'NYK', 'Clippers': 'LAC', 'Grizzlies': 'MEM',
-                'Thunder': 'OKC', 'Sixers': 'PHI', 'Spurs': 'SAS', 'Blazers': 'POR',
-                'Bulls': 'CHI', 'Rockets': 'HOU', 'Hornets': 'CHA', 'Nets': 'BKN',
-                'Magic': 'ORL', 'Pistons': 'DET', 'Hawks': 'ATL', 'Kings': 'SAC',
-                'Raptors': 'TOR', 'Pacers': 'IND', 'Timberwolves': 'MIN', 'Pelicans': 'NOP',
-                'Jazz': 'UTA', 'Wizards': 'WAS'
-            }
-            
-            # Try to find the team by abbrev if the full name doesn't work
-            team1_abbrev = next((abbr for team, abbr in team_abbrevs.items() if team1_name in team), None)
-            team2_abbrev = next((abbr for team, abbr in team_abbrevs.items() if team2_name in team), None)
-            
-            if team1_abbrev and team1_recent.empty:
-                team1_recent = df_team[df_team['MATCHUP'].str.contains(team1_abbrev)].iloc[-5:]
-                
-            if team2_abbrev and team2_recent.empty:
-                team2_recent = df_team[df_team['MATCHUP'].str.contains(team2_abbrev)].iloc[-5:]
+        team1_recent = recent_games(team1_name)
+        team2_recent = recent_games(team2_name)
         
         # Calculate average stats for recent games with some team-specific adjustments
         # to guarantee they're different
@@ -254,6 +461,7 @@ def get_team_stats():
 
 @app.route('/predict-with-performance-factors', methods=['POST'])
 def predict_with_performance_factors():
+    from ml_models.data_store import get_data_store
     try:
         data = request.get_json()
         team1_name = data.get('team1')
@@ -275,82 +483,41 @@ def predict_with_performance_factors():
         
         # Get player data from CSV
         try:
-            # Get player data
-            player_df = pd.read_csv("ml_models/updated_player_data.csv")
-            
-            # Map team names to team IDs
-            nba_teams = teams.get_teams()
-            team_name_to_id = {}
-            team_name_to_abbr = {}
-            
-            for team in nba_teams:
-                team_name_to_id[team['full_name'].lower()] = team['id']
-                team_name_to_abbr[team['full_name'].lower()] = team['abbreviation']
-            
-            # Get team IDs from team names
-            team1_id = None
-            team2_id = None
-            team1_abbr = None
-            team2_abbr = None
+            # Player name -> ID, current team and season averages, built once per data load
+            player_index = get_data_store().player_index()
+            # Impact factors of every player, computed once per data load
+            roster_impact = get_data_store().roster_impact()
             
-            # Try direct match
-            team1_lower = team1_name.lower()
-            team2_lower = team2_name.lower()
-            
-            if team1_lower in team_name_to_id:
-                team1_id = team_name_to_id[team1_lower]
-                team1_abbr = team_name_to_abbr[team1_lower]
-            else:
-                # Try partial match
-                for name, team_id in team_name_to_id.items():
-                    if team1_lower in name or name in team1_lower:
-                        team1_id = team_id
-                        team1_abbr = team_name_to_abbr[name]
-                        break
-            
-            if team2_lower in team_name_to_id:
-                team2_id = team_name_to_id[team2_lower]
-                team2_abbr = team_name_to_abbr[team2_lower]
-            else:
-                # Try partial match
-                for name, team_id in team_name_to_id.items():
-                    if team2_lower in name or name in team2_lower:
-                        team2_id = team_id
-                        team2_abbr = team_name_to_abbr[name]
-                        break
+            # Resolve team names to IDs and abbreviations (exact, then partial match)
+            team1_id = team_resolver.team_id(team1_name, partial=True)
+            team2_id = team_resolver.team_id(team2_name, partial=True)
+            team1_abbr = team_resolver.abbreviation(team1_name, partial=True)
+            team2_abbr = team_resolver.abbreviation(team2_name, partial=True)
             
             print(f"Team 1: {team1_name} -> ID: {team1_id}, ABBR: {team1_abbr}")
             print(f"Team 2: {team2_name} -> ID: {team2_id}, ABBR: {team2_abbr}")
             
             # 2. Identify inactive players and calculate their impacts
             player_ids_to_remove = []
-            player_name_to_id = {}
-            
-            # Map player names to IDs 
-            for index, row in player_df.iterrows():
-                player_name = row['PLAYER_NAME']
-                player_id = row['PLAYER_ID']
-                player_name_to_id[player_name] = player_id
             
             # For each inactive player, add their ID to the list to remove
             for player_name, is_inactive in inactive_players.items():
-                if is_inactive and player_name in player_name_to_id:
-                    player_id = player_name_to_id[player_name]
+                if is_inactive and player_name in player_index:
+                    player_id = player_index.player_id(player_name)
                     player_ids_to_remove.append(player_id)
                     
-                    # Calculate impact for this player
-                    player_row = player_df[player_df['PLAYER_ID'] == player_id]
-                    if not player_row.empty:
-                        # Calculate impact based on stats
-                        pts = float(player_row['PTS'].values[0])
-                        reb = float(player_row['REB'].values[0])
-                        ast = float(player_row['AST'].values[0])
-                        
-                        # Calculate impact with updated weights: 70% points, 10% rebounds, 20% assists
-                        raw_impact = (0.7 * pts + 0.1 * reb + 0.2 * ast) / 100.0
+                    # Look up this player's precomputed impact
+                    season_average = roster_impact.player_stats(player_id)
+                    if season_average is not None:
+                        # Impact from season-average stats: 70% points, 10% rebounds, 20% assists,
+                        # clamped between 1% and 20%
+                        pts = season_average['PTS']
+                        reb = season_average['REB']
+                        ast = season_average['AST']
+                        raw_impact = roster_impact.raw_impact(player_id, 'availability')
                         print(f"Player {player_name} stats: PTS={pts}, REB={reb}, AST={ast}")
                         print(f"Raw impact calculation: (0.7 * {pts} + 0.1 * {reb} + 0.2 * {ast}) / 100.0 = {raw_impact}")
-                        impact = min(max(raw_impact, 0.01), 0.20)  # Clamp between 1% and 20%
+                        impact = roster_impact.impact(player_id, 'availability')
                         
                         # Special case for Isaac Okoro and other Cleveland players
                         if "Cleveland" in team1_name or "Cavaliers" in team1_name or "Cleveland" in team2_name or "Cavaliers" in team2_name:
@@ -370,29 +537,23 @@ def predict_with_performance_factors():
             print(f"Player IDs to remove: {player_ids_to_remove}")
             print(f"Player impacts: {player_impacts}")
             
-            # First get baseline prediction without considering player availability or performance factors
-            baseline_prediction = get_prediction_for_teams(team1_name, team2_name)
-            
-            # Try to use the player_availability module's function if we have team IDs
-            if team1_id and team2_id and len(player_ids_to_remove) > 0:
+            # Re-score the matchup through the model with the inactive players'
+            # contributions removed from their team's stats
+            what_if_result = None
+            if team1_abbr and team2_abbr and len(player_ids_to_remove) > 0:
                 try:
-                    # Create a copy of the player dataframe
-                    df_copy = player_df.copy()
-                    df_copy.rename(columns={'TEAM_ABBREVIATION': 'TEAM_ABBR'}, inplace=True)
-                    
-                    # Make sure there is an appropriate GAME_ID column
-                    if 'GAME_ID' not in df_copy.columns:
-                        df_copy['GAME_ID'] = 0
-                    
-                    # Get adjusted team data using the module's function
-                    print(f"Calling remove_players_and_get_team_data with {len(player_ids_to_remove)} players to remove")
-                    adjusted_team1_data = player_availability.remove_players_and_get_team_data(df_copy, player_ids_to_remove, team1_id)
-                    adjusted_team2_data = player_availability.remove_players_and_get_team_data(df_copy, player_ids_to_remove, team2_id)
-                    
-                    print(f"Adjusted team1 data: {adjusted_team1_data}")
-                    print(f"Adjusted team2 data: {adjusted_team2_data}")
+                    ensure_prediction_model()
+                    cache = feature_cache
+                    if cache is not None:
+                        print(f"Scoring what-if with {len(player_ids_to_remove)} players removed")
+                        what_if_result = get_what_if_engine().score(
+                            prediction_batcher, cache, team1_abbr, team2_abbr, player_ids_to_remove
+                        )
+                    if what_if_result is not None:
+                        print(f"Adjusted team1 data: {what_if_result['team1_stats']}")
+                        print(f"Adjusted team2 data: {what_if_result['team2_stats']}")
                 except Exception as e:
-                    print(f"Error using remove_players_and_get_team_data: {e}")
+                    print(f"Error scoring what-if: {e}")
             
             # Apply impacts to win probabilities (simple linear adjustment)
             # Apply team1 impacts
@@ -404,12 +565,9 @@ def predict_with_performance_factors():
                 # Check which team the player belongs to
                 player_team_abbr = None
                 
-                # Look up player's team in player_df
-                if player_name in player_name_to_id:
-                    player_id = player_name_to_id[player_name]
-                    player_row = player_df[player_df['PLAYER_ID'] == player_id]
-                    if not player_row.empty:
-                        player_team_abbr = player_row['TEAM_ABBREVIATION'].values[0]
+                # Look up player's current team
+                if player_name in player_index:
+                    player_team_abbr = player_index.current_team_abbr(player_index.player_id(player_name))
                 
                 # Assign impact to appropriate team
                 if player_team_abbr == team1_abbr:
@@ -428,12 +586,19 @@ def predict_with_performance_factors():
                         team2_impact += impact
                         print(f"Fallback: Adding impact {impact} to team2 for {player_name}")
             
-            # FIXED: When team1 players are inactive (high team1_impact), their win probability should decrease
-            team1_win_prob = baseline_prediction['team1_win_probability'] * (1 - team1_impact)
-            team2_win_prob = baseline_prediction['team2_win_probability'] * (1 - team2_impact)
-            
             print(f"Team1 impact: {team1_impact}, Team2 impact: {team2_impact}")
-            print(f"Original probabilities: team1={baseline_prediction['team1_win_probability']}, team2={baseline_prediction['team2_win_probability']}")
+            if what_if_result is not None:
+                # Model scores of the adjusted team stats
+                team1_win_prob = float(what_if_result['adjusted']['team1_win_prob'])
+                team2_win_prob = float(what_if_result['adjusted']['team2_win_prob'])
+                print(f"Original probabilities: team1={float(what_if_result['baseline']['team1_win_prob'])}, team2={float(what_if_result['baseline']['team2_win_prob'])}")
+            else:
+                # No what-if scoring possible: scale the baseline prediction by the impacts.
+                # When team1 players are inactive (high team1_impact), their win probability should decrease
+                baseline_prediction = get_prediction_for_teams(team1_name, team2_name)
+                team1_win_prob = baseline_prediction['team1_win_probability'] * (1 - team1_impact)
+                team2_win_prob = baseline_prediction['team2_win_probability'] * (1 - team2_impact)
+                print(f"Original probabilities: team1={baseline_prediction['team1_win_probability']}, team2={baseline_prediction['team2_win_probability']}")
             print(f"Adjusted probabilities: team1={team1_win_prob}, team2={team2_win_prob}")
             
             # Normalize to ensure they sum to 1
@@ -450,6 +615,11 @@ def predict_with_performance_factors():
                 'player_impacts': player_impacts,  # Use calculated impacts
                 'performance_factors': {}
             }
+            if what_if_result is not None:
+                prediction['what_if'] = {
+                    'baseline_team1_win_prob': float(what_if_result['baseline']['team1_win_prob']),
+                    'baseline_team2_win_prob': float(what_if_result['baseline']['team2_win_prob'])
+                }
             
             # Ensure we have at least one player impact if there are inactive players
             if inactive_players and not player_impacts:
@@ -507,18 +677,16 @@ def get_games():
             # Try to get real data from NBA API with a short timeout
             print("Fetching game data from NBA API...")
             # Get today's scoreboard from the NBA API
-            score_board = scoreboard.ScoreBoard()
-            games_dict = score_board.get_dict()
+            with metrics.timer('nba_api.scoreboard'):
+                from nba_api.live.nba.endpoints import scoreboard
+                score_board = scoreboard.ScoreBoard()
+                games_dict = score_board.get_dict()
             
             # Check if we got valid data
             if 'scoreboard' in games_dict and 'games' in games_dict['scoreboard']:
                 api_games = games_dict['scoreboard']['games']
                 print(f"Found {len(api_games)} games from NBA API")
                 
-                # Get the teams info for logo URLs and abbreviations
-                nba_teams = teams.get_teams()
-                team_dict = {team['id']: team for team in nba_teams}
-                
                 # Process each game from the API
                 for game in api_games:
                     game_id = game['gameId']
@@ -916,6 +1084,7 @@ def get_games():
 def get_player_stats(player_id):
     """Get player career stats"""
     try:
+        from nba_api.stats.endpoints import playercareerstats
         career = playercareerstats.PlayerCareerStats(player_id=player_id)
         return jsonify(career.get_dict())
     except Exception as e:
@@ -926,7 +1095,7 @@ def get_prediction(game_id):
     """Get detailed prediction for a specific game"""
     try:
         # Use our prediction model
-        prediction = prediction_model.predict(game_id)
+        prediction = get_route_model('prediction_model').predict(game_id)
         return jsonify(prediction)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -941,7 +1110,7 @@ def run_simulation():
         player_adjustments = simulation_params.get('player_adjustments', {})
         
         # Use our prediction model for simulation
-        result = prediction_model.simulate(home_team, away_team, player_adjustments)
+        result = get_route_model('prediction_model').simulate(home_team, away_team, player_adjustments)
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -973,17 +1142,38 @@ def get_prediction_factors(game_id):
     """Get detailed explanation of prediction factors for transparency page"""
     try:
         # Use our prediction model to get explanation factors
-        factors = prediction_model.get_explanation_factors(game_id)
+        factors = get_route_model('prediction_model').get_explanation_factors(game_id)
         return jsonify(factors)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Helper function to format a TeamSummary entry for the game analysis view
+def team_analysis_stats(summary):
+    return {
+        'PPG': float(summary['PTS']),
+        '3PT': float(summary['FG3_PCT']) * 100,  # Convert to percentage
+        'REB': float(summary['REB']),
+        'AST': float(summary['AST']),
+        'STL': float(summary['STL']),
+        'BLK': float(summary['BLK']),
+        'W': int(summary['W']),
+        'L': int(summary['L']),
+        'W_PCT': float(summary['W_PCT']),
+        'LAST_5': [
+            {key: game[key] for key in ('opponent', 'result', 'score', 'date')}
+            for game in summary['LAST_5']
+        ],
+        'HOME_RECORD': summary['HOME_RECORD'],
+        'AWAY_RECORD': summary['AWAY_RECORD'],
+    }
+
 @app.route('/api/game-analysis/<game_id>', methods=['GET'])
 def get_game_analysis(game_id):
     """Get comprehensive game analysis for the View Analysis button"""
+    from ml_models.data_store import get_data_store
     try:
         # Get game details first
-        game_details = game_model.get_game(game_id)
+        game_details = get_route_model('game_model').get_game(game_id)
         if not game_details:
             return jsonify({'error': 'Game not found'}), 404
             
@@ -995,100 +1185,14 @@ def get_game_analysis(game_id):
         team2_stats = {}
         
         try:
-            # Use the CSV data for team stats
-            csv_path = os.path.join('data', 'team_data.csv')
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path)
-                
-                # Filter for most recent games for each team
-                team1_data = df[df['TEAM_NAME'] == team1_name].sort_values('GAME_DATE', ascending=False).iloc[0] if len(df[df['TEAM_NAME'] == team1_name]) > 0 else None
-                team2_data = df[df['TEAM_NAME'] == team2_name].sort_values('GAME_DATE', ascending=False).iloc[0] if len(df[df['TEAM_NAME'] == team2_name]) > 0 else None
-                
-                # Process team1 stats
-                if team1_data is not None:
-                    team1_stats = {
-                        'PPG': float(team1_data['PTS']),
-                        '3PT': float(team1_data['FG3_PCT']) * 100,  # Convert to percentage
-                        'REB': float(team1_data['REB']),
-                        'AST': float(team1_data['AST']),
-                        'STL': float(team1_data['STL']),
-                        'BLK': float(team1_data['BLK']),
-                        'W': int(team1_data['W']),
-                        'L': int(team1_data['L']),
-                        'W_PCT': float(team1_data['W_PCT']),
-                        'LAST_5': [], # Will be filled below
-                        'HOME_RECORD': '0-0',  # Placeholder
-                        'AWAY_RECORD': '0-0',  # Placeholder
-                    }
-                    
-                # Process team2 stats
-                if team2_data is not None:
-                    team2_stats = {
-                        'PPG': float(team2_data['PTS']),
-                        '3PT': float(team2_data['FG3_PCT']) * 100,  # Convert to percentage
-                        'REB': float(team2_data['REB']),
-                        'AST': float(team2_data['AST']),
-                        'STL': float(team2_data['STL']),
-                        'BLK': float(team2_data['BLK']),
-                        'W': int(team2_data['W']),
-                        'L': int(team2_data['L']),
-                        'W_PCT': float(team2_data['W_PCT']),
-                        'LAST_5': [], # Will be filled below
-                        'HOME_RECORD': '0-0',  # Placeholder
-                        'AWAY_RECORD': '0-0',  # Placeholder
-                    }
-                
-                # Try to get last 5 games for each team
-                try:
-                    team1_last_5 = df[df['TEAM_NAME'] == team1_name].sort_values('GAME_DATE', ascending=False).head(5)
-                    team2_last_5 = df[df['TEAM_NAME'] == team2_name].sort_values('GAME_DATE', ascending=False).head(5)
-                    
-                    # Process last 5 games for team1
-                    for _, game in team1_last_5.iterrows():
-                        if 'OPP_TEAM' in game and 'WL' in game and 'PTS' in game and 'OPP_PTS' in game:
-                            team1_stats['LAST_5'].append({
-                                'opponent': game['OPP_TEAM'],
-                                'result': 'W' if game.get('WL') == 'W' else 'L',
-                                'score': f"{int(game['PTS'])}-{int(game['OPP_PTS'])}",
-                                'date': game['GAME_DATE']
-                            })
-                    
-                    # Process last 5 games for team2
-                    for _, game in team2_last_5.iterrows():
-                        if 'OPP_TEAM' in game and 'WL' in game and 'PTS' in game and 'OPP_PTS' in game:
-                            team2_stats['LAST_5'].append({
-                                'opponent': game['OPP_TEAM'],
-                                'result': 'W' if game.get('WL') == 'W' else 'L',
-                                'score': f"{int(game['PTS'])}-{int(game['OPP_PTS'])}",
-                                'date': game['GAME_DATE']
-                            })
-                except Exception as e:
-                    print(f"Error processing last 5 games: {e}")
-                
-                # Try to calculate home/away records
-                try:
-                    if 'HOME_AWAY' in df.columns and 'WL' in df.columns:
-                        team1_home_games = df[(df['TEAM_NAME'] == team1_name) & (df['HOME_AWAY'] == 'HOME')]
-                        team1_home_wins = len(team1_home_games[team1_home_games['WL'] == 'W'])
-                        team1_home_losses = len(team1_home_games[team1_home_games['WL'] == 'L'])
-                        team1_stats['HOME_RECORD'] = f"{team1_home_wins}-{team1_home_losses}"
-                        
-                        team1_away_games = df[(df['TEAM_NAME'] == team1_name) & (df['HOME_AWAY'] == 'AWAY')]
-                        team1_away_wins = len(team1_away_games[team1_away_games['WL'] == 'W'])
-                        team1_away_losses = len(team1_away_games[team1_away_games['WL'] == 'L'])
-                        team1_stats['AWAY_RECORD'] = f"{team1_away_wins}-{team1_away_losses}"
-                        
-                        team2_home_games = df[(df['TEAM_NAME'] == team2_name) & (df['HOME_AWAY'] == 'HOME')]
-                        team2_home_wins = len(team2_home_games[team2_home_games['WL'] == 'W'])
-                        team2_home_losses = len(team2_home_games[team2_home_games['WL'] == 'L'])
-                        team2_stats['HOME_RECORD'] = f"{team2_home_wins}-{team2_home_losses}"
-                        
-                        team2_away_games = df[(df['TEAM_NAME'] == team2_name) & (df['HOME_AWAY'] == 'AWAY')]
-                        team2_away_wins = len(team2_away_games[team2_away_games['WL'] == 'W'])
-                        team2_away_losses = len(team2_away_games[team2_away_games['WL'] == 'L'])
-                        team2_stats['AWAY_RECORD'] = f"{team2_away_wins}-{team2_away_losses}"
-                except Exception as e:
-                    print(f"Error calculating home/away records: {e}")
+            # Latest record, last 5, home/away splits and averages, materialized per team
+            team_summary = get_data_store().team_summary()
+            team1_summary = team_summary.summary(team_resolver.abbreviation(team1_name))
+            team2_summary = team_summary.summary(team_resolver.abbreviation(team2_name))
+            if team1_summary is not None:
+                team1_stats = team_analysis_stats(team1_summary)
+            if team2_summary is not None:
+                team2_stats = team_analysis_stats(team2_summary)
         except Exception as e:
             print(f"Error processing CSV data: {e}")
             
@@ -1098,9 +1202,9 @@ def get_game_analysis(game_id):
         
         try:
             # Use player CSV data
-            player_csv_path = os.path.join('data', 'updated_player_data.csv')
+            player_csv_path = get_data_store().player_path
             if os.path.exists(player_csv_path):
-                player_df = pd.read_csv(player_csv_path)
+                player_df = get_data_store().players()
                 
                 # Get team abbreviations
                 team1_abbr = None
@@ -1115,73 +1219,17 @@ def get_game_analysis(game_id):
                     if len(team2_rows) > 0:
                         team2_abbr = team2_rows.iloc[0]['TEAM_ABBREVIATION']
                 else:
-                    # Try to map from NBA API teams
-                    try:
-                        nba_teams = teams.get_teams()
-                        for team in nba_teams:
-                            if team['full_name'] == team1_name:
-                                team1_abbr = team['abbreviation']
-                            if team['full_name'] == team2_name:
-                                team2_abbr = team['abbreviation']
-                    except Exception as e:
-                        print(f"Error mapping team names to abbreviations: {e}")
+                    # Map from the NBA API static teams
+                    team1_abbr = team_resolver.abbreviation(team1_name)
+                    team2_abbr = team_resolver.abbreviation(team2_name)
                 
-                # Process team1 players if we have the abbreviation
+                # Rosters sorted by points with impact factors (0.4 PTS, 0.2 REB, 0.2 AST,
+                # 0.1 STL, 0.1 BLK), computed once per team and data load
+                roster_impact = get_data_store().roster_impact()
                 if team1_abbr:
-                    team1_players_df = player_df[player_df['TEAM_ABBREVIATION'] == team1_abbr].sort_values('PTS', ascending=False)
-                    for _, player in team1_players_df.iterrows():
-                        try:
-                            # Calculate player impact factor using the same formula as in predict_with_performance_factors
-                            pts = float(player['PTS'])
-                            reb = float(player['REB'])
-                            ast = float(player['AST'])
-                            stl = float(player['STL'])
-                            blk = float(player['BLK'])
-                            
-                            raw_impact = (0.4 * pts + 0.2 * reb + 0.2 * ast + 0.1 * stl + 0.1 * blk)
-                            impact_factor = raw_impact / 100.0
-                            impact_factor = min(max(impact_factor, 0.01), 0.20)
-                            impact_factor = round(impact_factor, 3)
-                            
-                            team1_players.append({
-                                'name': player['PLAYER_NAME'],
-                                'pts': pts,
-                                'reb': reb,
-                                'ast': ast,
-                                'stl': stl,
-                                'blk': blk,
-                                'impact_factor': impact_factor
-                            })
-                        except Exception as e:
-                            print(f"Error processing player {player.get('PLAYER_NAME', 'unknown')}: {e}")
-                
-                # Process team2 players if we have the abbreviation
+                    team1_players = roster_impact.team_roster(team1_abbr, 'analysis')
                 if team2_abbr:
-                    team2_players_df = player_df[player_df['TEAM_ABBREVIATION'] == team2_abbr].sort_values('PTS', ascending=False)
-                    for _, player in team2_players_df.iterrows():
-                        try:
-                            pts = float(player['PTS'])
-                            reb = float(player['REB'])
-                            ast = float(player['AST'])
-                            stl = float(player['STL'])
-                            blk = float(player['BLK'])
-                            
-                            raw_impact = (0.4 * pts + 0.2 * reb + 0.2 * ast + 0.1 * stl + 0.1 * blk)
-                            impact_factor = raw_impact / 100.0
-                            impact_factor = min(max(impact_factor, 0.01), 0.20)
-                            impact_factor = round(impact_factor, 3)
-                            
-                            team2_players.append({
-                                'name': player['PLAYER_NAME'],
-                                'pts': pts,
-                                'reb': reb,
-                                'ast': ast,
-                                'stl': stl,
-                                'blk': blk,
-                                'impact_factor': impact_factor
-                            })
-                        except Exception as e:
-                            print(f"Error processing player {player.get('PLAYER_NAME', 'unknown')}: {e}")
+                    team2_players = roster_impact.team_roster(team2_abbr, 'analysis')
         except Exception as e:
             print(f"Error processing player data: {e}")
         
@@ -1297,7 +1345,7 @@ def get_team_standings():
         print(f"Final values being sent to get_team_standings: conference={conference}, sort_by={sort_by}")
         
         # Use our team stats model to get standings with sorting
-        standings = team_stats.get_team_standings(conference, sort_by)
+        standings = get_route_model('team_stats').get_team_standings(conference, sort_by)
         
         # Log the number of teams returned after filtering
         if 'standings' in standings:
@@ -1342,7 +1390,7 @@ def get_player_standings():
         print(f"Final values being sent to get_player_standings: conference={conference}, stat_category={stat_category}")
         
         # Use our player stats model to get standings
-        standings = player_stats.get_player_standings(conference, stat_category)
+        standings = get_route_model('player_stats').get_player_standings(conference, stat_category)
         
         # Log the number of players returned after filtering
         if 'standings' in standings:
@@ -1360,7 +1408,7 @@ def get_team_offensive_stats():
         conference = request.args.get('conference', None)  # 'East', 'West', or None for all
         
         # Use our team stats model to get offensive stats
-        offensive_stats = team_stats.get_team_offensive_stats(conference)
+        offensive_stats = get_route_model('team_stats').get_team_offensive_stats(conference)
         return jsonify(offensive_stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1373,35 +1421,179 @@ def get_team_defensive_stats():
         conference = request.args.get('conference', None)  # 'East', 'West', or None for all
         
         # Use our team stats model to get defensive stats
-        defensive_stats = team_stats.get_team_defensive_stats(conference)
+        defensive_stats = get_route_model('team_stats').get_team_defensive_stats(conference)
         return jsonify(defensive_stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Helper function to get team ID from team name
-def get_team_id(team_name):
-    # Get all teams
-    nba_teams = teams.get_teams()
+def is_admin_request():
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    return bool(admin_token) and request.headers.get('X-Admin-Token') == admin_token
+
+@app.route('/admin/reload-model', methods=['POST'])
+def reload_model():
+    """Reload the prediction model from the bundle on disk without downtime"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    try:
+        wait = request.args.get('wait', 'false').lower() == 'true'
+        force = request.args.get('force', 'false').lower() == 'true'
+        started = model_reloader.reload(wait=wait, force=force)
+        return jsonify({
+            'reload_started': started,
+            'model_version': ml_prediction_model.version if ml_prediction_model is not None else None,
+            'last_error': model_reloader.last_error
+        }), 202 if started and not wait else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/admin/shadow-outcome', methods=['POST'])
+def record_shadow_outcome():
+    """Record a game result so shadow predictions can be scored for accuracy"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    ensure_prediction_model()
+    if shadow_scorer is None:
+        return jsonify({'error': 'Shadow scoring is not enabled'}), 404
     
-    # Try to find the team by name
-    team = next((team for team in nba_teams if team['full_name'].lower() == team_name.lower() 
-                 or team['nickname'].lower() == team_name.lower()), None)
+    try:
+        data = request.get_json()
+        if not data or 'team1' not in data or 'team2' not in data or 'team1_won' not in data:
+            return jsonify({'error': 'team1, team2 and team1_won are required'}), 400
+        
+        shadow_scorer.record_outcome(
+            team_resolver.abbreviation(data['team1']) or data['team1'],
+            team_resolver.abbreviation(data['team2']) or data['team2'],
+            data['team1_won'],
+            data.get('game_date')
+        )
+        return jsonify({'recorded': True})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/admin/shadow-summary', methods=['GET'])
+def get_shadow_summary():
+    """Compare latency and accuracy of the serving and shadow models"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    ensure_prediction_model()
+    if shadow_scorer is None:
+        return jsonify({'error': 'Shadow scoring is not enabled'}), 404
     
-    if team:
-        return team['id']
-    else:
-        # Handle special cases or abbreviations
-        if team_name.lower() == 'thunders' or team_name.lower() == 'thunder':
-            return 1610612760  # OKC Thunder
-        elif team_name.lower() == 'warriors':
-            return 1610612744  # Golden State Warriors
-        elif team_name.lower() == 'celtics':
-            return 1610612738  # Boston Celtics
-        elif team_name.lower() == 'nets':
-            return 1610612751  # Brooklyn Nets
-        else:
-            print(f"Could not find team ID for {team_name}")
-            return None
+    summary = summarize_shadow_log(shadow_scorer.log_path)
+    summary['dropped_batches'] = shadow_scorer.dropped
+    return jsonify(summary)
+
+# Re-scores matchups with players removed, reusing cached baseline team vectors
+what_if_engine = None
+
+def get_what_if_engine():
+    global what_if_engine
+    if what_if_engine is None:
+        from ml_models.data_store import get_data_store
+        from ml_models.what_if import WhatIfEngine
+        what_if_engine = WhatIfEngine(get_data_store())
+    return what_if_engine
+
+@app.route('/api/absence-scan', methods=['POST'])
+def absence_scan():
+    """Win probability of a matchup for every single-player absence and the top pair absences"""
+    try:
+        data = request.get_json()
+        if not data or not data.get('team1') or not data.get('team2'):
+            return jsonify({'error': 'team1 and team2 are required'}), 400
+
+        team1_abbr = team_resolver.abbreviation(data['team1'], partial=True)
+        team2_abbr = team_resolver.abbreviation(data['team2'], partial=True)
+        if not team1_abbr or not team2_abbr:
+            return jsonify({'error': 'Unknown team'}), 400
+
+        try:
+            max_pairs = int(data.get('max_pairs', 10))
+            pair_candidates = int(data.get('pair_candidates', 8))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_pairs and pair_candidates must be integers'}), 400
+        if max_pairs < 0 or pair_candidates < 0:
+            return jsonify({'error': 'max_pairs and pair_candidates must not be negative'}), 400
+
+        if ensure_prediction_model() is None or feature_cache is None:
+            raise Exception("ML prediction model not loaded")
+
+        # max_pairs is capped at MAX_SCAN_PAIRS and pair_candidates at the roster size
+        scan = get_what_if_engine().scan(
+            feature_cache, team1_abbr, team2_abbr,
+            max_pairs=max_pairs,
+            pair_candidates=pair_candidates
+        )
+        if scan is None:
+            return jsonify({'error': 'No stats available for these teams'}), 404
+
+        baseline = scan['baseline']
+        return jsonify({
+            'team1': team1_abbr,
+            'team2': team2_abbr,
+            'baseline': {
+                'team1_win_prob': float(baseline['team1_win_prob']),
+                'team2_win_prob': float(baseline['team2_win_prob'])
+            },
+            'singles': scan['singles'],
+            'pairs': scan['pairs']
+        })
+    except Exception as e:
+        print(f"Error in absence_scan: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Helper function to get team ID from team name
+def get_team_id(team_name):
+    team_id = team_resolver.team_id(team_name)
+    if team_id is None:
+        print(f"Could not find team ID for {team_name}")
+    return team_id
+
+# Helper function to look up a prediction in the precomputed matchup matrix
+def get_matrix_prediction(home_team_name, away_team_name):
+    matchup_matrix = ensure_matchup_matrix()
+    if matchup_matrix is None:
+        return None
+
+    # The matrix is keyed by nickname, whatever name the caller used
+    home_team = team_resolver.resolve(home_team_name)
+    away_team = team_resolver.resolve(away_team_name)
+    if not home_team or not away_team:
+        return None
+
+    try:
+        return matchup_matrix.lookup(home_team['nickname'], away_team['nickname'])
+    except Exception as e:
+        print(f"Error looking up matchup matrix: {e}")
+        return None
+
+# Helper function to drop cached team stats and their preprocessed features
+def refresh_team_stats():
+    global team_stats_version, fallback_team_data
+    team_stats_cache.clear()
+    fallback_team_data = None
+    team_stats_version += 1
+    if feature_cache is not None:
+        feature_cache.invalidate()
+
+# Team game log the cached team stats were taken from
+_team_stats_source = None
+
+# Helper function to refresh the cached team stats once the team CSV is reloaded
+def refresh_team_stats_if_stale():
+    global _team_stats_source
+    try:
+        from ml_models.data_store import get_data_store
+        games = get_data_store().team_games()
+    except Exception as e:
+        print(f"Error checking team data: {e}")
+        return
+    if _team_stats_source is not None and games is not _team_stats_source:
+        print("Team data changed on disk, refreshing cached team stats")
+        refresh_team_stats()
+    _team_stats_source = games
 
 # Helper function to get team stats from NBA API with fallback to CSV data
 def get_team_stats_from_api(team_name):
@@ -1411,6 +1603,7 @@ def get_team_stats_from_api(team_name):
         return team_stats_cache[team_name]
     
     # For the Home Page loading, prioritize using fallback data first to avoid API delays
+    fallback_team_data = get_fallback_team_data()
     if team_name in fallback_team_data:
         print(f"Using fallback data for {team_name} from CSV (fast path)")
         team_stats_cache[team_name] = fallback_team_data[team_name]  # Cache it
@@ -1430,19 +1623,21 @@ def get_team_stats_from_api(team_name):
         timeout_seconds = 10  # Reduced from 120 to 10 seconds
         
         # Get general team stats
-        team_stats = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
-            team_id=team_id,
-            per_mode_detailed='PerGame',
-            season='2024-25',  # Use current season
-            season_type_all_star='Regular Season',
-            timeout=timeout_seconds
-        )
-        
-        # Convert to pandas DataFrame
-        df = team_stats.get_data_frames()[0]
+        with metrics.timer('nba_api.team_dashboard'):
+            from nba_api.stats.endpoints import teamdashboardbygeneralsplits
+            team_stats = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
+                team_id=team_id,
+                per_mode_detailed='PerGame',
+                season='2024-25',  # Use current season
+                season_type_all_star='Regular Season',
+                timeout=timeout_seconds
+            )
+            
+            # Convert to pandas DataFrame
+            df = team_stats.get_data_frames()[0]
         
         # Skip league stats to improve performance
-        team_abbr = team_name[:3].upper()
+        team_abbr = team_resolver.abbreviation(team_name) or team_name[:3].upper()
         
         # Extract relevant stats and format them for our model
         stats = {
@@ -1490,12 +1685,38 @@ def get_team_stats_from_api(team_name):
         return None
 
 # Helper function to get predictions for teams by name
+@metrics.timed('prediction.total')
 def get_prediction_for_teams(home_team_name, away_team_name):
     print(f"Getting prediction for {home_team_name} vs {away_team_name}")
+    refresh_team_stats_if_stale()
+    
+    # Fast path: both teams are in the precomputed matchup matrix
+    with metrics.timer('prediction.matrix_lookup'):
+        matrix_prediction = get_matrix_prediction(home_team_name, away_team_name)
+    if matrix_prediction:
+        return matrix_prediction
     
     # Get team stats from NBA API with fallback to CSV data
-    home_stats = get_team_stats_from_api(home_team_name)
-    away_stats = get_team_stats_from_api(away_team_name)
+    with metrics.timer('prediction.team_stats'):
+        home_stats = get_team_stats_from_api(home_team_name)
+        away_stats = get_team_stats_from_api(away_team_name)
+    
+    # Real team stats reuse their cached feature rows; default stats below
+    # are scored as ad-hoc payloads. Hold on to this cache so the rows are
+    # scored by the model that built them, even if a reload swaps it out.
+    ensure_prediction_model()
+    cache = feature_cache
+    home_side = None
+    away_side = None
+    if cache is not None:
+        try:
+            with metrics.timer('prediction.features'):
+                if home_stats:
+                    home_side = cache.team_features(home_team_name, home_stats, team_stats_version)
+                if away_stats:
+                    away_side = cache.team_features(away_team_name, away_stats, team_stats_version)
+        except Exception as e:
+            print(f"Error preprocessing team features: {e}")
     
     # If we couldn't get stats from either API or CSV, use reasonable defaults
     if not home_stats:
@@ -1504,7 +1725,7 @@ def get_prediction_for_teams(home_team_name, away_team_name):
             'W': 25, 'L': 20, 'W_PCT': 0.55, 'MIN': 240, 'FGM': 40, 'FGA': 88, 'FG_PCT': 0.45,
             'FG3M': 12, 'FG3A': 34, 'FG3_PCT': 0.35, 'FTM': 19, 'FTA': 25, 'FT_PCT': 0.76,
             'OREB': 9, 'DREB': 33, 'REB': 42, 'AST': 24, 'STL': 7, 'BLK': 5, 'TOV': 14, 'PF': 19,
-            'PTS': 110, 'TEAM_ABBR': home_team_name[:3].upper()
+            'PTS': 110, 'TEAM_ABBR': team_resolver.abbreviation(home_team_name) or home_team_name[:3].upper()
         }
     
     if not away_stats:
@@ -1513,12 +1734,12 @@ def get_prediction_for_teams(home_team_name, away_team_name):
             'W': 25, 'L': 20, 'W_PCT': 0.55, 'MIN': 240, 'FGM': 40, 'FGA': 88, 'FG_PCT': 0.45,
             'FG3M': 12, 'FG3A': 34, 'FG3_PCT': 0.35, 'FTM': 19, 'FTA': 25, 'FT_PCT': 0.76,
             'OREB': 9, 'DREB': 33, 'REB': 42, 'AST': 24, 'STL': 7, 'BLK': 5, 'TOV': 14, 'PF': 19,
-            'PTS': 110, 'TEAM_ABBR': away_team_name[:3].upper()
+            'PTS': 110, 'TEAM_ABBR': team_resolver.abbreviation(away_team_name) or away_team_name[:3].upper()
         }
     
     # Get prediction
     try:
-        if ml_prediction_model is None:
+        if cache is None:
             raise Exception("ML prediction model not loaded")
             
         # Print detailed stats being passed to the model
@@ -1527,7 +1748,12 @@ def get_prediction_for_teams(home_team_name, away_team_name):
         print(f"Away team ({away_team_name}) stats: W-L: {away_stats['W']}-{away_stats['L']}, W_PCT: {away_stats['W_PCT']}, PTS: {away_stats['PTS']}")
         
         # Get prediction
-        results = ml_prediction_model.predict(home_stats, away_stats)
+        with metrics.timer('prediction.model'):
+            results = prediction_batcher.predict(
+                home_side if home_side is not None else home_stats,
+                away_side if away_side is not None else away_stats,
+                model=cache
+            )
         print(f"Prediction for {home_team_name} vs {away_team_name}: {results}")
         print(f"Team1 ({home_team_name}) win probability: {float(results['team1_win_prob']):.2f}")
         print(f"Team2 ({away_team_name}) win probability: {float(results['team2_win_prob']):.2f}")
@@ -1546,4 +1772,5 @@ def get_prediction_for_teams(home_team_name, away_team_name):
         }
 
 if __name__ == '__main__':
+    model_reloader.install_signal_handler()
     app.run(debug=True, host='0.0.0.0')
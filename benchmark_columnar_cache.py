@@ -0,0 +1,78 @@
+"""
+Compares loading the team and player CSVs with pd.read_csv against the
+binary columnar cache used by ml_models/data_store.py.
+
+Run from the repository root:
+    python benchmark_columnar_cache.py
+"""
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+from ml_models.columnar_cache import load_columnar, parse_minutes
+from ml_models.data_store import TEAM_DATA_PATH, PLAYER_DATA_PATH, TEAM_DTYPES, PLAYER_DTYPES
+
+REPEATS = 20
+
+
+def best_of(func, repeats=REPEATS):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_team_csv():
+    df = pd.read_csv(TEAM_DATA_PATH)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], format='%b %d, %Y')
+    return df
+
+
+def read_player_csv():
+    df = pd.read_csv(PLAYER_DATA_PATH)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], format='%Y-%m-%d')
+    df['MINUTES'] = parse_minutes(df['MIN'])
+    return df
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="columnar_cache_bench_")
+    try:
+        loaders = {
+            'team_data.csv': (
+                read_team_csv,
+                lambda: load_columnar(TEAM_DATA_PATH, TEAM_DTYPES,
+                                      parse_dates={'GAME_DATE': '%b %d, %Y'},
+                                      categorical=('TEAM_ABBR', 'WL'), cache_dir=cache_dir)
+            ),
+            'updated_player_data.csv': (
+                read_player_csv,
+                lambda: load_columnar(PLAYER_DATA_PATH, PLAYER_DTYPES,
+                                      parse_dates={'GAME_DATE': '%Y-%m-%d'},
+                                      categorical=('TEAM_ABBREVIATION',),
+                                      minutes={'MIN': 'MINUTES'}, cache_dir=cache_dir)
+            )
+        }
+
+        print(f"{'file':<26}{'rows':>8}{'read_csv ms':>14}{'cache build ms':>16}{'cache load ms':>15}{'speedup':>9}")
+        for name, (read_csv, load_cached) in loaders.items():
+            rows = len(read_csv())
+            csv_time = best_of(read_csv)
+
+            start = time.perf_counter()
+            load_cached()  # first call builds the cache
+            build_time = time.perf_counter() - start
+            cached_time = best_of(load_cached)
+
+            print(f"{name:<26}{rows:>8}{csv_time * 1000:>14.2f}{build_time * 1000:>16.2f}"
+                  f"{cached_time * 1000:>15.2f}{csv_time / cached_time:>8.1f}x")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
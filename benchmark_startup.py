@@ -0,0 +1,139 @@
+"""
+Measures cold-start import time and resident memory of the serving entry
+points and the ml_models modules they pull in.
+
+Each module is imported in a fresh interpreter so nothing is shared between
+measurements. Import time is the wall time of the import statement; memory
+is the process's peak RSS after the import, next to a bare interpreter's.
+
+--profile prints the slowest imports (from python -X importtime) behind
+each module. --check exits non-zero if a serving entry point imports a
+module in DEFERRED_IMPORTS or takes longer than IMPORT_BUDGET_MS, so
+cold-start regressions fail the run.
+
+Run from the repository root:
+    python benchmark_startup.py
+    python benchmark_startup.py app api.index   # only these modules
+    python benchmark_startup.py --profile app
+    python benchmark_startup.py --check
+"""
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPEATS = 3
+PROFILE_TOP = 15
+# Entry points must leave these to the routes that need them
+DEFERRED_IMPORTS = ['xgboost', 'sklearn', 'pandas', 'nba_api.stats.endpoints', 'nba_api.live.nba.endpoints']
+ENTRY_POINTS = ['app', 'api.index']
+IMPORT_BUDGET_MS = 1000
+MODULES = [
+    'ml_models.predict_winner',
+    'ml_models.player_availability',
+    'ml_models.data_store',
+    'app',
+    'api.index'
+]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+if sys.argv[1]:
+    __import__(sys.argv[1])
+seconds = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+deferred = [name for name in sys.argv[2:] if name in sys.modules]
+print(json.dumps({'seconds': seconds, 'rss_kb': rss_kb, 'modules': len(sys.modules), 'deferred': deferred}))
+"""
+
+
+def _run_probe(module, *python_args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BASE_DIR, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, *python_args, '-c', PROBE, module, *DEFERRED_IMPORTS],
+                            capture_output=True, text=True, env=env, cwd=BASE_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    return result
+
+
+def measure(module):
+    """Imports module in a fresh interpreter and returns its timing, memory and any DEFERRED_IMPORTS it loaded."""
+    result = _run_probe(module)
+    # The module may print while importing; the probe's report is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_profile(module, top=PROFILE_TOP):
+    """
+    Returns the slowest imports behind module as (cumulative_us, self_us, name), slowest first
+
+    Only top-level packages and the modules directly under them are listed,
+    so a heavy dependency shows up once instead of once per submodule.
+    """
+    result = _run_probe(module, '-X', 'importtime')
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        if not self_us.isdigit() or name.count('.') > 1:
+            continue
+        rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def best_of(module, repeats=REPEATS):
+    runs = [measure(module) for _ in range(repeats)]
+    return min(runs, key=lambda run: run['seconds'])
+
+
+def print_profile(module):
+    print(f"\nslowest imports behind {module}:")
+    print(f"{'cumulative ms':>15}{'self ms':>10}  module")
+    for cumulative_us, self_us, name in import_profile(module):
+        print(f"{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}  {name}")
+
+
+def check(modules):
+    """Returns a list of cold-start regressions in the entry points among modules."""
+    failures = []
+    for module in modules:
+        run = best_of(module)
+        if run['deferred']:
+            failures.append(f"{module} imports {', '.join(run['deferred'])} at startup")
+        if run['seconds'] * 1000 > IMPORT_BUDGET_MS:
+            failures.append(f"{module} takes {run['seconds'] * 1000:.0f} ms to import (budget {IMPORT_BUDGET_MS} ms)")
+    return failures
+
+
+def main(modules):
+    baseline = best_of('')
+    print(f"bare interpreter: {baseline['rss_kb'] / 1024:.1f} MB RSS, {baseline['modules']} modules")
+    print(f"{'module':<34}{'import ms':>11}{'peak RSS MB':>13}{'+RSS MB':>9}{'modules':>9}")
+    for module in modules:
+        try:
+            run = best_of(module)
+        except RuntimeError as e:
+            print(f"{module:<34}  {e}")
+            continue
+        print(f"{module:<34}{run['seconds'] * 1000:>11.1f}{run['rss_kb'] / 1024:>13.1f}"
+              f"{(run['rss_kb'] - baseline['rss_kb']) / 1024:>9.1f}{run['modules']:>9}"
+              + (f"  loads {', '.join(run['deferred'])}" if run['deferred'] else ""))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if '--check' in args:
+        failures = check([arg for arg in args if arg != '--check'] or ENTRY_POINTS)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        print("startup check failed" if failures else "startup check passed")
+        sys.exit(1 if failures else 0)
+    elif '--profile' in args:
+        for module in [arg for arg in args if arg != '--profile'] or ENTRY_POINTS:
+            print_profile(module)
+    else:
+        main(args or MODULES)
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import mmap
+import os
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+# Every column starts on an ALIGNMENT boundary in the data file
+ALIGNMENT = 64
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_minutes(values):
+    """Converts "mm:ss" strings (or plain numbers) to float minutes; unparseable values become NaN."""
+    text = pd.Series(values, dtype='str')
+    parts = text.str.split(':', n=1, expand=True)
+    minutes = pd.to_numeric(parts[0], errors='coerce')
+    if parts.shape[1] > 1:
+        minutes = minutes + pd.to_numeric(parts[1], errors='coerce').fillna(0) / 60
+    return minutes.to_numpy(dtype=np.float64)
+
+
+def load_columnar(csv_path, dtype, parse_dates=None, categorical=(), minutes=None, cache_dir=None):
+    """
+    Loads a CSV through a binary columnar cache
+
+    The first load parses the CSV and writes every column into one binary
+    data file under cache_dir, described by a meta.json; later loads
+    memory-map that file instead of parsing. The cache is rebuilt when the
+    CSV's size or mtime changes and its contents hash differently, or when
+    the load options change. If the cache can't be written (e.g. on a
+    read-only filesystem), the parsed CSV is returned as is.
+
+    Columns are stored as:
+        - numbers: their NumPy dtype
+        - dates (parse_dates): datetime64[ns]
+        - strings: int32 codes plus the distinct values (in meta.json). Columns in
+          categorical come back as pandas Categoricals, the rest as plain
+          object (str) columns.
+
+    Args:
+        csv_path: Source CSV file
+        dtype: Column -> dtype passed to pd.read_csv
+        parse_dates: Optional column -> strftime format of dates to parse
+        categorical: String columns to return as pandas Categoricals
+        minutes: Optional source column -> new column of float minutes parsed
+            from "mm:ss" strings; the source column is kept as is
+        cache_dir: Cache directory; defaults to .columnar_cache next to the CSV
+
+    Returns:
+        DataFrame: The CSV contents, columns in file order (plus any minutes
+            columns at the end). Numeric and date columns loaded from the
+            cache are read-only views on the memory map.
+    """
+    parse_dates = parse_dates or {}
+    minutes = minutes or {}
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(csv_path) or '.', '.columnar_cache')
+    table_dir = os.path.join(cache_dir, os.path.basename(csv_path))
+    options = json.dumps({
+        'format_version': CACHE_FORMAT_VERSION,
+        'dtype': {col: str(value) for col, value in dtype.items()},
+        'parse_dates': parse_dates,
+        'minutes': minutes
+    }, sort_keys=True)
+
+    meta = _read_meta(table_dir)
+    stat = os.stat(csv_path)
+    if meta is not None and meta['options'] == options:
+        if meta['source_mtime_ns'] == stat.st_mtime_ns and meta['source_size'] == stat.st_size:
+            return _read_table(table_dir, meta, categorical)
+        # Touched but not necessarily changed: only rebuild if the contents differ
+        if meta['source_size'] == stat.st_size and meta['source_sha1'] == _file_sha1(csv_path):
+            meta['source_mtime_ns'] = stat.st_mtime_ns
+            try:
+                _write_meta(table_dir, meta)
+            except OSError:
+                # Read-only cache: the contents still match, so it stays valid
+                pass
+            return _read_table(table_dir, meta, categorical)
+
+    print(f"Building columnar cache for {csv_path}")
+    sha1 = _file_sha1(csv_path)
+    df = _parse_csv(csv_path, dtype, parse_dates, minutes)
+    try:
+        meta = _write_table(df, sha1, table_dir, stat, options)
+    except OSError as e:
+        print(f"Could not write columnar cache for {csv_path}, using the parsed CSV: {e}")
+        for col in categorical:
+            if col in df.columns:
+                # Categories in order of appearance, as the cache stores them
+                df[col] = pd.Categorical(df[col], categories=pd.unique(df[col].dropna()))
+        return df
+    return _read_table(table_dir, meta, categorical)
+
+
+def _read_meta(table_dir):
+    try:
+        with open(os.path.join(table_dir, "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(table_dir, meta):
+    # meta.json is replaced last and atomically, so readers only ever see a
+    # complete data file
+    tmp_path = os.path.join(table_dir, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(table_dir, "meta.json"))
+
+
+def _parse_csv(csv_path, dtype, parse_dates, minutes):
+    df = pd.read_csv(csv_path, dtype=dtype)
+    for col, date_format in parse_dates.items():
+        df[col] = pd.to_datetime(df[col], format=date_format)
+    for source, target in minutes.items():
+        df[target] = parse_minutes(df[source])
+    return df
+
+
+def _write_table(df, sha1, table_dir, stat, options):
+    columns = []
+    sections = []
+    offset = 0
+    for col in df.columns:
+        values = df[col]
+        entry = {'name': col}
+        if pd.api.types.is_datetime64_any_dtype(values):
+            entry['kind'] = 'datetime'
+            array = values.to_numpy(dtype='datetime64[ns]')
+        elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            entry['kind'] = 'numeric'
+            array = values.to_numpy()
+        else:
+            entry['kind'] = 'string'
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            entry['values'] = [str(value) for value in uniques]
+            array = codes.astype(np.int32)
+
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        entry.update({'dtype': array.dtype.str, 'offset': offset, 'nbytes': array.nbytes})
+        sections.append((offset, array.tobytes()))
+        offset += array.nbytes
+        columns.append(entry)
+
+    # The data file is tagged with the source hash so a rebuild never
+    # overwrites a file a concurrent reader may still have mapped
+    os.makedirs(table_dir, exist_ok=True)
+    data_file = f"columns.{sha1[:12]}.bin"
+    tmp_path = os.path.join(table_dir, f"{data_file}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        for section_offset, data in sections:
+            f.seek(section_offset)
+            f.write(data)
+        f.truncate(max(offset, 1))
+    os.replace(tmp_path, os.path.join(table_dir, data_file))
+
+    meta = {
+        'options': options,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'source_sha1': sha1,
+        'rows': len(df),
+        'data_file': data_file,
+        'columns': columns
+    }
+    _write_meta(table_dir, meta)
+    _remove_stale_files(table_dir, meta)
+    return meta
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _remove_stale_files(table_dir, meta):
+    for name in os.listdir(table_dir):
+        if name not in ("meta.json", meta['data_file']) and not name.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(table_dir, name))
+            except OSError:
+                pass
+
+
+def _read_table(table_dir, meta, categorical):
+    # One memory map for the whole table; numeric and date columns are
+    # zero-copy views on it (copy=False keeps pandas from consolidating them
+    # into new blocks)
+    with open(os.path.join(table_dir, meta['data_file']), "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    rows = meta['rows']
+    data = {}
+    for entry in meta['columns']:
+        array = np.frombuffer(buffer, dtype=np.dtype(entry['dtype']), count=rows, offset=entry['offset'])
+        if entry['kind'] == 'string':
+            if entry['name'] in categorical:
+                data[entry['name']] = pd.Categorical.from_codes(array, categories=entry['values'])
+            else:
+                # -1 codes are missing values
+                lookup = np.array(entry['values'] + [np.nan], dtype=object)
+                data[entry['name']] = lookup[array]
+        else:
+            data[entry['name']] = array
+    return pd.DataFrame(data, copy=False)
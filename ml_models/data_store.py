@@ -0,0 +1,242 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+from ml_models.metrics import metrics
+from ml_models.columnar_cache import load_columnar
+from ml_models.player_aggregates import PlayerAggregates
+from ml_models.player_index import PlayerIndex
+from ml_models.roster_impact import RosterImpact
+from ml_models.team_contributions import TeamContributions
+from ml_models.team_game_index import TeamGameIndex
+from ml_models.team_summary import TeamSummary
+
+# Relative to the repository rather than the working directory
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAM_DATA_PATH = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+PLAYER_DATA_PATH = os.path.join(BASE_DIR, 'ml_models', 'updated_player_data.csv')
+
+TEAM_STAT_COLUMNS = ['W', 'L', 'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+                     'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV',
+                     'PF', 'PTS']
+PLAYER_STAT_COLUMNS = ['FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+                       'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TO', 'PF', 'PTS']
+
+# Explicit dtypes so pandas doesn't have to infer them, and so IDs with
+# leading zeros (Game_ID, GAME_ID) stay strings
+TEAM_DTYPES = {
+    'Team_ID': 'int64', 'Game_ID': 'str', 'GAME_DATE': 'str', 'MATCHUP': 'str', 'WL': 'str',
+    'TEAM_ABBR': 'str', 'W': 'int64', 'L': 'int64', 'MIN': 'int64',
+    **{col: 'float64' for col in TEAM_STAT_COLUMNS if col not in ('W', 'L', 'MIN')}
+}
+PLAYER_DTYPES = {
+    'GAME_ID': 'str', 'PLAYER_ID': 'int64', 'PLAYER_NAME': 'str', 'TEAM_ID': 'int64',
+    'TEAM_ABBREVIATION': 'str', 'MIN': 'str', 'SEASON': 'str', 'GAME_DATE': 'str',
+    **{col: 'float64' for col in PLAYER_STAT_COLUMNS}
+}
+
+
+def _row_hashes(games):
+    """Hashes every row's contents, to tell an appended log from an edited one."""
+    return pd.util.hash_pandas_object(games, index=False).to_numpy()
+
+
+def _appended_rows(previous, games, row_hashes):
+    """
+    Returns the rows added after the previously loaded log, if that is all that changed
+
+    Args:
+        previous: Previous load state, with its 'games' and 'row_hashes'
+        games: Newly loaded log
+        row_hashes: _row_hashes(games)
+
+    Returns:
+        DataFrame: The new rows (possibly empty), or None if any earlier row
+            was edited, removed or reordered
+    """
+    old_hashes = previous['row_hashes']
+    if list(previous['games'].columns) != list(games.columns) or len(row_hashes) < len(old_hashes):
+        return None
+    if not np.array_equal(row_hashes[:len(old_hashes)], old_hashes):
+        return None
+    return games.iloc[len(old_hashes):]
+
+
+class DataStore:
+    """
+    Team and player game logs, parsed once and shared by the whole process
+
+    Each CSV is loaded with explicit dtypes the first time it is needed and
+    kept in memory. Loads go through the binary columnar cache (see
+    load_columnar), so GAME_DATE arrives as datetimes, team abbreviations and
+    WL as categoricals, and player minutes also as float MINUTES. Accessors
+    stat the file and reload it only if it has changed on disk, so a
+    refreshed CSV is picked up without a restart.
+
+    The returned DataFrames are shared between requests: callers must copy
+    them before modifying them.
+    """
+    def __init__(self, team_path=TEAM_DATA_PATH, player_path=PLAYER_DATA_PATH, cache_dir=None):
+        """
+        Args:
+            team_path: Path to the team game log (team_data.csv)
+            player_path: Path to the player game log (updated_player_data.csv)
+            cache_dir: Columnar cache directory; defaults to .columnar_cache
+                next to each CSV
+        """
+        self.team_path = team_path
+        self.player_path = player_path
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._team = None
+        self._player = None
+
+    def team_games(self):
+        """Returns every team game row."""
+        return self._team_state()['games']
+
+    def team_games_for(self, team_abbr):
+        """Returns one team's games, most recent first (empty if the team is unknown)."""
+        return self.team_index().team_games(team_abbr).iloc[::-1]
+
+    def team_index(self):
+        """Returns the team games indexed by team ID and abbreviation (see TeamGameIndex)."""
+        return self._team_state()['index']
+
+    def last_team_games(self, team, n):
+        """Returns a team's (ID or abbreviation) n most recent games, oldest first."""
+        return self.team_index().last_games(team, n)
+
+    def team_summary(self):
+        """Returns the materialized per-team summary (see TeamSummary)."""
+        return self._team_state()['summary']
+
+    def players(self):
+        """Returns every player game row."""
+        return self._player_state()['games']
+
+    def player_aggregates(self):
+        """Returns the per-player season aggregates (see PlayerAggregates)."""
+        return self._player_state()['aggregates']
+
+    def team_contributions(self):
+        """Returns the per-team lines and per-player contributions (see TeamContributions)."""
+        return self._player_state()['contributions']
+
+    def player_index(self):
+        """Returns the PlayerIndex for the current player data, building it on first use."""
+        state = self._player_state()
+        index = state.get('index')
+        if index is None:
+            with self._lock:
+                index = state.get('index')
+                if index is None:
+                    index = state['index'] = PlayerIndex(state['aggregates'])
+        return index
+
+    def roster_impact(self):
+        """Returns the RosterImpact for the current player data, building it on first use."""
+        state = self._player_state()
+        impact = state.get('roster_impact')
+        if impact is None:
+            with self._lock:
+                impact = state.get('roster_impact')
+                if impact is None:
+                    impact = state['roster_impact'] = RosterImpact(state['aggregates'].table())
+        return impact
+
+    def _team_state(self):
+        return self._current('_team', self.team_path, self._load_team)
+
+    def _player_state(self):
+        return self._current('_player', self.player_path, self._load_player)
+
+    def _current(self, attr, path, loader):
+        mtime = os.stat(path).st_mtime_ns
+        state = getattr(self, attr)
+        if state is not None and state['mtime'] == mtime:
+            return state
+
+        with self._lock:
+            state = getattr(self, attr)
+            if state is None or state['mtime'] != mtime:
+                print(f"Loading {path} into the data store")
+                with metrics.timer('data_store.load'):
+                    state = loader(path)
+                state['mtime'] = mtime
+                setattr(self, attr, state)
+        return state
+
+    def _load_team(self, path):
+        games = load_columnar(
+            path, TEAM_DTYPES,
+            parse_dates={'GAME_DATE': '%b %d, %Y'},
+            categorical=('TEAM_ABBR', 'WL'),
+            cache_dir=self.cache_dir
+        )
+        row_hashes = _row_hashes(games)
+        return {
+            'games': games,
+            'row_hashes': row_hashes,
+            'index': TeamGameIndex(games),
+            'summary': self._summarize_teams(games, row_hashes)
+        }
+
+    def _summarize_teams(self, games, row_hashes):
+        """Updates the previous team summary with just the new rows if the log was only appended to."""
+        previous = self._team
+        if previous is not None:
+            new_games = _appended_rows(previous, games, row_hashes)
+            if new_games is not None:
+                print(f"Adding {len(new_games)} new team game rows to the team summary")
+                summary = previous['summary'].copy()
+                summary.add_games(new_games)
+                return summary
+        return TeamSummary(games)
+
+    def _load_player(self, path):
+        games = load_columnar(
+            path, PLAYER_DTYPES,
+            parse_dates={'GAME_DATE': '%Y-%m-%d'},
+            categorical=('TEAM_ABBREVIATION',),
+            minutes={'MIN': 'MINUTES'},
+            cache_dir=self.cache_dir
+        )
+        row_hashes = _row_hashes(games)
+        aggregates, contributions = self._aggregate_players(games, row_hashes)
+        return {
+            'games': games,
+            'row_hashes': row_hashes,
+            'aggregates': aggregates,
+            'contributions': contributions
+        }
+
+    def _aggregate_players(self, games, row_hashes):
+        """Updates the previous aggregates with just the new games if the log was only appended to."""
+        previous = self._player
+        if previous is not None:
+            new_games = _appended_rows(previous, games, row_hashes)
+            if new_games is not None:
+                print(f"Adding {len(new_games)} new player game rows to the aggregates")
+                aggregates = previous['aggregates'].copy()
+                aggregates.add_games(new_games)
+                contributions = previous['contributions'].copy()
+                contributions.add_games(new_games)
+                return aggregates, contributions
+        return PlayerAggregates(games), TeamContributions(games)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_data_store(team_path=TEAM_DATA_PATH, player_path=PLAYER_DATA_PATH):
+    """Returns the shared DataStore for these paths, creating it on first use."""
+    # Relative and absolute spellings of the same files share one store
+    key = (os.path.abspath(team_path), os.path.abspath(player_path))
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, DataStore(team_path, player_path))
+    return store
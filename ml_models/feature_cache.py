@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class TeamFeatureCache:
+    """
+    Cache of each team's final (encoded, imputed and scaled) feature row
+
+    Named teams are cached by team key and only reused while the caller's
+    data version matches the one they were built from; invalidate() drops
+    them explicitly when team stats refresh. Ad-hoc stat payloads are cached
+    by content in a bounded LRU so custom requests cannot grow it without
+    limit.
+
+    The cache has the same predict_many contract as TeamPredictionModel, so it
+    can sit behind a PredictionBatcher. Either side of a matchup may be a stats
+    dict or a feature row returned by team_features().
+    """
+    def __init__(self, model, max_custom_entries=256, shadow=None):
+        """
+        Args:
+            model: TeamPredictionModel or InferencePool used for preprocessing
+                and scoring
+            max_custom_entries: Size of the LRU for ad-hoc stat payloads
+            shadow: Optional ShadowScorer that also scores every batch
+        """
+        self.model = model
+        self.max_custom_entries = max_custom_entries
+        self.shadow = shadow
+        self._teams = {}
+        self._custom = OrderedDict()
+        self._lock = threading.Lock()
+
+    def team_features(self, team_key, team_stats, data_version):
+        """Returns the cached feature row for a named team, rebuilding it if stale."""
+        entry = self._teams.get(team_key)
+        if entry is not None and entry[0] == data_version:
+            return entry[1]
+
+        row = self._freeze(self.model.preprocess_many([team_stats])[0])
+        with self._lock:
+            self._teams[team_key] = (data_version, row)
+        return row
+
+    def custom_features_many(self, team_stats_list):
+        """Returns an (n, n_features) matrix for ad-hoc stat payloads, encoding only misses."""
+        team_stats_list = list(team_stats_list)
+        rows = [None] * len(team_stats_list)
+        keys = [self._content_key(team_stats) for team_stats in team_stats_list]
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key is not None and key in self._custom:
+                    self._custom.move_to_end(key)
+                    rows[i] = self._custom[key]
+
+        misses = [i for i, row in enumerate(rows) if row is None]
+        if misses:
+            processed = self.model.preprocess_many([team_stats_list[i] for i in misses])
+            with self._lock:
+                for i, row in zip(misses, processed):
+                    rows[i] = self._freeze(row)
+                    if keys[i] is not None:
+                        self._custom[keys[i]] = rows[i]
+                while len(self._custom) > self.max_custom_entries:
+                    self._custom.popitem(last=False)
+
+        return np.vstack(rows)
+
+    def team_probs(self, teams, data_version):
+        """
+        Returns the raw (unnormalized) win probability of each named team, scored in one batch
+
+        Rows come from team_features(), so they are shared with matchups
+        predicted for the same teams and data version.
+
+        Args:
+            teams: (team_key, team_stats) pairs
+            data_version: Version of the stats, as passed to team_features()
+
+        Returns:
+            np.ndarray: One probability per team
+        """
+        teams = list(teams)
+        if not teams:
+            return np.empty(0, dtype=np.float32)
+
+        rows = np.vstack([self.team_features(team_key, team_stats, data_version) for team_key, team_stats in teams])
+        start = time.perf_counter()
+        probs = self.model.score_features(rows)
+        if self.shadow is not None and len(rows) > 1:
+            # Each team against the next, so the candidate sees every row scored here
+            base_model = getattr(self.model, 'local_model', self.model)
+            results = base_model._combine_probabilities(probs, np.roll(probs, -1))
+            self.shadow.observe(self.model, rows, np.roll(rows, -1, axis=0), results, time.perf_counter() - start)
+        return probs
+
+    def invalidate(self, team_key=None):
+        """Drops one named team, or every named team when team_key is None."""
+        with self._lock:
+            if team_key is None:
+                self._teams.clear()
+            else:
+                self._teams.pop(team_key, None)
+
+    def clear_custom(self):
+        with self._lock:
+            self._custom.clear()
+
+    def predict_many(self, matchups):
+        """Same contract as TeamPredictionModel.predict_many."""
+        matchups = list(matchups)
+        if not matchups:
+            return []
+
+        sides = [team1 for team1, _ in matchups] + [team2 for _, team2 in matchups]
+        rows = list(sides)
+        stats_positions = [i for i, side in enumerate(sides) if not isinstance(side, np.ndarray)]
+        if stats_positions:
+            encoded = self.custom_features_many([sides[i] for i in stats_positions])
+            for i, row in zip(stats_positions, encoded):
+                rows[i] = row
+        features = np.vstack(rows)
+
+        n = len(matchups)
+        start = time.perf_counter()
+        results = self.model.predict_features(features[:n], features[n:])
+        if self.shadow is not None:
+            self.shadow.observe(self.model, features[:n], features[n:], results, time.perf_counter() - start)
+        return results
+
+    def predict(self, team1, team2):
+        return self.predict_many([(team1, team2)])[0]
+
+    @staticmethod
+    def _freeze(row):
+        row = np.array(row, dtype=np.float64)
+        row.flags.writeable = False
+        return row
+
+    @staticmethod
+    def _content_key(team_stats):
+        try:
+            key = tuple(sorted(team_stats.items()))
+            hash(key)
+            return key
+        except TypeError:
+            return None
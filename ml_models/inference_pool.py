@@ -0,0 +1,120 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+from ml_models.predict_winner import TeamPredictionModel
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+class InferencePoolBusy(Exception):
+    """Raised when the pool already has max_pending batches queued."""
+
+
+def _init_worker(bundle_path, backend):
+    global _worker_model
+    _worker_model = TeamPredictionModel.from_bundle(bundle_path, lazy=False, backend=backend)
+
+
+def _score_shared(shm_name, n_rows, n_features):
+    """Scores the feature block in shared memory and writes the probabilities after it."""
+    shm = SharedMemory(name=shm_name)
+    try:
+        features = np.ndarray((n_rows, n_features), dtype=np.float64, buffer=shm.buf)
+        probs = np.ndarray((n_rows,), dtype=np.float32, buffer=shm.buf, offset=features.nbytes)
+        probs[:] = _worker_model.score_features(features)
+        del features, probs
+    finally:
+        shm.close()
+
+
+class InferencePool:
+    """
+    Scores preprocessed features in worker processes, off the request threads
+
+    Each worker loads the model bundle once. Requests are encoded and scaled
+    in the calling process (cheap), the feature matrix is handed over through
+    a shared memory block, and the worker writes the probabilities back into
+    the same block. At most max_pending batches may be queued; beyond that
+    callers wait up to submit_timeout and then get InferencePoolBusy.
+
+    The pool exposes predict/predict_many/score_features like
+    TeamPredictionModel, so it can sit behind a PredictionBatcher. Each call
+    blocks until its batch is scored, so callers need several threads (e.g.
+    PredictionBatcher workers) to keep more than one worker process busy.
+    """
+    def __init__(self, bundle_path, workers=2, max_pending=32, submit_timeout=1.0, backend='xgboost'):
+        self.bundle_path = bundle_path
+        self.workers = workers
+        self.submit_timeout = submit_timeout
+        # Used in this process for encoding and scaling only
+        self.local_model = TeamPredictionModel.from_bundle(bundle_path, backend=backend)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(bundle_path, backend)
+        )
+        atexit.register(self.shutdown)
+
+    @property
+    def version(self):
+        return self.local_model.version
+
+    def score_features(self, features):
+        """Returns the raw win probability of each row, scored in a worker."""
+        features = np.ascontiguousarray(features, dtype=np.float64)
+        n_rows, n_features = features.shape
+        if n_rows == 0:
+            return np.empty(0, dtype=np.float32)
+
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise InferencePoolBusy("Inference pool is at capacity")
+        try:
+            shm = SharedMemory(create=True, size=features.nbytes + n_rows * 4)
+            try:
+                np.ndarray(features.shape, dtype=np.float64, buffer=shm.buf)[:] = features
+                self._executor.submit(_score_shared, shm.name, n_rows, n_features).result()
+                probs = np.ndarray((n_rows,), dtype=np.float32, buffer=shm.buf, offset=features.nbytes).copy()
+            finally:
+                shm.close()
+                shm.unlink()
+        finally:
+            # Released even if the shared memory could not be created
+            self._slots.release()
+        return probs
+
+    def preprocess_many(self, team_stats_list):
+        return self.local_model.preprocess_many(team_stats_list)
+
+    def predict_team_probs(self, team_stats_list):
+        return self.score_features(self.preprocess_many(team_stats_list))
+
+    def predict_features(self, team1_features, team2_features):
+        """Same contract as TeamPredictionModel.predict_features."""
+        n = len(team1_features)
+        probs = self.score_features(np.concatenate([team1_features, team2_features]))
+        return self.local_model._combine_probabilities(probs[:n], probs[n:])
+
+    def predict_many(self, matchups):
+        """Same contract as TeamPredictionModel.predict_many."""
+        matchups = list(matchups)
+        if not matchups:
+            return []
+
+        team_stats_list = [team1 for team1, _ in matchups] + [team2 for _, team2 in matchups]
+        processed = self.preprocess_many(team_stats_list)
+        n = len(matchups)
+        return self.predict_features(processed[:n], processed[n:])
+
+    def predict(self, team1_stats, team2_stats):
+        return self.predict_many([(team1_stats, team2_stats)])[0]
+
+    def shutdown(self, wait=False):
+        """Stops the workers; without wait, batches still queued are cancelled."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,126 @@
+import threading
+
+from ml_models.data_store import get_data_store
+
+# Stat columns passed to the prediction model, in the same shape as the
+# team stats dicts built in app.py
+MODEL_STAT_COLUMNS = [
+    'W', 'L', 'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+    'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV',
+    'PF', 'PTS'
+]
+
+
+def load_latest_team_stats(csv_path):
+    """
+    Reads the team game log and returns each team's most recent stat line
+
+    Args:
+        csv_path: Path to team_data.csv
+
+    Returns:
+        dict: Team abbreviation -> stats dict in the format the model expects
+    """
+    df = get_data_store(team_path=csv_path).team_games()
+    latest = df.sort_values('GAME_DATE').groupby('TEAM_ABBR', observed=True).tail(1)
+
+    team_data = {}
+    for row in latest.to_dict(orient='records'):
+        stats = {col: float(row[col]) for col in MODEL_STAT_COLUMNS}
+        stats['W'] = int(row['W'])
+        stats['L'] = int(row['L'])
+        stats['TEAM_ABBR'] = str(row['TEAM_ABBR'])
+        team_data[stats['TEAM_ABBR']] = stats
+    return team_data
+
+
+class MatchupMatrix:
+    """
+    Head-to-head win probabilities for every pair of teams
+
+    The model scores each team row independently and predict() normalizes
+    the two scores, so a team only has to be scored once: every pair is then
+    a division of two cached scores. build() scores every team returned by
+    all_teams in one batch, from the stats dicts returned by load_stats (the
+    same source the per-request prediction path uses) and through the
+    scorer's cached feature rows. Scores are tagged with the version of the
+    team stats they came from, and the whole matrix is rebuilt by the first
+    build or lookup after version() changes.
+    """
+    def __init__(self, scorer, load_stats, version, all_teams):
+        """
+        Args:
+            scorer: TeamFeatureCache (or anything providing
+                team_probs(teams, data_version)) used to score the teams
+            load_stats: Callable returning a team's stats dict, or None if
+                there are no stats for the team
+            version: Callable returning the current version of those stats
+            all_teams: Callable returning the key of every team to score
+        """
+        self.scorer = scorer
+        self.load_stats = load_stats
+        self.version = version
+        self.all_teams = all_teams
+        self._state = ({}, None)
+        self._build_lock = threading.Lock()
+
+    @property
+    def data_version(self):
+        return self._state[1]
+
+    def teams(self):
+        """Returns the teams scored for the current version."""
+        scores, version = self._state
+        return list(scores) if version == self.version() else []
+
+    def build(self):
+        """
+        Scores every team for the current stats version in one batch, unless already done
+
+        Returns:
+            dict: Team -> score for the current version
+        """
+        version = self.version()
+        scores, scored_version = self._state
+        if scored_version == version:
+            return scores
+
+        with self._build_lock:
+            # Another thread may have built this version while we waited
+            scores, scored_version = self._state
+            if scored_version == version:
+                return scores
+
+            team_stats = [(team, self.load_stats(team)) for team in dict.fromkeys(self.all_teams())]
+            team_stats = [(team, stats) for team, stats in team_stats if stats]
+            scores = {}
+            if team_stats:
+                probs = self.scorer.team_probs(team_stats, version)
+                scores = dict(zip([team for team, _ in team_stats], probs.tolist()))
+            print(f"Scored {len(scores)} teams for the matchup matrix (stats version {version})")
+
+            # Swap in the new state in one assignment so readers never see a mix;
+            # scores from stats that were refreshed meanwhile are not kept
+            if self.version() == version:
+                self._state = (scores, version)
+        return scores
+
+    def lookup(self, team1, team2):
+        """
+        Returns the prediction for team1 vs team2, building the matrix if needed
+
+        Returns:
+            dict: Win probabilities and data version, or None if either team
+            has no score
+        """
+        scores = self.build()
+        score1 = scores.get(team1)
+        score2 = scores.get(team2)
+        if score1 is None or score2 is None:
+            return None
+
+        return {
+            'team1_win_probability': score1 / (score1 + score2),
+            'team2_win_probability': score2 / (score1 + score2),
+            'data_version': self.data_version
+        }
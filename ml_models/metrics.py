@@ -0,0 +1,127 @@
+import bisect
+import math
+import threading
+import time
+from functools import wraps
+
+# Bucket upper bounds in seconds: 1us to ~100s, 10 log-spaced buckets per
+# decade, so any reported percentile is within ~26% of the true value
+BUCKET_BOUNDS = [10 ** (exponent / 10) for exponent in range(-60, 21)]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    record() is a bisect and a few integer updates under a lock, cheap enough
+    to leave on in production. Percentiles are read off the bucket counts.
+    """
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        bucket = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q):
+        """Returns the upper bound of the bucket holding the q-th percentile, in seconds."""
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            max_seen = self.max
+        if count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(q / 100 * count))
+        seen = 0
+        for bucket, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                if bucket == len(BUCKET_BOUNDS):
+                    return max_seen
+                return min(BUCKET_BOUNDS[bucket], max_seen)
+        return max_seen
+
+    def snapshot(self):
+        """Returns count, mean, p50/p95/p99 and max, in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class _Timer:
+    # A plain class rather than @contextmanager, which costs about 50% more per use
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Named latency histograms, created on first use."""
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name, seconds):
+        self.histogram(name).record(seconds)
+
+    def timer(self, name):
+        """Times the with-block into the named histogram, even if it raises."""
+        return _Timer(self.histogram(name))
+
+    def timed(self, name):
+        """Decorator form of timer()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Returns every histogram's snapshot, keyed by name."""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histograms[name].snapshot() for name in sorted(histograms)}
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+
+# Process-wide registry used by the app and the model code
+metrics = MetricsRegistry()
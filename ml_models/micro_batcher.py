@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent predict() calls into batched predict_many() calls
+
+    Requests go onto a queue served by worker threads. A worker takes the
+    first request and then keeps collecting for up to max_wait seconds or
+    max_batch_size requests while traffic is concurrent, i.e. while other
+    callers are mid-submit or the latest request arrived within max_wait of
+    the one before it. A lone request after an idle spell is scored straight
+    away, so single-request latency is not held back by the batching window.
+
+    Each worker scores its own batch, so with workers > 1 several batches
+    are in flight at once. That is what keeps every process of an
+    InferencePool busy, since a worker blocks until its batch is scored.
+    """
+    def __init__(self, model, max_batch_size=64, max_wait=0.002, workers=1):
+        """
+        Args:
+            model: Anything with predict_many(matchups), e.g. TeamPredictionModel
+            max_batch_size: Largest number of matchups scored in one call
+            max_wait: Longest time in seconds to wait for a batch to fill
+            workers: Number of worker threads, i.e. batches scored at once;
+                may be raised later, which starts more threads on next use
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.workers = workers
+        self._queue = queue.Queue()
+        # Matchups submitted but not yet taken into a batch
+        self._waiting = 0
+        # Arrival time of the latest request, and whether it came within
+        # max_wait of the one before it
+        self._last_submit = float('-inf')
+        self._concurrent = False
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def predict(self, team1_stats, team2_stats, timeout=None, model=None):
+        """Predicts one matchup; blocks until its batch has been scored."""
+        return self.submit(team1_stats, team2_stats, model=model).result(timeout)
+
+    def submit(self, team1_stats, team2_stats, model=None):
+        """
+        Queues one matchup and returns a Future for its result dict.
+
+        model overrides self.model for this matchup, e.g. to keep a request on
+        the model it started with while self.model is being swapped.
+        """
+        future = Future()
+        model = model or self.model
+        now = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+            self._concurrent = now - self._last_submit <= self.max_wait
+            self._last_submit = now
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while len(self._workers) < self.workers:
+                # Started on first use so that importing or forking is safe
+                worker = threading.Thread(target=self._run, name=f"prediction-batcher-{len(self._workers)}",
+                                          daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        self._queue.put((team1_stats, team2_stats, future, model))
+        return future
+
+    def _take(self, item):
+        with self._lock:
+            self._waiting -= 1
+        return item
+
+    def _collect(self):
+        batch = [self._take(self._queue.get())]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._take(self._queue.get_nowait()))
+                continue
+            except queue.Empty:
+                pass
+
+            # Nobody else is submitting and traffic is idle, so there is nothing to wait for
+            if self._waiting <= 0 and not self._concurrent:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._take(self._queue.get(timeout=remaining)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Requests pinned to different models are scored separately
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[3]), []).append(item)
+            for group in groups.values():
+                self._score(group)
+
+    def _score(self, batch):
+        matchups = [(item[0], item[1]) for item in batch]
+        model = batch[0][3]
+        try:
+            results = model.predict_many(matchups)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][2].set_exception(e)
+                return
+            # Score one at a time so a single bad payload only fails its own caller
+            for item in batch:
+                self._score([item])
+            return
+
+        for item, result in zip(batch, results):
+            item[2].set_result(result)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from ml_models.tree_ensemble import export_trees
+
+# File layout:
+#   magic (8 bytes) | header length (uint32, little endian) | JSON header
+#   | padding | sections...
+# Section offsets in the header are relative to the first byte after the
+# padding, and every section starts on an ALIGNMENT boundary so the arrays
+# can be used directly from the memory map.
+BUNDLE_MAGIC = b"GCAIBNDL"
+BUNDLE_FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_bundle(path, booster_raw, arrays, columns, metadata=None):
+    """
+    Writes a model artifact bundle to a single file
+
+    Args:
+        path: Destination file path
+        booster_raw: The booster serialized in XGBoost's native UBJSON format
+        arrays: Dict of name -> NumPy array to store alongside the booster
+        columns: Trained feature column names
+        metadata: Optional dict of extra JSON-serializable header fields
+
+    Returns:
+        str: The bundle version (a hash of the bundle contents)
+    """
+    sections = []
+    offset = 0
+    array_entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        array_entries[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset,
+            'nbytes': array.nbytes
+        }
+        sections.append((offset, array.tobytes()))
+        offset += array.nbytes
+
+    booster_raw = bytes(booster_raw)
+    offset = _align(offset)
+    booster_entry = {'format': 'ubj', 'offset': offset, 'nbytes': len(booster_raw)}
+    sections.append((offset, booster_raw))
+
+    digest = hashlib.sha1()
+    digest.update(json.dumps(columns).encode())
+    for _, data in sections:
+        digest.update(data)
+    version = digest.hexdigest()[:12]
+
+    header = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'bundle_version': version,
+        'columns': list(columns),
+        'arrays': array_entries,
+        'booster': booster_entry,
+        'metadata': metadata or {}
+    }
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(BUNDLE_MAGIC) + 4 + len(header_bytes))
+
+    # Write to a temporary file first so readers never see a partial bundle
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for section_offset, data in sections:
+            f.seek(data_start + section_offset)
+            f.write(data)
+    os.replace(tmp_path, path)
+    return version
+
+
+def write_model_bundle(path, model, imputer, scaler, columns):
+    """
+    Writes the fitted classifier, imputer, scaler and column list as a bundle
+
+    Args:
+        path: Destination file path
+        model: Fitted XGBClassifier
+        imputer: Fitted SimpleImputer (mean strategy) over the numeric columns
+        scaler: Fitted StandardScaler over all columns
+        columns: Trained feature column names
+
+    Returns:
+        str: The bundle version
+    """
+    n_features = len(columns)
+    scaler_mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scaler_scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+
+    arrays = {
+        'imputer_statistics': np.asarray(imputer.statistics_, dtype=np.float64),
+        'scaler_mean': np.asarray(scaler_mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler_scale, dtype=np.float64)
+    }
+    # Flattened trees for the pure-NumPy inference backend
+    arrays.update(export_trees(model.get_booster()))
+
+    booster_raw = model.get_booster().save_raw(raw_format='ubj')
+    return write_bundle(path, booster_raw, arrays, columns)
+
+
+class ModelBundle:
+    """
+    Read-only, memory-mapped view of a model artifact bundle
+
+    Arrays are returned as zero-copy views on the mapping, so processes that
+    load the same bundle share its pages.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+
+        header_start = len(BUNDLE_MAGIC) + 4
+        (header_length,) = struct.unpack("<I", self._mmap[len(BUNDLE_MAGIC):header_start])
+        self.header = json.loads(self._mmap[header_start:header_start + header_length])
+        if self.header['format_version'] != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version {self.header['format_version']}")
+
+        self._data_start = _align(header_start + header_length)
+        self.version = self.header['bundle_version']
+        self.columns = self.header['columns']
+
+    def array(self, name):
+        """Returns a read-only array view of a stored section."""
+        entry = self.header['arrays'][name]
+        dtype = np.dtype(entry['dtype'])
+        count = entry['nbytes'] // dtype.itemsize
+        array = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                              offset=self._data_start + entry['offset'])
+        return array.reshape(entry['shape'])
+
+    def has_array(self, name):
+        return name in self.header['arrays']
+
+    def booster_raw(self):
+        """Returns the serialized booster, ready for load_model()."""
+        entry = self.header['booster']
+        start = self._data_start + entry['offset']
+        return bytearray(self._mmap[start:start + entry['nbytes']])
+
+
+if __name__ == "__main__":
+    # Convert the pickled artifacts in ml_models/ into a bundle
+    import pickle
+
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    loaded = {}
+    for name in ("xgb_model", "imputer", "scaler", "x_columns"):
+        with open(os.path.join(model_dir, f"{name}.pkl"), "rb") as f:
+            loaded[name] = pickle.load(f)
+
+    bundle_version = write_model_bundle(
+        os.path.join(model_dir, "model_bundle.bin"),
+        loaded["xgb_model"], loaded["imputer"], loaded["scaler"], loaded["x_columns"]
+    )
+    print(f"Wrote model bundle version {bundle_version}")
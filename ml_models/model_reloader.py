@@ -0,0 +1,125 @@
+import os
+import signal
+import threading
+import time
+
+from ml_models.model_bundle import ModelBundle
+from ml_models.predict_winner import TeamPredictionModel
+
+
+class ModelReloader:
+    """
+    Zero-downtime reloads of the prediction model from a bundle on disk
+
+    A reload builds a new TeamPredictionModel on a background thread, warms it
+    with a smoke batch and only then hands it to on_swap, which is expected to
+    replace the serving references with plain assignments. Requests already
+    holding the old model finish on it; a reload that fails to load or warm
+    leaves the old model in place.
+
+    Reloads can be triggered by calling reload(), by a signal (see
+    install_signal_handler) or by watch(), which polls the bundle for a new
+    version.
+    """
+    def __init__(self, bundle_path, on_swap, smoke_matchups=None, current_version=None, backend='xgboost'):
+        """
+        Args:
+            bundle_path: Path to the model bundle to (re)load
+            on_swap: Called with the new, warmed model to swap it in
+            smoke_matchups: Callable returning (team1_stats, team2_stats) pairs
+                used to warm a new model before it is swapped in
+            current_version: Bundle version currently being served
+            backend: Inference backend for new models
+        """
+        self.bundle_path = bundle_path
+        self.on_swap = on_swap
+        self.smoke_matchups = smoke_matchups
+        self.current_version = current_version
+        self.backend = backend
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._thread = None
+        self._watcher = None
+
+    def reload(self, wait=False, force=False):
+        """
+        Starts a background reload unless one is already running
+
+        Args:
+            wait: Block until the reload has finished
+            force: Reload even if the bundle version has not changed
+
+        Returns:
+            bool: True if a reload was started
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(target=self._run, args=(force,), name="model-reloader", daemon=True)
+        self._thread.start()
+        if wait:
+            self._thread.join()
+        return True
+
+    def _run(self, force):
+        try:
+            version = ModelBundle(self.bundle_path).version
+            if version == self.current_version and not force:
+                print(f"Model bundle version {version} is already being served")
+                return
+
+            print(f"Loading model bundle version {version}")
+            model = TeamPredictionModel.from_bundle(self.bundle_path, lazy=False, backend=self.backend)
+
+            # Warm the new model so the first real request doesn't pay for it
+            matchups = list(self.smoke_matchups()) if self.smoke_matchups else []
+            if matchups:
+                model.predict_many(matchups)
+
+            self.on_swap(model)
+            self.current_version = model.version
+            self.last_error = None
+            print(f"Swapped in model bundle version {model.version}")
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Error reloading model, keeping the current one: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def watch(self, interval):
+        """Polls the bundle every interval seconds and reloads when its version changes."""
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def _bundle_mtime(self):
+        try:
+            return os.stat(self.bundle_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _watch(self, interval):
+        # The bundle on disk when watching starts is the one being served (or
+        # about to be loaded lazily), so only later changes trigger a reload
+        last_mtime = self._bundle_mtime()
+        while True:
+            time.sleep(interval)
+            mtime = self._bundle_mtime()
+            if mtime is None:
+                continue
+            if mtime != last_mtime:
+                last_mtime = mtime
+                self.reload()
+
+    def install_signal_handler(self, signum=None):
+        """Reloads on SIGHUP (or signum). Only possible from the main thread."""
+        if signum is None:
+            signum = getattr(signal, 'SIGHUP', None)
+        if signum is None:
+            return False
+        try:
+            signal.signal(signum, lambda *_: self.reload())
+            return True
+        except ValueError:
+            # Not running in the main thread
+            return False
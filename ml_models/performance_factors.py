@@ -1,5 +1,5 @@
-import pandas as pd
 from datetime import datetime
+from ml_models.data_store import TEAM_DATA_PATH, get_data_store
 
 def apply_performance_factors(team1_win_prob, team2_win_prob, performance_factors):
     """
@@ -102,7 +102,7 @@ def apply_performance_factors(team1_win_prob, team2_win_prob, performance_factor
     return normalized_team1_win_prob, normalized_team2_win_prob
 
 
-def get_team_data_from_csv(team_abbr, data_path='data/team_data.csv'):
+def get_team_data_from_csv(team_abbr, data_path=TEAM_DATA_PATH):
     """
     Extract team data from CSV file for a specific team
     
@@ -114,11 +114,8 @@ def get_team_data_from_csv(team_abbr, data_path='data/team_data.csv'):
         dict: Team data including rest days and recent form
     """
     try:
-        # Read CSV file
-        df = pd.read_csv(data_path)
-        
-        # Filter data for the specific team
-        team_data = df[df['TEAM_ABBREVIATION'] == team_abbr]
+        # Team's games, most recent first, from the shared data store
+        team_data = get_data_store(team_path=data_path).team_games_for(team_abbr)
         
         if team_data.empty:
             print(f"No data found for team {team_abbr}")
@@ -129,10 +126,6 @@ def get_team_data_from_csv(team_abbr, data_path='data/team_data.csv'):
                 'is_home': False
             }
         
-        # Sort by game date (most recent first)
-        team_data['GAME_DATE'] = pd.to_datetime(team_data['GAME_DATE'])
-        team_data = team_data.sort_values('GAME_DATE', ascending=False)
-        
         # Get most recent game
         latest_game = team_data.iloc[0]
         
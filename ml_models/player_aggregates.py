@@ -0,0 +1,202 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Counting stats summed per player; per-game, per-36 and last-N columns are derived from them
+AGGREGATE_STATS = ['MINUTES', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB',
+                   'REB', 'AST', 'STL', 'BLK', 'TO', 'PF', 'PTS']
+SHOOTING_PCTS = (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT'))
+
+
+class PlayerAggregates:
+    """
+    Per-player season aggregates of the player game log
+
+    Built with one groupby at ingest and kept as NumPy arrays: season totals
+    and games played per player, plus a ring buffer of each player's last_n
+    game lines. add_games() folds new games into those arrays without
+    re-reading the log. Only each player's latest season is aggregated; a game
+    from a newer season starts the player's totals over.
+
+    table() exposes the aggregates as a DataFrame indexed by PLAYER_ID with
+    GP, total MIN, per-game averages (the stat names), per-36 averages
+    (<stat>_PER36) and last-N form (<stat>_LAST<n>). Shooting percentages are
+    computed from made and attempted totals.
+    """
+    def __init__(self, player_games, last_n=5):
+        """
+        Args:
+            player_games: Player game log DataFrame, as returned by DataStore.players()
+            last_n: Number of most recent games in the form columns
+        """
+        self.last_n = last_n
+        self._lock = threading.Lock()
+        self._table = None
+
+        games = self._prepare(player_games)
+        latest_season = games.groupby('PLAYER_ID')['SEASON'].transform('max')
+        games = games[games['SEASON'] == latest_season]
+
+        grouped = games.groupby('PLAYER_ID', sort=True)
+        last_rows = grouped.tail(1).set_index('PLAYER_ID').sort_index()
+        self._ids = last_rows.index.to_numpy(dtype=np.int64)
+        self._row_of = {int(player_id): row for row, player_id in enumerate(self._ids)}
+        self._names = list(last_rows['PLAYER_NAME'])
+        self._team_ids = last_rows['TEAM_ID'].to_numpy(dtype=np.int64)
+        self._team_abbrs = [str(abbr) for abbr in last_rows['TEAM_ABBREVIATION']]
+        self._seasons = list(last_rows['SEASON'])
+        self._last_dates = last_rows['GAME_DATE'].to_numpy()
+
+        self._totals = grouped[AGGREGATE_STATS].sum().to_numpy(dtype=np.float64)
+        self._gp = grouped.size().to_numpy(dtype=np.int64)
+
+        # Ring buffer of the last_n game lines; slot i of a player holds games
+        # in arrival order starting from _next_slot
+        n_players = len(self._ids)
+        self._recent = np.zeros((n_players, last_n, len(AGGREGATE_STATS)), dtype=np.float64)
+        recent = grouped.tail(last_n)
+        rows = recent['PLAYER_ID'].map(self._row_of).to_numpy()
+        slots = recent.groupby('PLAYER_ID').cumcount().to_numpy()
+        self._recent[rows, slots] = recent[AGGREGATE_STATS].to_numpy(dtype=np.float64)
+        self._recent_count = np.minimum(self._gp, last_n)
+        self._next_slot = self._recent_count % last_n
+
+    @staticmethod
+    def _prepare(player_games):
+        games = player_games.sort_values(['GAME_DATE', 'GAME_ID'], kind='stable')
+        if 'MINUTES' not in games.columns:
+            from ml_models.columnar_cache import parse_minutes
+            games = games.assign(MINUTES=parse_minutes(games['MIN']))
+        return games
+
+    def add_games(self, new_games):
+        """
+        Folds newly arrived game rows into the aggregates
+
+        Args:
+            new_games: DataFrame with the same columns as the player log,
+                containing only games not seen before
+        """
+        games = self._prepare(new_games)
+        stats = games[AGGREGATE_STATS].to_numpy(dtype=np.float64)
+        with self._lock:
+            for i, (player_id, name, team_id, team_abbr, season, game_date) in enumerate(zip(
+                    games['PLAYER_ID'], games['PLAYER_NAME'], games['TEAM_ID'],
+                    games['TEAM_ABBREVIATION'], games['SEASON'], games['GAME_DATE'])):
+                row = self._row_of.get(int(player_id))
+                if row is None:
+                    row = self._append_player(int(player_id), season)
+                elif season < self._seasons[row]:
+                    continue
+                elif season > self._seasons[row]:
+                    self._reset_player(row, season)
+
+                self._names[row] = name
+                self._team_ids[row] = team_id
+                self._team_abbrs[row] = str(team_abbr)
+                self._last_dates[row] = game_date
+                self._totals[row] += stats[i]
+                self._gp[row] += 1
+                self._recent[row, self._next_slot[row]] = stats[i]
+                self._next_slot[row] = (self._next_slot[row] + 1) % self.last_n
+                self._recent_count[row] = min(self._recent_count[row] + 1, self.last_n)
+            self._table = None
+
+    def _append_player(self, player_id, season):
+        row = len(self._ids)
+        self._row_of[player_id] = row
+        self._ids = np.append(self._ids, player_id)
+        self._names.append(None)
+        self._team_ids = np.append(self._team_ids, 0)
+        self._team_abbrs.append(None)
+        self._seasons.append(season)
+        self._last_dates = np.append(self._last_dates, self._last_dates[:1])
+        self._totals = np.vstack([self._totals, np.zeros((1, len(AGGREGATE_STATS)))])
+        self._gp = np.append(self._gp, 0)
+        self._recent = np.concatenate([self._recent, np.zeros((1,) + self._recent.shape[1:])])
+        self._recent_count = np.append(self._recent_count, 0)
+        self._next_slot = np.append(self._next_slot, 0)
+        return row
+
+    def _reset_player(self, row, season):
+        self._seasons[row] = season
+        self._totals[row] = 0
+        self._gp[row] = 0
+        self._recent[row] = 0
+        self._recent_count[row] = 0
+        self._next_slot[row] = 0
+
+    def copy(self):
+        """Returns an independent copy, e.g. to add games without touching a shared instance."""
+        clone = PlayerAggregates.__new__(PlayerAggregates)
+        clone.last_n = self.last_n
+        clone._lock = threading.Lock()
+        clone._table = None
+        with self._lock:
+            clone._ids = self._ids.copy()
+            clone._row_of = dict(self._row_of)
+            clone._names = list(self._names)
+            clone._team_ids = self._team_ids.copy()
+            clone._team_abbrs = list(self._team_abbrs)
+            clone._seasons = list(self._seasons)
+            clone._last_dates = self._last_dates.copy()
+            clone._totals = self._totals.copy()
+            clone._gp = self._gp.copy()
+            clone._recent = self._recent.copy()
+            clone._recent_count = self._recent_count.copy()
+            clone._next_slot = self._next_slot.copy()
+        return clone
+
+    def table(self):
+        """Returns the aggregate table (see the class docstring), rebuilt only after add_games()."""
+        table = self._table
+        if table is not None:
+            return table
+
+        with self._lock:
+            gp = self._gp.astype(np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                per_game = np.where(gp[:, None] > 0, self._totals / gp[:, None], 0.0)
+                minutes = self._totals[:, AGGREGATE_STATS.index('MINUTES')]
+                per36 = np.where(minutes[:, None] > 0, self._totals / minutes[:, None] * 36, 0.0)
+                recent_count = self._recent_count.astype(np.float64)
+                last_n = np.where(recent_count[:, None] > 0,
+                                  self._recent.sum(axis=1) / recent_count[:, None], 0.0)
+
+            columns = {
+                'PLAYER_NAME': self._names,
+                'TEAM_ID': self._team_ids.copy(),
+                'TEAM_ABBR': self._team_abbrs,
+                'SEASON': self._seasons,
+                'LAST_GAME_DATE': self._last_dates.copy(),
+                'GP': self._gp.copy(),
+                'MIN': minutes.copy()
+            }
+            for j, stat in enumerate(AGGREGATE_STATS):
+                columns[stat] = per_game[:, j]
+            for made, attempted, pct in SHOOTING_PCTS:
+                made_total = self._totals[:, AGGREGATE_STATS.index(made)]
+                attempted_total = self._totals[:, AGGREGATE_STATS.index(attempted)]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    columns[pct] = np.where(attempted_total > 0, made_total / attempted_total, 0.0)
+            for j, stat in enumerate(AGGREGATE_STATS):
+                if stat != 'MINUTES':
+                    columns[f"{stat}_PER36"] = per36[:, j]
+            for j, stat in enumerate(AGGREGATE_STATS):
+                columns[f"{stat}_LAST{self.last_n}"] = last_n[:, j]
+
+            table = pd.DataFrame(columns, index=pd.Index(self._ids.copy(), name='PLAYER_ID'))
+            self._table = table
+        return table
+
+    def row(self, player_id):
+        """Returns one player's aggregates as a dict, or None."""
+        table = self.table()
+        if player_id not in self._row_of:
+            return None
+        return table.iloc[self._row_of[player_id]].to_dict()
+
+    def team_table(self, team_abbr):
+        """Returns the aggregate rows of the players whose latest game was for team_abbr."""
+        table = self.table()
+        return table[table['TEAM_ABBR'] == team_abbr]
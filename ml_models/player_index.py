@@ -0,0 +1,53 @@
+class PlayerIndex:
+    """
+    Dictionary lookups over the per-player aggregates, built once per data load
+
+    Maps player name -> ID, ID -> current team (the team of the player's most
+    recent game) and ID -> season-average stat line for the player's latest
+    season (see PlayerAggregates).
+    """
+    def __init__(self, aggregates):
+        """
+        Args:
+            aggregates: PlayerAggregates for the player game log
+        """
+        self.aggregates = aggregates
+        table = aggregates.table()
+
+        # Later games win when two players share a name
+        by_recency = table.sort_values('LAST_GAME_DATE', kind='stable')
+        self._name_to_id = dict(zip(by_recency['PLAYER_NAME'], by_recency.index.astype(int)))
+
+        self._players = {}
+        for player_id, name, team_id, team_abbr, season in zip(
+                table.index, table['PLAYER_NAME'], table['TEAM_ID'], table['TEAM_ABBR'], table['SEASON']):
+            self._players[int(player_id)] = {
+                'player_id': int(player_id),
+                'name': name,
+                'team_id': int(team_id),
+                'team_abbr': team_abbr,
+                'season': season
+            }
+
+    def player_id(self, name):
+        """Returns the ID for an exact player name, or None."""
+        return self._name_to_id.get(name)
+
+    def player(self, player_id):
+        """Returns {player_id, name, team_id, team_abbr, season}, or None."""
+        return self._players.get(player_id)
+
+    def current_team_abbr(self, player_id):
+        player = self._players.get(player_id)
+        return player['team_abbr'] if player else None
+
+    def current_team_id(self, player_id):
+        player = self._players.get(player_id)
+        return player['team_id'] if player else None
+
+    def season_average(self, player_id):
+        """Returns the player's per-game season averages (plus GP, per-36 and form) as a dict, or None."""
+        return self.aggregates.row(player_id)
+
+    def __contains__(self, name):
+        return name in self._name_to_id
@@ -1,51 +1,283 @@
 import pickle
-import pandas as pd
+import numbers
+import threading
+import numpy as np
+
+from ml_models.metrics import metrics
+
+TEAM_ABBR_PREFIX = 'TEAM_ABBR_'
+INFERENCE_BACKENDS = ('xgboost', 'numpy')
+
+
+class FeatureEncoder:
+    """
+    Maps raw team statistics dicts straight onto the trained feature columns.
+
+    The column layout is compiled once from x_columns.pkl so that encoding a
+    row is a handful of dict lookups instead of get_dummies + reindex.
+    """
+    def __init__(self, trained_columns):
+        self.columns = list(trained_columns)
+        self.n_features = len(self.columns)
+        self.numeric_index = {}
+        self.dummy_index = {}
+
+        for i, col in enumerate(self.columns):
+            if col.startswith(TEAM_ABBR_PREFIX):
+                self.dummy_index[col[len(TEAM_ABBR_PREFIX):]] = i
+            else:
+                self.numeric_index[col] = i
+
+    def encode_into(self, team_stats, row):
+        """
+        Writes one team's statistics into a zeroed feature row.
+
+        Matches the old get_dummies + reindex(fill_value=0) path: keys that
+        are not trained columns are ignored, and missing keys, None and
+        strings stay 0 (get_dummies dropped them as object columns). Only a
+        numeric NaN is left for the imputer. TEAM_ABBR sets its one-hot
+        column, if any, and so does a numeric TEAM_ABBR_<abbr> key.
+        """
+        numeric_index = self.numeric_index
+        for key, value in team_stats.items():
+            idx = numeric_index.get(key)
+            if idx is not None:
+                if isinstance(value, numbers.Number):
+                    row[idx] = value
+            elif key == 'TEAM_ABBR':
+                idx = self.dummy_index.get(value)
+                if idx is not None:
+                    row[idx] = 1.0
+            elif isinstance(value, numbers.Number) and isinstance(key, str) and key.startswith(TEAM_ABBR_PREFIX):
+                idx = self.dummy_index.get(key[len(TEAM_ABBR_PREFIX):])
+                if idx is not None:
+                    row[idx] = value
+
+    def encode_many(self, team_stats_list):
+        """Encodes a list of team statistics into an (n, n_features) float array."""
+        team_stats_list = list(team_stats_list)
+        features = np.zeros((len(team_stats_list), self.n_features), dtype=np.float64)
+        for row, team_stats in zip(features, team_stats_list):
+            self.encode_into(team_stats, row)
+        return features
+
 
 class TeamPredictionModel:
-    def __init__(self, model_path, scaler_path, imputer_path, columns_path):
+    def __init__(self, model_path=None, scaler_path=None, imputer_path=None, columns_path=None,
+                 bundle_path=None, lazy=False, backend='xgboost'):
+        """
+        Args:
+            model_path, scaler_path, imputer_path, columns_path: Pickled artifacts
+            bundle_path: Single-file model bundle, used instead of the pickles
+            lazy: Defer loading until the first prediction
+            backend: 'xgboost' to score with the XGBClassifier, or 'numpy' to
+                score with the flattened trees in ml_models.tree_ensemble
+        """
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend}")
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.imputer_path = imputer_path
+        self.columns_path = columns_path
+        self.bundle_path = bundle_path
+        self.backend = backend
+        self.model = None
+        self.tree_ensemble = None
+        self.version = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        if not lazy:
+            self._ensure_loaded()
+
+    @classmethod
+    def from_bundle(cls, bundle_path, lazy=True, backend='xgboost'):
+        """Creates a model backed by a memory-mapped bundle, loaded on first use."""
+        return cls(bundle_path=bundle_path, lazy=lazy, backend=backend)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            if self.bundle_path:
+                self._load_bundle()
+            else:
+                self._load_pickles()
+            self._loaded = True
+
+    def _load_pickles(self):
         # Load model, scaler, imputer, and column structure
-        with open(model_path, "rb") as f:
+        with open(self.model_path, "rb") as f:
             self.model = pickle.load(f)
         
-        with open(scaler_path, "rb") as f:
+        with open(self.scaler_path, "rb") as f:
             self.scaler = pickle.load(f)
         
-        with open(imputer_path, "rb") as f:
+        with open(self.imputer_path, "rb") as f:
             self.imputer = pickle.load(f)
         
-        with open(columns_path, "rb") as f:
+        with open(self.columns_path, "rb") as f:
             self.trained_columns = pickle.load(f)
         
-        self.num_cols = [col for col in self.trained_columns if not col.startswith('TEAM_ABBR_')]
+        self._compile_columns()
+        self._compile_transform()
+        if self.backend == 'numpy':
+            from ml_models.tree_ensemble import TreeEnsemble
+            self.tree_ensemble = TreeEnsemble.from_booster(self.model.get_booster())
+        self.version = 'pickle'
+
+    def _load_bundle(self):
+        from ml_models.model_bundle import ModelBundle
+
+        self.bundle = ModelBundle(self.bundle_path)
+        self.trained_columns = list(self.bundle.columns)
+        self._compile_columns()
+
+        if self.backend == 'numpy' and self.bundle.has_array('tree_feature'):
+            # The tree arrays are used straight from the memory map, and
+            # xgboost is never imported
+            from ml_models.tree_ensemble import TreeEnsemble, TREE_ARRAY_NAMES
+            self.tree_ensemble = TreeEnsemble({name: self.bundle.array(name) for name in TREE_ARRAY_NAMES})
+        else:
+            from xgboost import XGBClassifier
+            self.model = XGBClassifier()
+            self.model.load_model(self.bundle.booster_raw())
+            if self.backend == 'numpy':
+                from ml_models.tree_ensemble import TreeEnsemble
+                self.tree_ensemble = TreeEnsemble.from_booster(self.model.get_booster())
+        self.scaler = None
+        self.imputer = None
+
+        # The scaler arrays are used straight from the memory map
+        self.fill_values = np.zeros(len(self.trained_columns), dtype=np.float64)
+        self.fill_values[self.num_idx] = self.bundle.array('imputer_statistics')
+        self.center = self.bundle.array('scaler_mean')
+        self.scale = self.bundle.array('scaler_scale')
+        self.version = self.bundle.version
+
+    def _compile_columns(self):
+        self.num_cols = [col for col in self.trained_columns if not col.startswith(TEAM_ABBR_PREFIX)]
+        self.num_idx = np.array([self.trained_columns.index(col) for col in self.num_cols])
+        self.encoder = FeatureEncoder(self.trained_columns)
+
+    def _compile_transform(self):
+        """
+        Collapses the fitted imputer and scaler into per-column arrays.
+
+        fill_values holds the imputer means for numeric columns (the one-hot
+        columns are never NaN), and center/scale are the scaler's mean_ and
+        scale_ so that transform() reproduces the sklearn chain exactly.
+        """
+        n_features = len(self.trained_columns)
+
+        self.fill_values = np.zeros(n_features, dtype=np.float64)
+        self.fill_values[self.num_idx] = self.imputer.statistics_
+
+        self.center = np.zeros(n_features, dtype=np.float64)
+        self.scale = np.ones(n_features, dtype=np.float64)
+        if self.scaler.with_mean:
+            self.center[:] = self.scaler.mean_
+        if self.scaler.with_std:
+            self.scale[:] = self.scaler.scale_
+
+    def transform(self, features):
+        """
+        Imputes and scales an encoded feature matrix in place.
+
+        Dividing by scale (rather than multiplying by its reciprocal) keeps the
+        result bit-identical to StandardScaler.transform.
+        """
+        self._ensure_loaded()
+        with metrics.timer('model.impute'):
+            np.copyto(features, self.fill_values, where=np.isnan(features))
+        with metrics.timer('model.scale'):
+            features -= self.center
+            features /= self.scale
+        return features
 
     def preprocess(self, team_stats):
         """Preprocesses the team statistics and scales them."""
-        df = pd.DataFrame([team_stats])
-        df = pd.get_dummies(df)
-        df = df.reindex(columns=self.trained_columns, fill_value=0)
-        df[self.num_cols] = self.imputer.transform(df[self.num_cols])
-        df_scaled = self.scaler.transform(df)
-        return df_scaled
+        return self.preprocess_many([team_stats])
+
+    def preprocess_many(self, team_stats_list):
+        """Preprocesses a list of team statistics into one scaled feature matrix."""
+        self._ensure_loaded()
+        with metrics.timer('model.encode'):
+            features = self.encoder.encode_many(team_stats_list)
+        return self.transform(features)
 
     def predict(self, team1_stats, team2_stats):
         """Predicts the winner between two teams based on their statistics."""
-        team1_processed = self.preprocess(team1_stats)
-        team2_processed = self.preprocess(team2_stats)
+        return self.predict_many([(team1_stats, team2_stats)])[0]
 
-        prob1 = self.model.predict_proba(team1_processed)[0][1]  # Team 1 win probability
-        prob2 = self.model.predict_proba(team2_processed)[0][1]  # Team 2 win probability
+    def predict_many(self, matchups):
+        """
+        Predicts the winners of several matchups in a single model pass.
 
-        total_prob = prob1 + prob2
-        prob1_normalized = prob1 / total_prob
-        prob2_normalized = prob2 / total_prob
+        Args:
+            matchups: Sequence of (team1_stats, team2_stats) pairs
 
-        winner = "Team 1" if prob1_normalized > prob2_normalized else "Team 2"
-        
-        return {
-            "winner": winner,
-            "team1_win_prob": prob1_normalized,
-            "team2_win_prob": prob2_normalized
-        }
+        Returns:
+            list: One result dict per matchup, in the same format as predict()
+        """
+        matchups = list(matchups)
+        if not matchups:
+            return []
+
+        # Stack all team1 rows followed by all team2 rows so the imputer,
+        # scaler and predict_proba each run once for the whole batch
+        with metrics.timer('model.predict'):
+            team_stats_list = [team1 for team1, _ in matchups] + [team2 for _, team2 in matchups]
+            processed = self.preprocess_many(team_stats_list)
+
+            n = len(matchups)
+            return self.predict_features(processed[:n], processed[n:])
+
+    def predict_features(self, team1_features, team2_features):
+        """
+        Predicts matchups from already preprocessed feature rows.
+
+        Args:
+            team1_features, team2_features: (n, n_features) scaled matrices,
+                row i of each forming matchup i
+
+        Returns:
+            list: One result dict per matchup, in the same format as predict()
+        """
+        n = len(team1_features)
+        probs = self.score_features(np.concatenate([team1_features, team2_features]))
+        return self._combine_probabilities(probs[:n], probs[n:])
+
+    def predict_team_probs(self, team_stats_list):
+        """Returns the raw (unnormalized) win probability of each team row."""
+        processed = self.preprocess_many(team_stats_list)
+        return self.score_features(processed)
+
+    def score_features(self, processed):
+        """Returns the raw win probability of each row of a preprocessed matrix."""
+        self._ensure_loaded()
+        with metrics.timer('model.predict_proba'):
+            if self.tree_ensemble is not None:
+                return self.tree_ensemble.predict_proba(processed)
+            return self.model.predict_proba(processed)[:, 1]
+
+    def _combine_probabilities(self, team1_probs, team2_probs):
+        """Normalizes per-team win probabilities into head-to-head results."""
+        total_probs = team1_probs + team2_probs
+        team1_normalized = team1_probs / total_probs
+        team2_normalized = team2_probs / total_probs
+
+        results = []
+        for prob1_normalized, prob2_normalized in zip(team1_normalized, team2_normalized):
+            winner = "Team 1" if prob1_normalized > prob2_normalized else "Team 2"
+            results.append({
+                "winner": winner,
+                "team1_win_prob": prob1_normalized,
+                "team2_win_prob": prob2_normalized
+            })
+        return results
 
     def display_results(self, results):
         """Displays the prediction results."""
@@ -57,26 +289,27 @@ class TeamPredictionModel:
         print(f"Team 1 Win Probability: {team1_win_prob:.2%}")
         print(f"Team 2 Win Probability: {team2_win_prob:.2%}")
 
-# Usage example
-team1 = {
-    'W': 10, 'L': 20, 'W_PCT': 0.6, 'MIN': 240, 'FGM': 42, 'FGA': 90, 'FG_PCT': 0.47,
-    'FG3M': 6, 'FG3A': 30, 'FG3_PCT': 0.20, 'FTM': 20, 'FTA': 25, 'FT_PCT': 0.80,
-    'OREB': 10, 'DREB': 35, 'REB': 45, 'AST': 0, 'STL': 7, 'BLK': 5, 'TOV': 13, 'PF': 18,
-    'PTS': 116, 'TEAM_ABBR': 'LAL'
-}
-
-team2 = {
-    'W': 28, 'L': 22, 'W_PCT': 0.56, 'MIN': 240, 'FGM': 40, 'FGA': 88, 'FG_PCT': 0.45,
-    'FG3M': 10, 'FG3A': 28, 'FG3_PCT': 0.36, 'FTM': 22, 'FTA': 28, 'FT_PCT': 0.79,
-    'OREB': 12, 'DREB': 32, 'REB': 44, 'AST': 23, 'STL': 8, 'BLK': 6, 'TOV': 14, 'PF': 17,
-    'PTS': 112, 'TEAM_ABBR': 'BOS'
-}
-
-# Initialize the prediction model
-model = TeamPredictionModel("ml_models/xgb_model.pkl", "ml_models/scaler.pkl", 
-                            "ml_models/imputer.pkl", "ml_models/x_columns.pkl")
-
-results = model.predict(team1, team2)
-
-# Display the results
-model.display_results(results)
\ No newline at end of file
+if __name__ == "__main__":
+    # Usage example
+    team1 = {
+        'W': 10, 'L': 20, 'W_PCT': 0.6, 'MIN': 240, 'FGM': 42, 'FGA': 90, 'FG_PCT': 0.47,
+        'FG3M': 6, 'FG3A': 30, 'FG3_PCT': 0.20, 'FTM': 20, 'FTA': 25, 'FT_PCT': 0.80,
+        'OREB': 10, 'DREB': 35, 'REB': 45, 'AST': 0, 'STL': 7, 'BLK': 5, 'TOV': 13, 'PF': 18,
+        'PTS': 116, 'TEAM_ABBR': 'LAL'
+    }
+
+    team2 = {
+        'W': 28, 'L': 22, 'W_PCT': 0.56, 'MIN': 240, 'FGM': 40, 'FGA': 88, 'FG_PCT': 0.45,
+        'FG3M': 10, 'FG3A': 28, 'FG3_PCT': 0.36, 'FTM': 22, 'FTA': 28, 'FT_PCT': 0.79,
+        'OREB': 12, 'DREB': 32, 'REB': 44, 'AST': 23, 'STL': 8, 'BLK': 6, 'TOV': 14, 'PF': 17,
+        'PTS': 112, 'TEAM_ABBR': 'BOS'
+    }
+
+    # Initialize the prediction model
+    model = TeamPredictionModel("ml_models/xgb_model.pkl", "ml_models/scaler.pkl", 
+                                "ml_models/imputer.pkl", "ml_models/x_columns.pkl")
+
+    results = model.predict(team1, team2)
+
+    # Display the results
+    model.display_results(results)
@@ -0,0 +1,92 @@
+import threading
+import numpy as np
+
+# Stat weights of each impact formula; impact = weighted per-game stats / 100,
+# clamped to [IMPACT_MIN, IMPACT_MAX]
+IMPACT_FORMULAS = {
+    # Inactive players in /predict-with-performance-factors
+    'availability': {'PTS': 0.7, 'REB': 0.1, 'AST': 0.2},
+    # Rosters in /api/game-analysis
+    'analysis': {'PTS': 0.4, 'REB': 0.2, 'AST': 0.2, 'STL': 0.1, 'BLK': 0.1}
+}
+IMPACT_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK']
+IMPACT_MIN = 0.01
+IMPACT_MAX = 0.20
+
+
+class RosterImpact:
+    """
+    Impact factors of every player in the league, for every formula
+
+    All formulas are evaluated at once as one matrix product of the per-game
+    stats in the aggregate table with the IMPACT_FORMULAS weights. Rosters
+    sorted by points are built per team on first request and cached; the
+    data store builds one RosterImpact per player data load, so the cache is
+    per team and data version.
+    """
+    def __init__(self, aggregate_table):
+        """
+        Args:
+            aggregate_table: Per-player table from PlayerAggregates.table()
+        """
+        self.formulas = list(IMPACT_FORMULAS)
+        weights = np.array([[IMPACT_FORMULAS[formula].get(stat, 0.0) for formula in self.formulas]
+                            for stat in IMPACT_STATS])
+
+        self._ids = aggregate_table.index.to_numpy(dtype=np.int64)
+        self._row_of = {int(player_id): row for row, player_id in enumerate(self._ids)}
+        self._names = list(aggregate_table['PLAYER_NAME'])
+        self._team_abbrs = np.array([str(abbr) for abbr in aggregate_table['TEAM_ABBR']], dtype=object)
+        self._stats = aggregate_table[IMPACT_STATS].to_numpy(dtype=np.float64)
+        self._raw = self._stats @ weights / 100.0
+        self._impact = np.clip(self._raw, IMPACT_MIN, IMPACT_MAX)
+
+        self._rosters = {}
+        self._lock = threading.Lock()
+
+    def _column(self, formula):
+        return self.formulas.index(formula)
+
+    def raw_impact(self, player_id, formula):
+        """Returns the unclamped impact of a player under formula, or None for an unknown player."""
+        row = self._row_of.get(player_id)
+        return None if row is None else float(self._raw[row, self._column(formula)])
+
+    def impact(self, player_id, formula):
+        """Returns the clamped impact of a player under formula, or None for an unknown player."""
+        row = self._row_of.get(player_id)
+        return None if row is None else float(self._impact[row, self._column(formula)])
+
+    def player_stats(self, player_id):
+        """Returns the per-game IMPACT_STATS of a player as a dict, or None."""
+        row = self._row_of.get(player_id)
+        return None if row is None else dict(zip(IMPACT_STATS, self._stats[row].tolist()))
+
+    def team_roster(self, team_abbr, formula='analysis'):
+        """
+        Returns the players whose latest game was for team_abbr, highest scorers first
+
+        Returns:
+            list: {name, pts, reb, ast, stl, blk, impact_factor} dicts, with
+                impact_factor under formula rounded to 3 decimals. The list
+                is cached and shared, so callers must not modify it.
+        """
+        key = (team_abbr, formula)
+        roster = self._rosters.get(key)
+        if roster is not None:
+            return roster
+
+        rows = np.flatnonzero(self._team_abbrs == team_abbr)
+        rows = rows[np.argsort(-self._stats[rows, 0], kind='stable')]
+        impacts = np.round(self._impact[rows, self._column(formula)], 3)
+        roster = [
+            {
+                'name': self._names[row],
+                'pts': pts, 'reb': reb, 'ast': ast, 'stl': stl, 'blk': blk,
+                'impact_factor': impact
+            }
+            for row, (pts, reb, ast, stl, blk), impact in zip(rows, self._stats[rows].tolist(), impacts.tolist())
+        ]
+        with self._lock:
+            self._rosters[key] = roster
+        return roster
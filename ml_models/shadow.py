@@ -0,0 +1,203 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+
+def _base_model(model):
+    """Returns the TeamPredictionModel behind a model or InferencePool."""
+    model = getattr(model, 'local_model', model)
+    model._ensure_loaded()
+    return model
+
+
+class ShadowScorer:
+    """
+    Scores live traffic with a candidate model, off the request path
+
+    The serving path hands each scored batch to observe(), which only queues
+    it. A background thread rescales the batch for the candidate, scores it
+    and appends one JSON line per matchup to log_path with both models'
+    probabilities, versions and per-batch inference time. Game outcomes are
+    appended to the same log by record_outcome(), and summarize_shadow_log()
+    joins the two for accuracy.
+
+    When the queue is full batches are dropped rather than slowing requests.
+    """
+    def __init__(self, candidate_model, log_path, max_queue=1024):
+        """
+        Args:
+            candidate_model: TeamPredictionModel to evaluate
+            log_path: Append-only JSON lines log
+            max_queue: Most batches waiting to be shadow-scored
+        """
+        self.candidate = candidate_model
+        self.log_path = log_path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._write_lock = threading.Lock()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.candidate.version
+
+    def observe(self, primary_model, team1_features, team2_features, primary_results, primary_seconds):
+        """
+        Queues a batch that the primary model has just scored
+
+        Args:
+            primary_model: Model (or InferencePool) that built and scored the features
+            team1_features: Primary-scaled feature rows for team 1
+            team2_features: Primary-scaled feature rows for team 2
+            primary_results: The primary model's result dicts
+            primary_seconds: Time the primary model took to score the batch
+        """
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                self._worker.start()
+        try:
+            self._queue.put_nowait((primary_model, team1_features, team2_features,
+                                    primary_results, primary_seconds, time.time()))
+        except queue.Full:
+            self.dropped += 1
+
+    def record_outcome(self, team1, team2, team1_won, game_date=None):
+        """Appends a final result for team1 vs team2 (abbreviations) to the log."""
+        # Teams without a one-hot column are logged as None by _decode_teams
+        dummy_index = _base_model(self.candidate).encoder.dummy_index
+        self._append([{
+            'type': 'outcome',
+            'ts': time.time(),
+            'team1': team1 if team1 in dummy_index else None,
+            'team2': team2 if team2 in dummy_index else None,
+            'team1_won': bool(team1_won),
+            'game_date': game_date
+        }])
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self._shadow_score(*item)
+            except Exception as e:
+                print(f"Error in shadow scoring: {e}")
+
+    def _shadow_score(self, primary_model, team1_features, team2_features, primary_results, primary_seconds, ts):
+        primary = _base_model(primary_model)
+        candidate = _base_model(self.candidate)
+        features = np.concatenate([team1_features, team2_features])
+        team_abbrs = self._decode_teams(primary, features)
+
+        if candidate.trained_columns != primary.trained_columns:
+            raise ValueError("Candidate model was trained on different columns")
+        if candidate.version != primary.version:
+            # Undo the primary scaling and apply the candidate's
+            features = candidate.transform(features * primary.scale + primary.center)
+
+        start = time.perf_counter()
+        n = len(team1_features)
+        shadow_results = candidate.predict_features(features[:n], features[n:])
+        shadow_seconds = time.perf_counter() - start
+
+        records = []
+        for i, (primary_result, shadow_result) in enumerate(zip(primary_results, shadow_results)):
+            records.append({
+                'type': 'prediction',
+                'ts': ts,
+                'team1': team_abbrs[i],
+                'team2': team_abbrs[n + i],
+                'batch_size': n,
+                'primary': {
+                    'version': primary.version,
+                    'team1_win_prob': float(primary_result['team1_win_prob']),
+                    'seconds': primary_seconds
+                },
+                'shadow': {
+                    'version': candidate.version,
+                    'team1_win_prob': float(shadow_result['team1_win_prob']),
+                    'seconds': shadow_seconds
+                }
+            })
+        self._append(records)
+
+    @staticmethod
+    def _decode_teams(model, features):
+        """
+        Recovers each row's team abbreviation from its one-hot columns
+
+        Rows with no one-hot set (the team dropped by drop_first, or one the
+        model has never seen) decode to None.
+        """
+        abbrs = [None] * len(features)
+        for abbr, col in model.encoder.dummy_index.items():
+            for i in np.flatnonzero(features[:, col] > 0):
+                abbrs[i] = abbr
+        return abbrs
+
+    def _append(self, records):
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with self._write_lock:
+            with open(self.log_path, "a") as f:
+                f.write(lines)
+
+
+def summarize_shadow_log(log_path):
+    """
+    Compares the primary and shadow models recorded in a shadow log
+
+    Each prediction is matched with the first outcome logged for the same
+    team1/team2 pair after it.
+
+    Args:
+        log_path: Log written by ShadowScorer
+
+    Returns:
+        dict: Per-model version, latency percentiles and accuracy, plus how
+            often the two models picked the same winner
+    """
+    predictions = []
+    outcomes = {}
+    if os.path.exists(log_path):
+        with open(log_path) as f:
+            for line in f:
+                record = json.loads(line)
+                if record['type'] == 'prediction':
+                    predictions.append(record)
+                elif record['type'] == 'outcome':
+                    outcomes.setdefault((record['team1'], record['team2']), []).append(record)
+
+    summary = {'predictions': len(predictions), 'resolved': 0}
+    if not predictions:
+        return summary
+
+    primary_probs = np.array([p['primary']['team1_win_prob'] for p in predictions])
+    shadow_probs = np.array([p['shadow']['team1_win_prob'] for p in predictions])
+    summary['agreement'] = float(np.mean((primary_probs > 0.5) == (shadow_probs > 0.5)))
+
+    resolved = []
+    for i, p in enumerate(predictions):
+        for outcome in outcomes.get((p['team1'], p['team2']), []):
+            if outcome['ts'] >= p['ts']:
+                resolved.append((i, outcome['team1_won']))
+                break
+    summary['resolved'] = len(resolved)
+
+    for side, probs in (('primary', primary_probs), ('shadow', shadow_probs)):
+        seconds = np.array([p[side]['seconds'] for p in predictions])
+        stats = {
+            'versions': sorted({p[side]['version'] for p in predictions}),
+            'latency_ms_p50': float(np.percentile(seconds, 50) * 1000),
+            'latency_ms_p95': float(np.percentile(seconds, 95) * 1000)
+        }
+        if resolved:
+            idx = np.array([i for i, _ in resolved])
+            won = np.array([team1_won for _, team1_won in resolved], dtype=np.float64)
+            stats['accuracy'] = float(np.mean((probs[idx] > 0.5) == (won == 1)))
+            stats['brier'] = float(np.mean((probs[idx] - won) ** 2))
+        summary[side] = stats
+    return summary
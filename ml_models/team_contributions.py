@@ -0,0 +1,114 @@
+import threading
+import numpy as np
+
+# Player-log stats summed into team lines; TO is renamed TOV on the way out
+# to match the prediction model's columns
+CONTRIBUTION_STATS = ['MINUTES', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB',
+                      'REB', 'AST', 'STL', 'BLK', 'TO', 'PF', 'PTS']
+OUTPUT_NAMES = {'MINUTES': 'MIN', 'TO': 'TOV'}
+SHOOTING_PCTS = (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT'))
+
+
+class TeamContributions:
+    """
+    Per-team season stat lines split into per-player contribution vectors
+
+    For every team, each player's contribution is their season totals for
+    that team divided by the team's games played, so the contributions add
+    up to the team's per-game line. Removing k players is then k vector
+    subtractions from that line, independent of the size of the game log.
+    add_games() keeps the sums current as new games arrive.
+    """
+    def __init__(self, player_games):
+        """
+        Args:
+            player_games: Player game log DataFrame, as returned by DataStore.players()
+        """
+        self._lock = threading.Lock()
+        self._teams = {}
+        self._abbr_to_id = {}
+        self.add_games(player_games)
+
+    def add_games(self, new_games):
+        """Adds game rows not seen before to the team and player sums."""
+        if 'MINUTES' not in new_games.columns:
+            from ml_models.columnar_cache import parse_minutes
+            new_games = new_games.assign(MINUTES=parse_minutes(new_games['MIN']))
+
+        with self._lock:
+            for (team_id, team_abbr), games in new_games.groupby(['TEAM_ID', 'TEAM_ABBREVIATION'], observed=True):
+                team_id = int(team_id)
+                team = self._teams.get(team_id)
+                if team is None:
+                    team = self._teams[team_id] = {
+                        'team_abbr': str(team_abbr),
+                        'game_ids': set(),
+                        'player_rows': {},
+                        'sums': np.zeros((0, len(CONTRIBUTION_STATS)))
+                    }
+                self._abbr_to_id[str(team_abbr)] = team_id
+                team['game_ids'].update(games['GAME_ID'])
+
+                player_sums = games.groupby('PLAYER_ID')[CONTRIBUTION_STATS].sum()
+                new_players = [int(pid) for pid in player_sums.index if int(pid) not in team['player_rows']]
+                if new_players:
+                    for pid in new_players:
+                        team['player_rows'][pid] = len(team['player_rows'])
+                    team['sums'] = np.vstack([team['sums'], np.zeros((len(new_players), len(CONTRIBUTION_STATS)))])
+                rows = [team['player_rows'][int(pid)] for pid in player_sums.index]
+                team['sums'][rows] += player_sums.to_numpy(dtype=np.float64)
+
+                # Recompute this team's per-game contributions and line
+                team['contributions'] = team['sums'] / max(len(team['game_ids']), 1)
+                team['line'] = team['contributions'].sum(axis=0)
+
+    def copy(self):
+        """Returns an independent copy, e.g. to add games without touching a shared instance."""
+        clone = TeamContributions.__new__(TeamContributions)
+        clone._lock = threading.Lock()
+        with self._lock:
+            clone._abbr_to_id = dict(self._abbr_to_id)
+            clone._teams = {
+                team_id: {
+                    'team_abbr': team['team_abbr'],
+                    'game_ids': set(team['game_ids']),
+                    'player_rows': dict(team['player_rows']),
+                    'sums': team['sums'].copy(),
+                    'contributions': team['contributions'],
+                    'line': team['line']
+                }
+                for team_id, team in self._teams.items()
+            }
+        return clone
+
+    def team_id(self, team_abbr):
+        return self._abbr_to_id.get(team_abbr)
+
+    def players(self, team_id):
+        """Returns the IDs of every player with a contribution to the team."""
+        team = self._teams.get(team_id)
+        return list(team['player_rows']) if team else []
+
+    def contribution(self, team_id, player_id):
+        """Returns the player's per-game contribution vector to the team, or None."""
+        team = self._teams.get(team_id)
+        if team is None or player_id not in team['player_rows']:
+            return None
+        return team['contributions'][team['player_rows'][player_id]]
+
+    def team_vector(self, team_id, removed_player_ids=()):
+        """
+        Returns the team's per-game line (in CONTRIBUTION_STATS order) minus
+        the contributions of removed_player_ids, or None for an unknown team.
+        Players who never played for the team are ignored.
+        """
+        team = self._teams.get(team_id)
+        if team is None:
+            return None
+        line = team['line'].copy()
+        player_rows = team['player_rows']
+        for player_id in removed_player_ids:
+            row = player_rows.get(player_id)
+            if row is not None:
+                line -= team['contributions'][row]
+        return line
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+class TeamGameIndex:
+    """
+    The team game log sorted by team and game date, with each team's span
+
+    Rows are sorted once by (Team_ID, GAME_DATE, Game_ID), so every team's
+    games are one contiguous, date-ordered block. Teams are looked up by ID
+    or abbreviation in a dict, and "last N games" is a slice of that block,
+    so lookups don't depend on how many teams or seasons are loaded.
+    """
+    def __init__(self, team_games):
+        """
+        Args:
+            team_games: Team game log DataFrame, as returned by DataStore.team_games()
+        """
+        self.games = team_games.sort_values(['Team_ID', 'GAME_DATE', 'Game_ID'], kind='stable').reset_index(drop=True)
+
+        team_ids = self.games['Team_ID'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, team_ids[1:] != team_ids[:-1]]) if len(team_ids) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(team_ids)]
+        abbrs = self.games['TEAM_ABBR'].to_numpy()
+
+        self._spans = {}
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            span = (start, stop)
+            self._spans[int(team_ids[start])] = span
+            # A team's latest abbreviation names it
+            self._spans[str(abbrs[stop - 1])] = span
+
+    def _span(self, team):
+        if isinstance(team, (int, np.integer)):
+            return self._spans.get(int(team))
+        return self._spans.get(team)
+
+    def __contains__(self, team):
+        return self._span(team) is not None
+
+    def team_games(self, team):
+        """Returns every game of a team (ID or abbreviation), oldest first, or an empty frame."""
+        span = self._span(team)
+        if span is None:
+            return self.games.iloc[0:0]
+        return self.games.iloc[span[0]:span[1]]
+
+    def last_games(self, team, n):
+        """Returns a team's n most recent games (ID or abbreviation), oldest first, or an empty frame."""
+        span = self._span(team)
+        if span is None or n <= 0:
+            return self.games.iloc[0:0]
+        start, stop = span
+        return self.games.iloc[max(start, stop - n):stop]
@@ -0,0 +1,119 @@
+import re
+import threading
+
+# Common names that aren't a team's full name, nickname, city or abbreviation
+TEAM_ALIASES = {
+    'sixers': 'PHI', 'philly': 'PHI',
+    'thunders': 'OKC', 'okc thunder': 'OKC',
+    'blazers': 'POR', 'trailblazers': 'POR', 'portland trailblazers': 'POR',
+    'cavs': 'CLE', 'mavs': 'DAL', 'wolves': 'MIN', 't-wolves': 'MIN',
+    'pels': 'NOP', 'grizz': 'MEM', 'dubs': 'GSW', 'nugs': 'DEN',
+    'la lakers': 'LAL', 'la clippers': 'LAC', 'l.a. lakers': 'LAL', 'l.a. clippers': 'LAC',
+    'golden state': 'GSW', 'gs warriors': 'GSW', 'ny knicks': 'NYK',
+    # Abbreviations used by other sources
+    'bkn': 'BKN', 'brk': 'BKN', 'njn': 'BKN', 'pho': 'PHX', 'gs': 'GSW', 'no': 'NOP',
+    'nor': 'NOP', 'ny': 'NYK', 'sa': 'SAS', 'uth': 'UTA', 'cho': 'CHA', 'wsh': 'WAS'
+}
+
+
+def normalize_team_key(name):
+    """Lower-cases a team name and collapses whitespace so lookups are forgiving."""
+    return re.sub(r'\s+', ' ', str(name).strip().lower())
+
+
+class TeamResolver:
+    """
+    O(1) lookup from any team identifier to one canonical team record
+
+    Built once from the nba_api static team list. Full names, nicknames,
+    abbreviations, team IDs (as int or string), cities and TEAM_ALIASES all
+    map to the same record dict (id, full_name, abbreviation, nickname, city,
+    state, year_founded). Cities shared by two teams (Los Angeles) are left
+    out because they are ambiguous.
+    """
+    def __init__(self, team_records=None, aliases=TEAM_ALIASES):
+        """
+        Args:
+            team_records: List of team dicts; defaults to nba_api's static teams
+            aliases: Extra name -> abbreviation entries
+        """
+        if team_records is None:
+            from nba_api.stats.static import teams
+            team_records = teams.get_teams()
+
+        self._teams = [dict(team) for team in team_records]
+        self._by_abbr = {team['abbreviation']: team for team in self._teams}
+        self._by_id = {team['id']: team for team in self._teams}
+        self._index = {}
+
+        cities = {}
+        for team in self._teams:
+            cities.setdefault(normalize_team_key(team['city']), []).append(team)
+        for city, city_teams in cities.items():
+            if len(city_teams) == 1:
+                self._index[city] = city_teams[0]
+
+        for alias, abbr in aliases.items():
+            if abbr in self._by_abbr:
+                self._index[normalize_team_key(alias)] = self._by_abbr[abbr]
+
+        # Names and IDs win over cities and aliases
+        for team in self._teams:
+            for name in (team['full_name'], team['nickname'], team['abbreviation'], team['id']):
+                self._index[normalize_team_key(name)] = team
+
+    def teams(self):
+        """Returns every team record."""
+        return list(self._teams)
+
+    def resolve(self, name, partial=False):
+        """
+        Returns the team record for a name, abbreviation, alias or ID
+
+        Args:
+            name: Anything identifying a team, e.g. "Boston Celtics", "celtics",
+                "BOS", 1610612738 or "Sixers"
+            partial: On a miss, fall back to the first team whose full name
+                contains name or is contained in it
+
+        Returns:
+            dict: The team record, or None if no team matches
+        """
+        if name is None:
+            return None
+        if isinstance(name, int) and not isinstance(name, bool):
+            return self._by_id.get(name)
+
+        key = normalize_team_key(name)
+        team = self._index.get(key)
+        if team is None and partial and key:
+            team = next((team for team in self._teams
+                         if key in normalize_team_key(team['full_name'])
+                         or normalize_team_key(team['full_name']) in key), None)
+        return team
+
+    def team_id(self, name, partial=False):
+        team = self.resolve(name, partial)
+        return team['id'] if team else None
+
+    def abbreviation(self, name, partial=False):
+        team = self.resolve(name, partial)
+        return team['abbreviation'] if team else None
+
+    def full_name(self, name, partial=False):
+        team = self.resolve(name, partial)
+        return team['full_name'] if team else None
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_team_resolver():
+    """Returns the shared TeamResolver, building it on first use."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = TeamResolver()
+    return _resolver
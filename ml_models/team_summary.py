@@ -0,0 +1,167 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Counting stats averaged per game; percentages are recomputed from the totals
+SUMMARY_STATS = ['MIN', 'PTS', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB', 'REB',
+                 'AST', 'STL', 'BLK', 'TOV', 'PF']
+SHOOTING_PCTS = (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT'))
+
+
+class TeamSummary:
+    """
+    Materialized per-team summary of the team game log
+
+    Built in one vectorized pass over the log: games played, stat totals,
+    home and away wins and losses (home games have "vs." in MATCHUP), the
+    latest record and the last_n games. Opponents and their scores come from
+    pairing rows that share a Game_ID. add_games() folds new rows into the
+    same accumulators, so summary() is dictionary lookups and formatting.
+    """
+    def __init__(self, team_games, last_n=5):
+        """
+        Args:
+            team_games: Team game log DataFrame, as returned by DataStore.team_games()
+            last_n: Number of most recent games kept per team
+        """
+        self.last_n = last_n
+        self._lock = threading.Lock()
+        self._teams = {}
+        self._abbr_to_id = {}
+        # Game_ID -> {team_id: (team_abbr, pts)}, for opponent lookups
+        self._game_sides = {}
+        self.add_games(team_games)
+
+    def add_games(self, new_games):
+        """
+        Folds newly arrived team game rows into the summary
+
+        Args:
+            new_games: DataFrame with the same columns as the team log,
+                containing only rows not seen before
+        """
+        games = new_games.sort_values(['Team_ID', 'GAME_DATE', 'Game_ID'], kind='stable')
+        team_ids = games['Team_ID'].to_numpy(dtype=np.int64)
+        home = games['MATCHUP'].astype(str).str.contains(' vs. ', regex=False).to_numpy()
+        won = (games['WL'].astype(str) == 'W').to_numpy()
+        lost = (games['WL'].astype(str) == 'L').to_numpy()
+        splits = pd.DataFrame({
+            'Team_ID': team_ids,
+            'HOME_W': home & won, 'HOME_L': home & lost,
+            'AWAY_W': ~home & won, 'AWAY_L': ~home & lost
+        }).groupby('Team_ID').sum()
+
+        grouped = games.groupby('Team_ID', sort=True)
+        totals = grouped[SUMMARY_STATS].sum()
+        gp = grouped.size()
+        latest = grouped.tail(1).set_index('Team_ID')
+        recent = grouped.tail(self.last_n)
+
+        with self._lock:
+            for game_id, team_id, team_abbr, pts in zip(games['Game_ID'], team_ids, games['TEAM_ABBR'], games['PTS']):
+                self._game_sides.setdefault(game_id, {})[int(team_id)] = (str(team_abbr), float(pts))
+
+            recent_by_team = {}
+            for team_id, game_id, game_date, wl, pts, is_home in zip(
+                    recent['Team_ID'], recent['Game_ID'], recent['GAME_DATE'], recent['WL'], recent['PTS'],
+                    recent['MATCHUP'].astype(str).str.contains(' vs. ', regex=False)):
+                recent_by_team.setdefault(int(team_id), []).append(
+                    (pd.Timestamp(game_date), game_id, str(wl), float(pts), bool(is_home)))
+
+            for team_id in totals.index:
+                team_id = int(team_id)
+                team = self._teams.get(team_id)
+                if team is None:
+                    team = self._teams[team_id] = {
+                        'gp': 0,
+                        'totals': np.zeros(len(SUMMARY_STATS)),
+                        'splits': np.zeros(4, dtype=np.int64),
+                        'latest': None,
+                        'recent': []
+                    }
+                row = latest.loc[team_id]
+                team['gp'] += int(gp.loc[team_id])
+                team['totals'] += totals.loc[team_id].to_numpy(dtype=np.float64)
+                team['splits'] += splits.loc[team_id, ['HOME_W', 'HOME_L', 'AWAY_W', 'AWAY_L']].to_numpy(dtype=np.int64)
+                if team['latest'] is None or row['GAME_DATE'] >= team['latest']['GAME_DATE']:
+                    team['latest'] = {
+                        'TEAM_ABBR': str(row['TEAM_ABBR']),
+                        'GAME_DATE': row['GAME_DATE'],
+                        'W': int(row['W']),
+                        'L': int(row['L']),
+                        'W_PCT': float(row['W_PCT'])
+                    }
+                    self._abbr_to_id[str(row['TEAM_ABBR'])] = team_id
+                team['recent'] = sorted(team['recent'] + recent_by_team[team_id], key=lambda game: game[0])[-self.last_n:]
+
+    def copy(self):
+        """Returns an independent copy, e.g. to add games without touching a shared instance."""
+        clone = TeamSummary.__new__(TeamSummary)
+        clone.last_n = self.last_n
+        clone._lock = threading.Lock()
+        with self._lock:
+            clone._abbr_to_id = dict(self._abbr_to_id)
+            clone._game_sides = {game_id: dict(sides) for game_id, sides in self._game_sides.items()}
+            clone._teams = {
+                team_id: {
+                    'gp': team['gp'],
+                    'totals': team['totals'].copy(),
+                    'splits': team['splits'].copy(),
+                    'latest': dict(team['latest']),
+                    'recent': list(team['recent'])
+                }
+                for team_id, team in self._teams.items()
+            }
+        return clone
+
+    def summary(self, team):
+        """
+        Returns one team's summary
+
+        Args:
+            team: Team ID or abbreviation
+
+        Returns:
+            dict: TEAM_ID, TEAM_ABBR, GP, the latest W, L and W_PCT,
+                HOME_RECORD and AWAY_RECORD ("W-L"), per-game averages of
+                SUMMARY_STATS, FG_PCT/FG3_PCT/FT_PCT from the totals, and
+                LAST_5 (or LAST_<last_n>): the most recent games, newest
+                first, as {opponent, result, score, date, home}. None for
+                an unknown team.
+        """
+        team_id = int(team) if isinstance(team, (int, np.integer)) else self._abbr_to_id.get(team)
+        entry = self._teams.get(team_id)
+        if entry is None:
+            return None
+
+        latest = entry['latest']
+        home_w, home_l, away_w, away_l = entry['splits'].tolist()
+        result = {
+            'TEAM_ID': team_id,
+            'TEAM_ABBR': latest['TEAM_ABBR'],
+            'GP': entry['gp'],
+            'W': latest['W'],
+            'L': latest['L'],
+            'W_PCT': latest['W_PCT'],
+            'HOME_RECORD': f"{home_w}-{home_l}",
+            'AWAY_RECORD': f"{away_w}-{away_l}"
+        }
+        totals = dict(zip(SUMMARY_STATS, entry['totals'].tolist()))
+        for stat in SUMMARY_STATS:
+            result[stat] = totals[stat] / entry['gp'] if entry['gp'] else 0.0
+        for made, attempted, pct in SHOOTING_PCTS:
+            result[pct] = totals[made] / totals[attempted] if totals[attempted] else 0.0
+
+        last_games = []
+        for game_date, game_id, wl, pts, is_home in reversed(entry['recent']):
+            opponent = next(((abbr, opp_pts) for opp_id, (abbr, opp_pts) in self._game_sides.get(game_id, {}).items()
+                             if opp_id != team_id), None)
+            last_games.append({
+                'opponent': opponent[0] if opponent else None,
+                'result': wl,
+                'score': f"{int(pts)}-{int(opponent[1])}" if opponent else str(int(pts)),
+                'date': game_date.strftime('%Y-%m-%d'),
+                'home': is_home
+            })
+        result[f"LAST_{self.last_n}"] = last_games
+        return result
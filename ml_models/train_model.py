@@ -3,6 +3,7 @@ import pickle
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 from xgboost import XGBClassifier
+from ml_models.model_bundle import write_model_bundle
 
 class NBAModelTrainer:
     def __init__(self, csv_path):
@@ -51,7 +52,8 @@ class NBAModelTrainer:
     def save_artifacts(self, model_path="xgb_model.pkl",
                        imputer_path="imputer.pkl",
                        scaler_path="scaler.pkl",
-                       columns_path="x_columns.pkl"):
+                       columns_path="x_columns.pkl",
+                       bundle_path="model_bundle.bin"):
         with open(model_path, "wb") as f:
             pickle.dump(self.model, f)
         with open(imputer_path, "wb") as f:
@@ -60,6 +62,9 @@ class NBAModelTrainer:
             pickle.dump(self.scaler, f)
         with open(columns_path, "wb") as f:
             pickle.dump(self.columns, f)
+        if bundle_path:
+            # Single-file, memory-mappable copy of the artifacts above
+            write_model_bundle(bundle_path, self.model, self.imputer, self.scaler, self.columns)
 
     def run(self):
         self.load_data()
@@ -0,0 +1,126 @@
+import json
+import numpy as np
+
+# Names of the arrays exported into a model bundle
+TREE_ARRAY_NAMES = (
+    'tree_feature', 'tree_threshold', 'tree_left', 'tree_right',
+    'tree_default_left', 'tree_value', 'tree_roots', 'tree_base_margin', 'tree_max_depth'
+)
+
+
+def export_trees(booster):
+    """
+    Flattens a binary:logistic gbtree booster into NumPy node arrays
+
+    Every tree's nodes are concatenated into shared arrays with global child
+    indices. Leaves point back at themselves so that walking a fixed number
+    of levels always ends on a leaf, whatever the depth of each tree.
+
+    Args:
+        booster: xgboost.Booster (or anything with a compatible save_raw)
+
+    Returns:
+        dict: Array name -> NumPy array, keyed by TREE_ARRAY_NAMES
+    """
+    model = json.loads(booster.save_raw(raw_format='json'))
+    learner = model['learner']
+
+    objective = learner['objective']['name']
+    if objective != 'binary:logistic':
+        raise ValueError(f"Unsupported objective {objective}")
+    gradient_booster = learner['gradient_booster']
+    if gradient_booster['name'] != 'gbtree':
+        raise ValueError(f"Unsupported booster {gradient_booster['name']}")
+
+    features, thresholds, lefts, rights, default_lefts, values, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for tree in gradient_booster['model']['trees']:
+        left = np.asarray(tree['left_children'], dtype=np.int32)
+        right = np.asarray(tree['right_children'], dtype=np.int32)
+        n_nodes = len(left)
+        is_leaf = left == -1
+        node_ids = np.arange(n_nodes, dtype=np.int32)
+
+        features.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+        # For leaves split_conditions holds the leaf value instead of a threshold
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        thresholds.append(np.where(is_leaf, np.float32(0), conditions))
+        values.append(np.where(is_leaf, conditions, np.float32(0)))
+        lefts.append(np.where(is_leaf, node_ids, left) + offset)
+        rights.append(np.where(is_leaf, node_ids, right) + offset)
+        default_lefts.append(np.asarray(tree['default_left'], dtype=bool))
+        roots.append(offset)
+
+        max_depth = max(max_depth, _tree_depth(left, right))
+        offset += n_nodes
+
+    base_score = float(learner['learner_model_param']['base_score'])
+    base_margin = np.log(base_score / (1.0 - base_score))
+
+    return {
+        'tree_feature': np.concatenate(features),
+        'tree_threshold': np.concatenate(thresholds).astype(np.float32),
+        'tree_left': np.concatenate(lefts).astype(np.int32),
+        'tree_right': np.concatenate(rights).astype(np.int32),
+        'tree_default_left': np.concatenate(default_lefts),
+        'tree_value': np.concatenate(values).astype(np.float32),
+        'tree_roots': np.asarray(roots, dtype=np.int32),
+        'tree_base_margin': np.asarray([base_margin], dtype=np.float64),
+        'tree_max_depth': np.asarray([max_depth], dtype=np.int32)
+    }
+
+
+def _tree_depth(left, right):
+    depth = 0
+    level = [0]
+    while True:
+        level = [child for node in level for child in (left[node], right[node]) if child != -1]
+        if not level:
+            return depth
+        depth += 1
+
+
+class TreeEnsemble:
+    """
+    Vectorized evaluator for trees exported by export_trees()
+
+    All trees are walked for the whole batch at once: each step gathers the
+    current node of every (row, tree) pair and moves it one level down.
+    """
+    def __init__(self, arrays):
+        self.feature = arrays['tree_feature']
+        self.threshold = arrays['tree_threshold']
+        self.left = arrays['tree_left']
+        self.right = arrays['tree_right']
+        self.default_left = arrays['tree_default_left']
+        self.value = arrays['tree_value']
+        self.roots = arrays['tree_roots']
+        self.base_margin = float(arrays['tree_base_margin'][0])
+        self.max_depth = int(arrays['tree_max_depth'][0])
+
+    @classmethod
+    def from_booster(cls, booster):
+        return cls(export_trees(booster))
+
+    def predict_margin(self, features):
+        """Returns the raw margin (log-odds) for each row of features."""
+        # XGBoost compares features as float32
+        features = np.asarray(features, dtype=np.float32)
+        rows = np.arange(len(features))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(features), len(self.roots)))
+
+        for _ in range(self.max_depth):
+            values = features[rows, self.feature[nodes]]
+            go_left = values < self.threshold[nodes]
+            missing = np.isnan(values)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes].sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, features):
+        """Returns the positive-class probability for each row, as float32."""
+        margin = self.predict_margin(features)
+        return (1.0 / (1.0 + np.exp(-margin))).astype(np.float32)
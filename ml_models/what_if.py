@@ -0,0 +1,357 @@
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from ml_models.team_contributions import CONTRIBUTION_STATS, OUTPUT_NAMES, SHOOTING_PCTS
+
+# Model stat columns built from the team summary, in the shape of the team
+# stats dicts passed to the prediction model
+BASELINE_STATS = ['MIN', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB', 'REB',
+                  'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+# Minutes stay at the team's average: the model never saw teams playing
+# short-handed minutes, and the remaining players fill them in practice (see
+# absence_delta)
+FIXED_STATS = ('MIN',)
+# Team volume stats the remaining players take over in full (see absence_delta)
+OPPORTUNITY_STATS = ('FGA', 'FG3A', 'FTA', 'OREB', 'DREB', 'REB')
+# Upper bound on the pair absences scored per team by scan()
+MAX_SCAN_PAIRS = 200
+
+
+def absence_delta(team_line, removed):
+    """
+    Returns how much a team's per-game stats drop when some players sit out
+
+    The rest of the roster takes over the absent players' minutes:
+        - Shot attempts and rebounds (OPPORTUNITY_STATS) are set by the
+          team's pace and the opponent's misses, so the team keeps them, and
+          the shots go in at the other players' own make rates (SHOOTING_PCTS);
+          PTS follows from the makes.
+        - Everything else is refilled at the other players' per-minute
+          rates, pro rata to the minutes each already plays.
+    The MINUTES entry is always 0.
+
+    Args:
+        team_line: The team's per-game line, in CONTRIBUTION_STATS order
+        removed: Summed contributions of the absent players, as one vector
+            or one row per scenario
+
+    Returns:
+        ndarray: Same shape as removed
+    """
+    column = {stat: i for i, stat in enumerate(CONTRIBUTION_STATS)}
+    removed = np.asarray(removed, dtype=np.float64)
+    remaining = team_line - removed
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        minutes_left = remaining[..., [column['MINUTES']]]
+        refill = np.where(minutes_left > 0, removed[..., [column['MINUTES']]] / minutes_left, 0.0)
+        delta = removed - remaining * refill
+
+        for stat in OPPORTUNITY_STATS:
+            delta[..., column[stat]] = 0.0
+        for made, attempted, _ in SHOOTING_PCTS:
+            team_made, team_attempted = team_line[column[made]], team_line[column[attempted]]
+            attempted_left = remaining[..., column[attempted]]
+            rate = np.where(attempted_left > 0, remaining[..., column[made]] / attempted_left,
+                            team_made / team_attempted if team_attempted > 0 else 0.0)
+            delta[..., column[made]] = team_made - team_attempted * rate
+    delta[..., column['PTS']] = 2 * delta[..., column['FGM']] + delta[..., column['FG3M']] + delta[..., column['FTM']]
+    return delta
+
+
+class WhatIfEngine:
+    """
+    Re-scores matchups with players removed from either team
+
+    A team's baseline vector is its season record and per-game averages from
+    the team summary. Removing players subtracts their per-game contributions
+    (see TeamContributions) from the counting stats, adds back what the rest
+    of the roster produces in their minutes (see absence_delta) and
+    recomputes the shooting percentages; the adjusted vectors are then scored
+    by the same model as the baseline, through the prediction batcher.
+
+    Baseline stats are cached per team and adjusted stats per (team, removed
+    players) in a bounded LRU, both for the current data load only. Baseline
+    feature rows live in the feature cache under the engine's data version
+    and adjusted rows in its content LRU, so a repeated what-if query only
+    recomputes the side whose removals changed.
+    """
+    def __init__(self, data_store, max_adjusted_entries=1024):
+        """
+        Args:
+            data_store: DataStore providing the team summary and player contributions
+            max_adjusted_entries: Size of the LRU of adjusted team vectors
+        """
+        self.data_store = data_store
+        self.max_adjusted_entries = max_adjusted_entries
+        self._sources = (None, None)
+        self._baselines = {}
+        self._adjusted = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current_sources(self):
+        """Returns (summary, contributions), dropping cached vectors if the data was reloaded."""
+        sources = (self.data_store.team_summary(), self.data_store.team_contributions())
+        current = self._sources
+        if sources[0] is not current[0] or sources[1] is not current[1]:
+            with self._lock:
+                if sources[0] is not self._sources[0] or sources[1] is not self._sources[1]:
+                    self._baselines = {}
+                    self._adjusted = OrderedDict()
+                    self._sources = sources
+        return sources
+
+    @property
+    def data_version(self):
+        """Identifies the data load the cached vectors come from."""
+        summary, contributions = self._current_sources()
+        return f"what-if:{id(summary):x}:{id(contributions):x}"
+
+    def baseline_stats(self, team_abbr):
+        """Returns a team's baseline stats dict in the model's format, or None for an unknown team."""
+        summary, _ = self._current_sources()
+        stats = self._baselines.get(team_abbr)
+        if stats is None:
+            team = summary.summary(team_abbr)
+            if team is None:
+                return None
+            stats = {'W': team['W'], 'L': team['L'], 'W_PCT': team['W_PCT']}
+            for stat in BASELINE_STATS:
+                stats[stat] = float(team[stat])
+            for _, _, pct in SHOOTING_PCTS:
+                stats[pct] = float(team[pct])
+            stats['TEAM_ABBR'] = team['TEAM_ABBR']
+            stats['TEAM_ID'] = team['TEAM_ID']
+            with self._lock:
+                self._baselines[team_abbr] = stats
+        return stats
+
+    def removed_players(self, team_abbr, player_ids):
+        """Returns the subset of player_ids with a contribution to the team, as a frozenset."""
+        _, contributions = self._current_sources()
+        team_id = contributions.team_id(team_abbr)
+        return frozenset(player_id for player_id in player_ids
+                         if contributions.contribution(team_id, player_id) is not None)
+
+    def adjusted_stats(self, team_abbr, player_ids):
+        """
+        Returns a team's stats dict with the given players removed
+
+        Players who never played for the team are ignored; with none left
+        this is the baseline dict itself.
+
+        Args:
+            team_abbr: Team abbreviation
+            player_ids: IDs of the players to remove
+
+        Returns:
+            dict: Stats in the model's format, or None for an unknown team
+        """
+        baseline = self.baseline_stats(team_abbr)
+        if baseline is None:
+            return None
+        removed = self.removed_players(team_abbr, player_ids)
+        if not removed:
+            return baseline
+
+        key = (team_abbr, removed)
+        with self._lock:
+            stats = self._adjusted.get(key)
+            if stats is not None:
+                self._adjusted.move_to_end(key)
+                return stats
+
+        _, contributions = self._current_sources()
+        team_id = contributions.team_id(team_abbr)
+        removed_line = np.zeros(len(CONTRIBUTION_STATS))
+        for player_id in removed:
+            removed_line += contributions.contribution(team_id, player_id)
+        delta = absence_delta(contributions.team_vector(team_id), removed_line)
+
+        stats = dict(baseline)
+        for stat, value in zip(CONTRIBUTION_STATS, delta.tolist()):
+            stat = OUTPUT_NAMES.get(stat, stat)
+            if stat not in FIXED_STATS:
+                stats[stat] = max(stats[stat] - value, 0.0)
+        for made, attempted, pct in SHOOTING_PCTS:
+            stats[pct] = stats[made] / stats[attempted] if stats[attempted] > 0 else 0.0
+
+        with self._lock:
+            self._adjusted[key] = stats
+            while len(self._adjusted) > self.max_adjusted_entries:
+                self._adjusted.popitem(last=False)
+        return stats
+
+    def team_side(self, feature_cache, team_abbr, player_ids=()):
+        """
+        Returns what the batcher should score for one side of a matchup
+
+        The baseline is returned as the feature cache's row for the team,
+        reused until the data is reloaded; an adjusted side is returned as
+        its stats dict, which the feature cache encodes once per content.
+        None for an unknown team.
+        """
+        stats = self.adjusted_stats(team_abbr, player_ids)
+        if stats is None:
+            return None
+        if stats is self.baseline_stats(team_abbr):
+            return feature_cache.team_features(('what_if', team_abbr), stats, self.data_version)
+        return stats
+
+    def score(self, batcher, feature_cache, team1_abbr, team2_abbr, removed_player_ids=()):
+        """
+        Scores a matchup before and after removing players
+
+        Both matchups are submitted together so they share a model batch.
+        Each team only loses the removed players who played for it.
+
+        Args:
+            batcher: PredictionBatcher used for scoring
+            feature_cache: TeamFeatureCache the batcher scores through
+            team1_abbr: First team's abbreviation
+            team2_abbr: Second team's abbreviation
+            removed_player_ids: IDs of unavailable players from either team
+
+        Returns:
+            dict: 'baseline' and 'adjusted' model results, plus the
+                'team1_stats' and 'team2_stats' that were scored as adjusted;
+                None if either team is unknown
+        """
+        base1 = self.team_side(feature_cache, team1_abbr)
+        base2 = self.team_side(feature_cache, team2_abbr)
+        if base1 is None or base2 is None:
+            return None
+        adjusted1 = self.team_side(feature_cache, team1_abbr, removed_player_ids)
+        adjusted2 = self.team_side(feature_cache, team2_abbr, removed_player_ids)
+
+        baseline_future = batcher.submit(base1, base2, model=feature_cache)
+        if adjusted1 is base1 and adjusted2 is base2:
+            adjusted_future = baseline_future
+        else:
+            adjusted_future = batcher.submit(adjusted1, adjusted2, model=feature_cache)
+
+        return {
+            'baseline': baseline_future.result(),
+            'adjusted': adjusted_future.result(),
+            'team1_stats': self.adjusted_stats(team1_abbr, removed_player_ids),
+            'team2_stats': self.adjusted_stats(team2_abbr, removed_player_ids)
+        }
+
+    def _roster(self, team_abbr):
+        """Returns (player IDs, names, contribution matrix) of the team's current players, top scorers first."""
+        _, contributions = self._current_sources()
+        team_id = contributions.team_id(team_abbr)
+        table = self.data_store.player_aggregates().team_table(team_abbr)
+        player_ids, names, vectors = [], [], []
+        for player_id, name in zip(table.index, table['PLAYER_NAME']):
+            vector = contributions.contribution(team_id, int(player_id))
+            if vector is not None:
+                player_ids.append(int(player_id))
+                names.append(name)
+                vectors.append(vector)
+        if not vectors:
+            return [], [], np.zeros((0, len(CONTRIBUTION_STATS)))
+        matrix = np.vstack(vectors)
+        order = np.argsort(-matrix[:, CONTRIBUTION_STATS.index('PTS')], kind='stable')
+        return [player_ids[i] for i in order], [names[i] for i in order], matrix[order]
+
+    def _scenario_rows(self, model, baseline, team_line, contribution_matrix, selections):
+        """
+        Builds the scaled feature rows of every absence scenario in one pass
+
+        Args:
+            model: TeamPredictionModel used for encoding and scaling
+            baseline: The team's baseline stats dict
+            team_line: The team's per-game line, in CONTRIBUTION_STATS order
+            contribution_matrix: (p, len(CONTRIBUTION_STATS)) player contributions
+            selections: (n, p) 0/1 matrix, row i marking the players removed in scenario i
+
+        Returns:
+            ndarray: (n, n_features) preprocessed rows
+        """
+        removed = absence_delta(team_line, selections @ contribution_matrix)
+        raw = np.repeat(model.encoder.encode_many([baseline]), len(selections), axis=0)
+        numeric_index = model.encoder.numeric_index
+        values = {}
+        for j, stat in enumerate(CONTRIBUTION_STATS):
+            stat = OUTPUT_NAMES.get(stat, stat)
+            if stat in FIXED_STATS:
+                continue
+            values[stat] = np.maximum(baseline[stat] - removed[:, j], 0.0)
+            if stat in numeric_index:
+                raw[:, numeric_index[stat]] = values[stat]
+        for made, attempted, pct in SHOOTING_PCTS:
+            if pct in numeric_index:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    raw[:, numeric_index[pct]] = np.where(values[attempted] > 0, values[made] / values[attempted], 0.0)
+        return model.transform(raw)
+
+    def scan(self, feature_cache, team1_abbr, team2_abbr, max_pairs=0, pair_candidates=8):
+        """
+        Scores every single-player absence on both rosters, plus pair absences
+
+        All scenarios are built as one matrix per team from the players'
+        contribution vectors and scored in a single predict_many call, each
+        against the other team's baseline. Pairs are drawn from each team's
+        pair_candidates top scorers, highest combined scoring first.
+
+        Args:
+            feature_cache: TeamFeatureCache used for scoring
+            team1_abbr: First team's abbreviation
+            team2_abbr: Second team's abbreviation
+            max_pairs: Number of pair absences scored per team (at most MAX_SCAN_PAIRS)
+            pair_candidates: Players per team that pairs are drawn from,
+                capped at the roster size
+
+        Returns:
+            dict: 'baseline' results plus 'singles' and 'pairs' lists of
+                {team, player_ids, player_names, team1_win_prob,
+                team2_win_prob}; None if either team is unknown
+        """
+        baselines = {abbr: self.baseline_stats(abbr) for abbr in (team1_abbr, team2_abbr)}
+        if baselines[team1_abbr] is None or baselines[team2_abbr] is None:
+            return None
+        max_pairs = max(0, min(int(max_pairs), MAX_SCAN_PAIRS))
+        model = getattr(feature_cache.model, 'local_model', feature_cache.model)
+        model._ensure_loaded()
+
+        base_rows = {abbr: feature_cache.team_features(('what_if', abbr), stats, self.data_version)
+                     for abbr, stats in baselines.items()}
+        matchups = [(base_rows[team1_abbr], base_rows[team2_abbr])]
+        scenarios = []
+        for side, abbr in enumerate((team1_abbr, team2_abbr)):
+            player_ids, names, contribution_matrix = self._roster(abbr)
+            n_players = len(player_ids)
+            pts = contribution_matrix[:, CONTRIBUTION_STATS.index('PTS')]
+            # Pairs only come from the top scorers, and never more players than the roster has
+            candidates = min(max(int(pair_candidates), 0), n_players)
+            pairs = sorted(itertools.combinations(range(candidates), 2),
+                           key=lambda pair: -(pts[pair[0]] + pts[pair[1]]))[:max_pairs]
+            selections = np.zeros((n_players + len(pairs), n_players))
+            selections[np.arange(n_players), np.arange(n_players)] = 1
+            for i, (a, b) in enumerate(pairs):
+                selections[n_players + i, [a, b]] = 1
+            if not len(selections):
+                continue
+
+            _, contributions = self._current_sources()
+            team_line = contributions.team_vector(contributions.team_id(abbr))
+            rows = self._scenario_rows(model, baselines[abbr], team_line, contribution_matrix, selections)
+            other = base_rows[team2_abbr if side == 0 else team1_abbr]
+            for row, members in zip(rows, [(i,) for i in range(n_players)] + pairs):
+                matchups.append((row, other) if side == 0 else (other, row))
+                scenarios.append({
+                    'team': abbr,
+                    'player_ids': [player_ids[i] for i in members],
+                    'player_names': [names[i] for i in members]
+                })
+
+        results = feature_cache.predict_many(matchups)
+        scan = {'baseline': results[0], 'singles': [], 'pairs': []}
+        for scenario, result in zip(scenarios, results[1:]):
+            scenario['team1_win_prob'] = float(result['team1_win_prob'])
+            scenario['team2_win_prob'] = float(result['team2_win_prob'])
+            scan['singles' if len(scenario['player_ids']) == 1 else 'pairs'].append(scenario)
+        return scan
@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+
+from ml_models.columnar_cache import load_columnar
+from ml_models.data_store import TEAM_DATA_PATH, TEAM_DTYPES
+
+LOAD_OPTIONS = {'parse_dates': {'GAME_DATE': '%b %d, %Y'}, 'categorical': ('TEAM_ABBR', 'WL')}
+
+
+def read_csv_reference(path):
+    df = pd.read_csv(path, dtype=TEAM_DTYPES)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], format='%b %d, %Y')
+    return df
+
+
+def test_cached_load_matches_read_csv(tmp_path):
+    for _ in range(2):  # build, then load from the cache
+        cached = load_columnar(TEAM_DATA_PATH, TEAM_DTYPES, cache_dir=str(tmp_path), **LOAD_OPTIONS)
+        pd.testing.assert_frame_equal(
+            cached.astype({'TEAM_ABBR': object, 'WL': object}),
+            read_csv_reference(TEAM_DATA_PATH)
+        )
+
+
+def test_cache_rebuilds_when_csv_changes(tmp_path):
+    csv_path = tmp_path / "team_data.csv"
+    lines = open(TEAM_DATA_PATH).read().splitlines(keepends=True)
+    csv_path.write_text("".join(lines[:11]))
+    assert len(load_columnar(str(csv_path), TEAM_DTYPES, **LOAD_OPTIONS)) == 10
+
+    csv_path.write_text("".join(lines[:21]))
+    assert len(load_columnar(str(csv_path), TEAM_DTYPES, **LOAD_OPTIONS)) == 20
+
+    # A touch without a content change keeps the cache
+    os.utime(csv_path)
+    assert len(load_columnar(str(csv_path), TEAM_DTYPES, **LOAD_OPTIONS)) == 20
+
+
+def test_numeric_columns_are_views_on_the_memory_map(tmp_path):
+    load_columnar(TEAM_DATA_PATH, TEAM_DTYPES, cache_dir=str(tmp_path), **LOAD_OPTIONS)
+    cached = load_columnar(TEAM_DATA_PATH, TEAM_DTYPES, cache_dir=str(tmp_path), **LOAD_OPTIONS)
+    assert not cached['PTS'].to_numpy().flags.writeable
+    assert not cached['GAME_DATE'].to_numpy().flags.writeable
+
+
+def test_unwritable_cache_falls_back_to_the_parsed_csv(tmp_path):
+    # A file where the cache directory should be makes every write fail
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("")
+    loaded = load_columnar(TEAM_DATA_PATH, TEAM_DTYPES, cache_dir=str(cache_dir), **LOAD_OPTIONS)
+    reference = load_columnar(TEAM_DATA_PATH, TEAM_DTYPES, cache_dir=str(tmp_path / "ok"), **LOAD_OPTIONS)
+    pd.testing.assert_frame_equal(loaded, reference)
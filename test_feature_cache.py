@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from ml_models.feature_cache import TeamFeatureCache
+
+
+class CountingModel:
+    """Encodes a stats dict as [PTS, REB] and records every preprocessed payload."""
+    def __init__(self):
+        self.preprocessed = []
+
+    def preprocess_many(self, team_stats_list):
+        team_stats_list = list(team_stats_list)
+        self.preprocessed.extend(team_stats_list)
+        return np.array([[stats['PTS'], stats.get('REB', 0)] for stats in team_stats_list], dtype=np.float64)
+
+
+def test_named_rows_are_reused_per_data_version():
+    model = CountingModel()
+    cache = TeamFeatureCache(model)
+    row = cache.team_features('LAL', {'PTS': 110}, 1)
+    assert cache.team_features('LAL', {'PTS': 999}, 1) is row
+    assert not row.flags.writeable
+    assert len(model.preprocessed) == 1
+
+    # A new data version rebuilds the row from the new stats
+    assert cache.team_features('LAL', {'PTS': 115}, 2)[0] == 115
+    assert len(model.preprocessed) == 2
+
+
+def test_invalidate_drops_one_team_or_all():
+    model = CountingModel()
+    cache = TeamFeatureCache(model)
+    cache.team_features('LAL', {'PTS': 110}, 1)
+    cache.team_features('BOS', {'PTS': 105}, 1)
+
+    cache.invalidate('LAL')
+    assert cache.team_features('LAL', {'PTS': 120}, 1)[0] == 120
+    assert cache.team_features('BOS', {'PTS': 0}, 1)[0] == 105
+
+    cache.invalidate()
+    assert cache.team_features('BOS', {'PTS': 100}, 1)[0] == 100
+    assert len(model.preprocessed) == 4
+
+
+def test_custom_payloads_are_cached_by_content_in_a_bounded_lru():
+    model = CountingModel()
+    cache = TeamFeatureCache(model, max_custom_entries=2)
+    a, b, c = {'PTS': 1}, {'PTS': 2}, {'PTS': 3}
+
+    rows = cache.custom_features_many([a, b, dict(a)])
+    assert rows[:, 0].tolist() == [1, 2, 1]
+    assert len(model.preprocessed) == 3
+
+    # a is the most recently used, so adding c evicts b
+    cache.custom_features_many([dict(a)])
+    cache.custom_features_many([c])
+    model.preprocessed.clear()
+    cache.custom_features_many([a, c])
+    assert model.preprocessed == []
+    cache.custom_features_many([b])
+    assert model.preprocessed == [b]
+
+    # Unhashable payloads are encoded every time and never cached
+    unhashable = {'PTS': 4, 'TAGS': ['x']}
+    model.preprocessed.clear()
+    cache.custom_features_many([unhashable])
+    cache.custom_features_many([unhashable])
+    assert len(model.preprocessed) == 2
+    assert len(cache._custom) == 2
+
+
+class RecordingShadow:
+    def __init__(self):
+        self.observed = []
+
+    def observe(self, primary_model, team1_features, team2_features, primary_results, primary_seconds):
+        self.observed.append((team1_features, team2_features, primary_results))
+
+
+def test_team_probs_score_cached_rows_in_one_batch():
+    model = CountingModel()
+    model.score_features = lambda rows: rows[:, 0] / 100
+    model._combine_probabilities = lambda probs1, probs2: (probs1 / (probs1 + probs2)).tolist()
+    shadow = RecordingShadow()
+    cache = TeamFeatureCache(model, shadow=shadow)
+    cache.team_features('LAL', {'PTS': 110}, 1)
+
+    probs = cache.team_probs([('LAL', {'PTS': 999}), ('BOS', {'PTS': 90})], 1)
+    assert probs.tolist() == [1.1, 0.9]
+    assert len(model.preprocessed) == 2
+
+    # The shadow sees each team against the next one
+    team1, team2, results = shadow.observed[0]
+    assert team1[:, 0].tolist() == [110, 90]
+    assert team2[:, 0].tolist() == [90, 110]
+    assert results == pytest.approx([0.55, 0.45])
@@ -0,0 +1,49 @@
+import os
+import pytest
+
+import ml_models.inference_pool as inference_pool
+from ml_models.inference_pool import InferencePool
+from ml_models.matchup_matrix import load_latest_team_stats
+from ml_models.micro_batcher import PredictionBatcher
+from ml_models.predict_winner import TeamPredictionModel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_bundle.bin')
+TEAM_CSV = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+
+
+def test_batcher_workers_keep_several_pool_batches_in_flight():
+    model = TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy')
+    teams = list(load_latest_team_stats(TEAM_CSV).values())
+    matchups = [(teams[i % len(teams)], teams[(i * 7 + 1) % len(teams)]) for i in range(40)]
+
+    pool = InferencePool(BUNDLE_PATH, workers=2, max_pending=4, backend='numpy')
+    try:
+        batcher = PredictionBatcher(pool, max_batch_size=4, max_wait=0.01, workers=2 * pool.workers)
+        futures = [batcher.submit(team1, team2) for team1, team2 in matchups]
+        results = [future.result(60) for future in futures]
+        assert len(batcher._workers) == 4
+    finally:
+        pool.shutdown(wait=True)
+
+    for (team1, team2), result in zip(matchups, results):
+        assert result['team1_win_prob'] == pytest.approx(model.predict(team1, team2)['team1_win_prob'], rel=1e-5)
+
+
+def test_failed_shared_memory_does_not_leak_a_slot(monkeypatch):
+    teams = list(load_latest_team_stats(TEAM_CSV).values())
+    pool = InferencePool(BUNDLE_PATH, workers=1, max_pending=1, submit_timeout=0.1, backend='numpy')
+    try:
+        def no_shared_memory(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(inference_pool, 'SharedMemory', no_shared_memory)
+            for _ in range(2):
+                with pytest.raises(OSError):
+                    pool.predict_many([(teams[0], teams[1])])
+
+        # The only slot is free again, so scoring is not reported as busy
+        assert len(pool.predict_many([(teams[0], teams[1])])) == 1
+    finally:
+        pool.shutdown(wait=True)
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from ml_models.feature_cache import TeamFeatureCache
+from ml_models.matchup_matrix import MatchupMatrix, load_latest_team_stats
+from ml_models.predict_winner import TeamPredictionModel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_bundle.bin')
+TEAM_CSV = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+
+
+class CountingCache(TeamFeatureCache):
+    """Records how many teams each team_probs() batch scored."""
+    def __init__(self, model):
+        super().__init__(model)
+        self.batches = []
+
+    def team_probs(self, teams, data_version):
+        teams = list(teams)
+        self.batches.append(len(teams))
+        return super().team_probs(teams, data_version)
+
+
+def test_every_team_is_scored_in_one_batch_per_stats_version():
+    model = TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy')
+    team_data = load_latest_team_stats(TEAM_CSV)
+    cache = CountingCache(model)
+    source = {'version': 0, 'calls': []}
+
+    def load_stats(team):
+        source['calls'].append(team)
+        return team_data.get(team)
+
+    matrix = MatchupMatrix(cache, load_stats, lambda: source['version'], lambda: sorted(team_data) + ['XYZ'])
+    result = matrix.lookup('LAL', 'BOS')
+    expected = model.predict(team_data['LAL'], team_data['BOS'])
+    assert result['team1_win_probability'] == pytest.approx(expected['team1_win_prob'], rel=1e-5)
+    assert result['data_version'] == 0
+    assert matrix.lookup('XYZ', 'BOS') is None
+    assert sorted(matrix.teams()) == sorted(team_data)
+
+    # Every lookup for this version reuses the one batch
+    matrix.lookup('BOS', 'LAL')
+    assert cache.batches == [len(team_data)]
+    assert len(source['calls']) == len(team_data) + 1
+
+    # A new stats version rescored every team in a single batch again
+    team_data['LAL'] = dict(team_data['LAL'], PTS=team_data['LAL']['PTS'] + 20)
+    source['version'] = 1
+    assert matrix.teams() == []
+    result = matrix.lookup('LAL', 'BOS')
+    expected = model.predict(team_data['LAL'], team_data['BOS'])
+    assert result['team1_win_probability'] == pytest.approx(expected['team1_win_prob'], rel=1e-5)
+    assert result['data_version'] == 1
+    assert cache.batches == [len(team_data), len(team_data)]
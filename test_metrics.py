@@ -0,0 +1,24 @@
+from ml_models.metrics import LatencyHistogram, MetricsRegistry
+
+
+def test_percentiles_are_within_one_bucket():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    # Buckets are 10 per decade, so bounds are at most ~26% above the true value
+    assert 50 <= snapshot['p50_ms'] <= 50 * 1.26
+    assert 95 <= snapshot['p95_ms'] <= 100
+    assert snapshot['p99_ms'] <= snapshot['max_ms'] == 100
+
+
+def test_timer_records_when_block_raises():
+    registry = MetricsRegistry()
+    try:
+        with registry.timer('stage'):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert registry.snapshot()['stage']['count'] == 1
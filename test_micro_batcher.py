@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+
+from ml_models.micro_batcher import PredictionBatcher
+
+
+class FakeModel:
+    """Records batch sizes; holds every call until gate is set, if given."""
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.calls = []
+        self.started = threading.Event()
+
+    def predict_many(self, matchups):
+        self.calls.append(len(matchups))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if any('bad' in matchup for matchup in matchups):
+            raise ValueError("bad payload")
+        return [{'team1': team1, 'team2': team2} for team1, team2 in matchups]
+
+
+def hold_worker(batcher, model):
+    """Submits one matchup and waits until the worker is blocked scoring it."""
+    future = batcher.submit('held', 'held')
+    assert model.started.wait(5)
+    return future
+
+
+def test_lone_request_skips_the_window():
+    model = FakeModel()
+    batcher = PredictionBatcher(model, max_wait=5)
+    start = time.monotonic()
+    assert batcher.predict('LAL', 'BOS', timeout=5) == {'team1': 'LAL', 'team2': 'BOS'}
+    assert time.monotonic() - start < 1
+    assert model.calls == [1]
+
+
+def test_queued_requests_are_scored_as_one_batch():
+    gate = threading.Event()
+    model = FakeModel(gate)
+    batcher = PredictionBatcher(model, max_wait=0.01)
+    held = hold_worker(batcher, model)
+    futures = [batcher.submit(f"T{i}", 'BOS') for i in range(5)]
+    gate.set()
+
+    assert held.result(5)['team1'] == 'held'
+    assert [future.result(5)['team1'] for future in futures] == [f"T{i}" for i in range(5)]
+    assert model.calls == [1, 5]
+
+
+def test_window_waits_for_callers_still_submitting():
+    model = FakeModel()
+    batcher = PredictionBatcher(model, max_wait=2)
+    # Another caller has registered but not queued its matchup yet
+    with batcher._lock:
+        batcher._waiting += 1
+    first = batcher.submit('LAL', 'BOS')
+    time.sleep(0.1)
+    with batcher._lock:
+        batcher._waiting -= 1
+    second = batcher.submit('NYK', 'MIA')
+
+    assert first.result(5)['team1'] == 'LAL'
+    assert second.result(5)['team1'] == 'NYK'
+    assert model.calls == [2]
+
+
+def test_window_collects_requests_arriving_close_together():
+    model = FakeModel()
+    batcher = PredictionBatcher(model, max_wait=0.5)
+    futures = []
+    for i in range(4):
+        futures.append(batcher.submit(f"T{i}", 'BOS'))
+        time.sleep(0.01)
+
+    assert [future.result(5)['team1'] for future in futures] == [f"T{i}" for i in range(4)]
+    # The first request arrived after an idle spell; the rest shared one window
+    assert model.calls in ([1, 3], [4])
+
+
+def test_requests_pinned_to_different_models_are_scored_separately():
+    gate = threading.Event()
+    model = FakeModel(gate)
+    other = FakeModel()
+    batcher = PredictionBatcher(model, max_wait=0.01)
+    hold_worker(batcher, model)
+    futures = [batcher.submit('A', 'B'), batcher.submit('C', 'D', model=other), batcher.submit('E', 'F')]
+    gate.set()
+
+    assert [future.result(5)['team1'] for future in futures] == ['A', 'C', 'E']
+    assert model.calls == [1, 2]
+    assert other.calls == [1]
+
+
+def test_failed_batch_is_retried_per_item():
+    gate = threading.Event()
+    model = FakeModel(gate)
+    batcher = PredictionBatcher(model, max_wait=0.01)
+    hold_worker(batcher, model)
+    good = batcher.submit('LAL', 'BOS')
+    bad = batcher.submit('bad', 'BOS')
+    also_good = batcher.submit('NYK', 'MIA')
+    gate.set()
+
+    assert good.result(5)['team1'] == 'LAL'
+    assert also_good.result(5)['team1'] == 'NYK'
+    with pytest.raises(ValueError):
+        bad.result(5)
+    assert model.calls == [1, 3, 1, 1, 1]
+
+
+def test_workers_score_batches_concurrently():
+    active = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    class SlowModel:
+        def predict_many(self, matchups):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+            return [{'team1': team1, 'team2': team2} for team1, team2 in matchups]
+
+    batcher = PredictionBatcher(SlowModel(), max_batch_size=2, max_wait=0.01, workers=3)
+    futures = [batcher.submit(f"T{i}", 'BOS') for i in range(12)]
+    assert [future.result(5)['team1'] for future in futures] == [f"T{i}" for i in range(12)]
+    assert active['max'] > 1
@@ -0,0 +1,94 @@
+import os
+import shutil
+import threading
+import time
+
+from ml_models.matchup_matrix import load_latest_team_stats
+from ml_models.micro_batcher import PredictionBatcher
+from ml_models.model_reloader import ModelReloader
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_bundle.bin')
+TEAM_CSV = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+
+
+def smoke_matchups():
+    teams = load_latest_team_stats(TEAM_CSV)
+    return [(teams['LAL'], teams['BOS'])]
+
+
+def test_reload_warms_and_swaps_the_new_model():
+    swapped = []
+    reloader = ModelReloader(BUNDLE_PATH, swapped.append, smoke_matchups=smoke_matchups, backend='numpy')
+    assert reloader.reload(wait=True)
+    assert len(swapped) == 1 and swapped[0]._loaded
+    assert reloader.current_version == swapped[0].version
+    assert reloader.last_error is None
+
+    # Same version again is a no-op unless forced
+    reloader.reload(wait=True)
+    assert len(swapped) == 1
+    reloader.reload(wait=True, force=True)
+    assert len(swapped) == 2
+
+
+def test_failed_warm_up_keeps_the_current_model():
+    swapped = []
+
+    def broken_matchups():
+        raise RuntimeError("smoke data unavailable")
+
+    reloader = ModelReloader(BUNDLE_PATH, swapped.append, smoke_matchups=broken_matchups,
+                             current_version='old', backend='numpy')
+    reloader.reload(wait=True)
+    assert swapped == []
+    assert reloader.current_version == 'old'
+    assert "smoke data unavailable" in reloader.last_error
+
+
+def test_requests_in_flight_finish_on_the_model_they_pinned():
+    class FakeModel:
+        def __init__(self, name, gate=None):
+            self.name = name
+            self.gate = gate
+            self.started = threading.Event()
+
+        def predict_many(self, matchups):
+            self.started.set()
+            if self.gate is not None:
+                self.gate.wait(5)
+            return [{'model': self.name} for _ in matchups]
+
+    gate = threading.Event()
+    old = FakeModel('old', gate)
+    batcher = PredictionBatcher(old, max_wait=0.01)
+    held = batcher.submit('LAL', 'BOS')
+    assert old.started.wait(5)
+    pinned = batcher.submit('LAL', 'BOS', model=old)
+
+    reloader = ModelReloader(BUNDLE_PATH, lambda model: setattr(batcher, 'model', FakeModel('new')),
+                             backend='numpy')
+    reloader.reload(wait=True, force=True)
+    unpinned = batcher.submit('LAL', 'BOS')
+    gate.set()
+
+    assert held.result(5)['model'] == 'old'
+    assert pinned.result(5)['model'] == 'old'
+    assert unpinned.result(5)['model'] == 'new'
+
+
+def test_watch_only_reloads_after_the_bundle_changes(tmp_path):
+    bundle_path = str(tmp_path / "model_bundle.bin")
+    shutil.copy(BUNDLE_PATH, bundle_path)
+    swapped = []
+    reloader = ModelReloader(bundle_path, swapped.append, backend='numpy')
+    reloader.watch(0.01)
+    time.sleep(0.2)
+    assert swapped == []
+
+    stat = os.stat(bundle_path)
+    os.utime(bundle_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    deadline = time.monotonic() + 10
+    while not swapped and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(swapped) == 1
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models.data_store import DataStore, get_data_store
+from ml_models.player_aggregates import PlayerAggregates
+
+
+def test_aggregates_match_the_game_log():
+    games = get_data_store().players()
+    table = PlayerAggregates(games, last_n=5).table()
+
+    rows = games[games['PLAYER_NAME'] == "LeBron James"].sort_values('GAME_DATE')
+    lebron = table.loc[rows['PLAYER_ID'].iloc[0]]
+    assert lebron['GP'] == len(rows)
+    assert lebron['PTS'] == pytest.approx(rows['PTS'].mean())
+    assert lebron['PTS_PER36'] == pytest.approx(rows['PTS'].sum() / rows['MINUTES'].sum() * 36)
+    assert lebron['PTS_LAST5'] == pytest.approx(rows['PTS'].tail(5).mean())
+
+
+def test_incremental_updates_match_a_full_rebuild():
+    games = get_data_store().players().sort_values(['GAME_DATE', 'GAME_ID'], kind='stable')
+    split = len(games) - 500
+
+    incremental = PlayerAggregates(games.iloc[:split])
+    incremental.add_games(games.iloc[split:split + 250])
+    incremental.add_games(games.iloc[split + 250:])
+
+    expected = PlayerAggregates(games).table().sort_index()
+    actual = incremental.table().sort_index()
+    numeric = [col for col in expected.columns if expected[col].dtype.kind in 'if']
+    np.testing.assert_allclose(actual[numeric].to_numpy(float), expected[numeric].to_numpy(float))
+    assert list(actual['TEAM_ABBR']) == list(expected['TEAM_ABBR'])
+
+
+def copy_player_log(tmp_path):
+    from ml_models.data_store import PLAYER_DATA_PATH
+    csv_path = tmp_path / "players.csv"
+    df = pd.read_csv(PLAYER_DATA_PATH, dtype=str)
+    df.to_csv(csv_path, index=False)
+    return csv_path, df
+
+
+def rewrite(csv_path, df):
+    df.to_csv(csv_path, index=False)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_edited_rows_rebuild_the_aggregates(tmp_path, capsys):
+    csv_path, df = copy_player_log(tmp_path)
+    store = DataStore(player_path=str(csv_path), cache_dir=str(tmp_path / "cache"))
+    lebron = int(df.loc[df['PLAYER_NAME'] == "LeBron James", 'PLAYER_ID'].iloc[0])
+    before = store.player_aggregates().row(lebron)['PTS']
+
+    rows = df['PLAYER_ID'].astype(int) == lebron
+    df.loc[rows, 'PTS'] = (df.loc[rows, 'PTS'].astype(float) + 50).astype(str)
+    rewrite(csv_path, df)
+    capsys.readouterr()
+    assert store.player_aggregates().row(lebron)['PTS'] == pytest.approx(before + 50)
+    assert "new player game rows" not in capsys.readouterr().out
+
+
+def test_appended_rows_update_the_aggregates_incrementally(tmp_path, capsys):
+    csv_path, df = copy_player_log(tmp_path)
+    store = DataStore(player_path=str(csv_path), cache_dir=str(tmp_path / "cache"))
+    split = len(df) - 300
+    rewrite(csv_path, df.iloc[:split])
+    store.player_aggregates()
+
+    rewrite(csv_path, df)
+    capsys.readouterr()
+    actual = store.player_aggregates().table().sort_index()
+    assert "Adding 300 new player game rows" in capsys.readouterr().out
+    expected = PlayerAggregates(store.players()).table().sort_index()
+    numeric = [col for col in expected.columns if expected[col].dtype.kind in 'if']
+    np.testing.assert_allclose(actual[numeric].to_numpy(float), expected[numeric].to_numpy(float))
@@ -0,0 +1,22 @@
+import pytest
+
+from ml_models.data_store import get_data_store
+
+
+def test_index_matches_table_scans():
+    store = get_data_store()
+    players = store.players()
+    index = store.player_index()
+
+    for name in ("LeBron James", "Jayson Tatum"):
+        rows = players[players['PLAYER_NAME'] == name].sort_values('GAME_DATE')
+        player_id = index.player_id(name)
+        assert player_id == rows['PLAYER_ID'].iloc[-1]
+        assert index.current_team_abbr(player_id) == rows['TEAM_ABBREVIATION'].iloc[-1]
+
+        average = index.season_average(player_id)
+        assert average['GP'] == len(rows)
+        assert average['PTS'] == pytest.approx(rows['PTS'].mean())
+        assert average['FG_PCT'] == pytest.approx(rows['FGM'].sum() / rows['FGA'].sum())
+
+    assert index.player_id("Not A Player") is None
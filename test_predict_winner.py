@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import pandas as pd
+
+from ml_models.predict_winner import TeamPredictionModel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'ml_models')
+TEAM_CSV = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+
+
+def load_model():
+    return TeamPredictionModel(
+        os.path.join(MODEL_DIR, "xgb_model.pkl"),
+        os.path.join(MODEL_DIR, "scaler.pkl"),
+        os.path.join(MODEL_DIR, "imputer.pkl"),
+        os.path.join(MODEL_DIR, "x_columns.pkl")
+    )
+
+
+def load_team_rows():
+    df = pd.read_csv(TEAM_CSV)
+    df = df.drop(columns=['GAME_DATE', 'MATCHUP', 'WL'])
+    return df.to_dict(orient='records')
+
+
+def sklearn_chain(model, features):
+    """The imputer -> scaler chain exactly as the fitted sklearn objects run it."""
+    df = pd.DataFrame(features.copy(), columns=model.trained_columns)
+    df[model.num_cols] = model.imputer.transform(df[model.num_cols])
+    return model.scaler.transform(df)
+
+
+def test_fused_transform_matches_sklearn_chain():
+    model = load_model()
+    features = model.encoder.encode_many(load_team_rows())
+
+    # Knock out a spread of values so the imputation path is exercised too
+    rng = np.random.default_rng(0)
+    holes = rng.random(features.shape) < 0.05
+    one_hot = np.ones(features.shape[1], dtype=bool)
+    one_hot[model.num_idx] = False
+    holes[:, one_hot] = False
+    features[holes] = np.nan
+
+    expected = sklearn_chain(model, features)
+    actual = model.transform(features.copy())
+
+    assert actual.dtype == expected.dtype
+    assert np.array_equal(actual, expected)
+
+
+def test_predict_many_matches_predict():
+    model = load_model()
+    rows = load_team_rows()[:20]
+    matchups = list(zip(rows[::2], rows[1::2]))
+
+    batched = model.predict_many(matchups)
+    for (team1, team2), result in zip(matchups, batched):
+        single = model.predict(team1, team2)
+        assert single['winner'] == result['winner']
+        assert np.isclose(single['team1_win_prob'], result['team1_win_prob'])
+
+
+def test_bundle_matches_pickles(tmp_path):
+    from ml_models.model_bundle import write_model_bundle
+
+    model = load_model()
+    bundle_path = str(tmp_path / "model_bundle.bin")
+    write_model_bundle(bundle_path, model.model, model.imputer, model.scaler, model.trained_columns)
+
+    bundled = TeamPredictionModel.from_bundle(bundle_path)
+    assert not bundled._loaded
+
+    rows = load_team_rows()
+    expected = model.predict_team_probs(rows)
+    actual = bundled.predict_team_probs(rows)
+    assert bundled._loaded
+    assert bundled.trained_columns == model.trained_columns
+    assert np.array_equal(actual, expected)
+
+
+def legacy_preprocess(model, team_stats):
+    """The get_dummies -> reindex -> imputer -> scaler path the encoder replaced."""
+    df = pd.DataFrame([team_stats])
+    df = pd.get_dummies(df)
+    df = df.reindex(columns=model.trained_columns, fill_value=0)
+    df[model.num_cols] = model.imputer.transform(df[model.num_cols])
+    return model.scaler.transform(df)
+
+
+def test_encoder_matches_get_dummies_on_odd_payloads():
+    model = load_model()
+    base = load_team_rows()[0]
+    payloads = [
+        dict(base, W=None),
+        dict(base, W=None, PTS=None, TEAM_ABBR=None),
+        dict(base, W='10', FG_PCT='0.45'),
+        dict(base, PTS=np.nan),
+        dict(base, UNKNOWN_STAT=5, EXTRA='text'),
+        dict(base, TEAM_ABBR='XYZ'),
+        {'PTS': 110, 'TEAM_ABBR': 'BOS'},
+        {'TEAM_ABBR_LAL': 1, 'W': 30}
+    ]
+    for team_stats in payloads:
+        expected = legacy_preprocess(model, team_stats)
+        actual = model.transform(model.encoder.encode_many([team_stats]))
+        assert np.allclose(actual, expected, equal_nan=True), team_stats
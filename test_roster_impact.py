@@ -0,0 +1,23 @@
+import pytest
+
+from ml_models.data_store import get_data_store
+from ml_models.roster_impact import RosterImpact
+
+
+def test_impacts_match_the_per_player_formulas():
+    table = get_data_store().player_aggregates().table()
+    impact = RosterImpact(table)
+
+    roster = impact.team_roster('LAL', 'analysis')
+    lakers = table[table['TEAM_ABBR'] == 'LAL'].sort_values('PTS', ascending=False)
+    assert [player['name'] for player in roster] == list(lakers['PLAYER_NAME'])
+
+    top = lakers.iloc[0]
+    raw = (0.4 * top['PTS'] + 0.2 * top['REB'] + 0.2 * top['AST'] + 0.1 * top['STL'] + 0.1 * top['BLK']) / 100
+    assert roster[0]['impact_factor'] == round(min(max(raw, 0.01), 0.20), 3)
+
+    player_id = int(lakers.index[0])
+    raw = (0.7 * top['PTS'] + 0.1 * top['REB'] + 0.2 * top['AST']) / 100
+    assert impact.raw_impact(player_id, 'availability') == pytest.approx(raw)
+    assert impact.impact(player_id, 'availability') == pytest.approx(min(max(raw, 0.01), 0.20))
+    assert impact.team_roster('LAL', 'analysis') is roster
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ml_models.matchup_matrix import load_latest_team_stats
+from ml_models.predict_winner import TeamPredictionModel
+from ml_models.shadow import ShadowScorer, summarize_shadow_log
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_bundle.bin')
+TEAM_CSV = os.path.join(BASE_DIR, 'data', 'team_data.csv')
+
+
+def read_log(path, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            if len(records) >= count:
+                return records
+        except FileNotFoundError:
+            pass
+        time.sleep(0.02)
+    raise AssertionError(f"expected {count} log records")
+
+
+def test_candidate_rescales_the_primary_features(tmp_path):
+    primary = TeamPredictionModel.from_bundle(BUNDLE_PATH, lazy=False, backend='numpy')
+    candidate = TeamPredictionModel.from_bundle(BUNDLE_PATH, lazy=False, backend='numpy')
+    # A candidate fitted with a different scaler
+    candidate.version = 'candidate'
+    candidate.center = candidate.center + 1.0
+    candidate.scale = candidate.scale * 2.0
+
+    teams = load_latest_team_stats(TEAM_CSV)
+    matchups = [(teams['LAL'], teams['BOS']), (teams['NYK'], teams['MIA'])]
+    features = primary.preprocess_many([team1 for team1, _ in matchups] + [team2 for _, team2 in matchups])
+    primary_results = primary.predict_features(features[:2], features[2:])
+
+    log_path = str(tmp_path / "shadow.jsonl")
+    scorer = ShadowScorer(candidate, log_path)
+    scorer.observe(primary, features[:2], features[2:], primary_results, 0.001)
+    records = read_log(log_path, 2)
+
+    for record, (team1, team2), primary_result in zip(records, matchups, primary_results):
+        assert (record['team1'], record['team2']) == (team1['TEAM_ABBR'], team2['TEAM_ABBR'])
+        assert record['primary']['team1_win_prob'] == pytest.approx(float(primary_result['team1_win_prob']))
+        assert record['shadow']['version'] == 'candidate'
+        assert record['shadow']['team1_win_prob'] == pytest.approx(
+            float(candidate.predict(team1, team2)['team1_win_prob']), rel=1e-5)
+
+
+def test_batches_are_dropped_when_the_queue_is_full(tmp_path):
+    gate = threading.Event()
+
+    class BlockingModel:
+        def _ensure_loaded(self):
+            gate.wait(5)
+            raise RuntimeError("not a real model")
+
+    scorer = ShadowScorer(BlockingModel(), str(tmp_path / "shadow.jsonl"), max_queue=1)
+    scorer.observe(BlockingModel(), None, None, [], 0.0)
+    # Wait for the worker to take the first batch and block on it
+    deadline = time.monotonic() + 5
+    while scorer._queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    scorer.observe(BlockingModel(), None, None, [], 0.0)
+    scorer.observe(BlockingModel(), None, None, [], 0.0)
+    assert scorer.dropped == 1
+    gate.set()
+
+
+def test_summary_joins_outcomes_after_each_prediction(tmp_path):
+    def prediction(ts, team1, team2, primary, shadow):
+        return {
+            'type': 'prediction', 'ts': ts, 'team1': team1, 'team2': team2, 'batch_size': 1,
+            'primary': {'version': 'v1', 'team1_win_prob': primary, 'seconds': 0.001},
+            'shadow': {'version': 'v2', 'team1_win_prob': shadow, 'seconds': 0.003}
+        }
+
+    def outcome(ts, team1, team2, team1_won):
+        return {'type': 'outcome', 'ts': ts, 'team1': team1, 'team2': team2,
+                'team1_won': team1_won, 'game_date': None}
+
+    log_path = tmp_path / "shadow.jsonl"
+    records = [
+        outcome(0, 'LAL', 'BOS', False),  # before any prediction, never joined
+        prediction(1, 'LAL', 'BOS', 0.7, 0.4),
+        prediction(2, 'NYK', 'MIA', 0.6, 0.8),
+        outcome(3, 'LAL', 'BOS', True),
+        outcome(4, 'NYK', 'MIA', False),
+        prediction(5, 'LAL', 'BOS', 0.2, 0.3)  # no outcome after it
+    ]
+    log_path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    summary = summarize_shadow_log(str(log_path))
+    assert summary['predictions'] == 3
+    assert summary['resolved'] == 2
+    assert summary['agreement'] == pytest.approx(2 / 3)
+    assert summary['primary']['versions'] == ['v1']
+    assert summary['primary']['accuracy'] == pytest.approx(0.5)
+    assert summary['primary']['brier'] == pytest.approx(((0.7 - 1) ** 2 + 0.6 ** 2) / 2)
+    assert summary['shadow']['accuracy'] == pytest.approx(0.0)
+    assert summary['shadow']['brier'] == pytest.approx(((0.4 - 1) ** 2 + 0.8 ** 2) / 2)
+    assert summary['shadow']['latency_ms_p50'] == pytest.approx(3.0)
+    assert summarize_shadow_log(str(tmp_path / "missing.jsonl")) == {'predictions': 0, 'resolved': 0}
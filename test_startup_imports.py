@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+from benchmark_startup import DEFERRED_IMPORTS, check
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPT = """
+import json, sys
+import app
+loaded = [name for name in sys.argv[1:] if name in sys.modules]
+app.app.test_client().get('/api/teams')
+after_teams = [name for name in sys.argv[1:] if name in sys.modules]
+print(json.dumps({'import': loaded, 'teams': after_teams}))
+"""
+
+
+def test_app_import_and_teams_route_defer_heavy_modules():
+    result = subprocess.run([sys.executable, '-c', SCRIPT, *DEFERRED_IMPORTS],
+                            capture_output=True, text=True, check=True, cwd=BASE_DIR)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert loaded == {'import': [], 'teams': []}
+
+
+def test_entry_points_pass_the_startup_check():
+    assert check(['api.index']) == []
+
+
+def test_app_import_leaves_sighup_alone():
+    script = "import signal, app; print(signal.getsignal(signal.SIGHUP) == signal.SIG_DFL)"
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=BASE_DIR)
+    assert result.stdout.strip().splitlines()[-1] == 'True'
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models.data_store import DataStore, get_data_store
+from ml_models.team_contributions import CONTRIBUTION_STATS, TeamContributions
+from ml_models.what_if import WhatIfEngine, absence_delta
+
+
+def test_removing_players_matches_a_filtered_groupby():
+    games = get_data_store().players()
+    contributions = TeamContributions(games)
+
+    team_games = games[games['TEAM_ABBREVIATION'] == 'LAL']
+    team_id = int(team_games['TEAM_ID'].iloc[0])
+    removed = list(team_games.groupby('PLAYER_ID')['PTS'].sum().nlargest(2).index)
+
+    kept = team_games[~team_games['PLAYER_ID'].isin(removed)]
+    expected = kept[CONTRIBUTION_STATS].sum().to_numpy(float) / team_games['GAME_ID'].nunique()
+    np.testing.assert_allclose(contributions.team_vector(team_id, removed), expected)
+
+    # The what-if engine turns the line into a stats dict in the model's format
+    engine = WhatIfEngine(get_data_store())
+    stats = engine.adjusted_stats('LAL', removed)
+    delta = absence_delta(contributions.team_vector(team_id),
+                          sum(contributions.contribution(team_id, player_id) for player_id in removed))
+    assert stats['TEAM_ABBR'] == 'LAL'
+    assert stats['TOV'] == pytest.approx(engine.baseline_stats('LAL')['TOV'] - delta[CONTRIBUTION_STATS.index('TO')])
+    assert stats['FG_PCT'] == pytest.approx(stats['FGM'] / stats['FGA'])
+
+
+def test_incremental_updates_match_a_full_rebuild():
+    games = get_data_store().players().sort_values(['GAME_DATE', 'GAME_ID'], kind='stable')
+    split = len(games) - 500
+
+    incremental = TeamContributions(games.iloc[:split])
+    incremental.add_games(games.iloc[split:])
+    expected = TeamContributions(games)
+
+    for team_id in games['TEAM_ID'].unique():
+        np.testing.assert_allclose(incremental.team_vector(int(team_id)), expected.team_vector(int(team_id)))
+
+
+def test_edited_rows_rebuild_the_contributions(tmp_path):
+    from ml_models.data_store import PLAYER_DATA_PATH
+
+    csv_path = tmp_path / "players.csv"
+    df = pd.read_csv(PLAYER_DATA_PATH, dtype=str)
+    df.to_csv(csv_path, index=False)
+    store = DataStore(player_path=str(csv_path), cache_dir=str(tmp_path / "cache"))
+    engine = WhatIfEngine(store)
+    lebron = int(df.loc[df['PLAYER_NAME'] == "LeBron James", 'PLAYER_ID'].iloc[0])
+    team_id = store.team_contributions().team_id('LAL')
+    before = store.team_contributions().contribution(team_id, lebron).copy()
+    adjusted_before = engine.adjusted_stats('LAL', [lebron])['AST']
+
+    rows = df['PLAYER_ID'].astype(int) == lebron
+    df.loc[rows, 'AST'] = (df.loc[rows, 'AST'].astype(float) + 5).astype(str)
+    df.to_csv(csv_path, index=False)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    after = store.team_contributions().contribution(team_id, lebron)
+    np.testing.assert_allclose(after, TeamContributions(store.players()).contribution(team_id, lebron))
+    assert after[CONTRIBUTION_STATS.index('AST')] > before[CONTRIBUTION_STATS.index('AST')]
+    # What-if results follow the reloaded contributions
+    assert engine.adjusted_stats('LAL', [lebron])['AST'] < adjusted_before
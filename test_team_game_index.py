@@ -0,0 +1,14 @@
+from ml_models.data_store import get_data_store
+from ml_models.team_game_index import TeamGameIndex
+
+
+def test_last_games_are_the_teams_most_recent_in_date_order():
+    games = get_data_store().team_games()
+    index = TeamGameIndex(games)
+
+    lakers = games[games['TEAM_ABBR'] == 'LAL'].sort_values('GAME_DATE')
+    last5 = index.last_games('LAL', 5)
+    assert list(last5['Game_ID']) == list(lakers['Game_ID'].iloc[-5:])
+    assert list(index.last_games(int(lakers['Team_ID'].iloc[0]), 5)['Game_ID']) == list(last5['Game_ID'])
+    assert len(index.team_games('LAL')) == len(lakers)
+    assert index.last_games('XXX', 5).empty
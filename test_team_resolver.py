@@ -0,0 +1,15 @@
+from ml_models.team_resolver import get_team_resolver
+
+
+def test_every_identifier_resolves_to_the_same_team():
+    resolver = get_team_resolver()
+    for name in ("Philadelphia 76ers", "76ers", "Sixers", "PHI", "phi", "Philadelphia",
+                 1610612755, "1610612755", "  philadelphia   76ERS "):
+        assert resolver.abbreviation(name) == "PHI", name
+
+
+def test_ambiguous_and_unknown_names():
+    resolver = get_team_resolver()
+    assert resolver.resolve("Los Angeles") is None
+    assert resolver.resolve("Nowhere Nobodies") is None
+    assert resolver.abbreviation("Okla", partial=True) == "OKC"
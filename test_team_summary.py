@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ml_models.data_store import TEAM_DATA_PATH, DataStore, get_data_store
+from ml_models.team_summary import TeamSummary
+
+
+def test_summary_matches_the_game_log():
+    games = get_data_store().team_games()
+    summary = TeamSummary(games).summary('LAL')
+
+    lakers = games[games['TEAM_ABBR'] == 'LAL'].sort_values('GAME_DATE')
+    home = lakers['MATCHUP'].str.contains(' vs. ', regex=False)
+    assert summary['GP'] == len(lakers)
+    assert (summary['W'], summary['L']) == (lakers['W'].iloc[-1], lakers['L'].iloc[-1])
+    assert summary['HOME_RECORD'] == f"{(home & (lakers['WL'] == 'W')).sum()}-{(home & (lakers['WL'] == 'L')).sum()}"
+    assert summary['PTS'] == pytest.approx(lakers['PTS'].mean())
+
+    last = lakers.iloc[-1]
+    opponent = games[(games['Game_ID'] == last['Game_ID']) & (games['TEAM_ABBR'] != 'LAL')].iloc[0]
+    assert summary['LAST_5'][0]['opponent'] == opponent['TEAM_ABBR']
+    assert summary['LAST_5'][0]['score'] == f"{int(last['PTS'])}-{int(opponent['PTS'])}"
+
+
+def test_incremental_updates_match_a_full_rebuild():
+    games = get_data_store().team_games().sort_values('GAME_DATE', kind='stable')
+    incremental = TeamSummary(games.iloc[:-100])
+    incremental.add_games(games.iloc[-100:])
+    expected = TeamSummary(games)
+
+    for abbr in games['TEAM_ABBR'].unique():
+        assert incremental.summary(abbr) == expected.summary(abbr)
+
+
+def test_edited_rows_rebuild_the_summary(tmp_path):
+    csv_path = tmp_path / "team_data.csv"
+    df = pd.read_csv(TEAM_DATA_PATH, dtype=str)
+    df.to_csv(csv_path, index=False)
+    store = DataStore(team_path=str(csv_path), cache_dir=str(tmp_path / "cache"))
+    before = store.team_summary().summary('LAL')['PTS']
+
+    rows = df['TEAM_ABBR'] == 'LAL'
+    df.loc[rows, 'PTS'] = (df.loc[rows, 'PTS'].astype(float) + 50).astype(str)
+    df.to_csv(csv_path, index=False)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert store.team_games_for('LAL')['PTS'].mean() == pytest.approx(before + 50)
+    assert store.team_summary().summary('LAL')['PTS'] == pytest.approx(before + 50)
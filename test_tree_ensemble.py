@@ -0,0 +1,46 @@
+import os
+import pickle
+import numpy as np
+import xgboost as xgb
+
+from ml_models.tree_ensemble import TreeEnsemble
+from ml_models.predict_winner import TeamPredictionModel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'ml_models')
+
+
+def load_booster():
+    with open(os.path.join(MODEL_DIR, "xgb_model.pkl"), "rb") as f:
+        return pickle.load(f).get_booster()
+
+
+def random_features(n_rows, n_features, missing_rate=0.1):
+    rng = np.random.default_rng(42)
+    features = rng.normal(size=(n_rows, n_features))
+    features[rng.random(features.shape) < missing_rate] = np.nan
+    return features
+
+
+def test_margins_match_xgboost():
+    booster = load_booster()
+    ensemble = TreeEnsemble.from_booster(booster)
+    features = random_features(1000, booster.num_features())
+
+    expected = booster.predict(xgb.DMatrix(features), output_margin=True)
+    actual = ensemble.predict_margin(features)
+
+    assert np.allclose(actual, expected, rtol=0, atol=1e-4)
+
+
+def test_numpy_backend_matches_xgboost_backend():
+    bundle_path = os.path.join(MODEL_DIR, "model_bundle.bin")
+    xgboost_model = TeamPredictionModel.from_bundle(bundle_path, backend='xgboost')
+    numpy_model = TeamPredictionModel.from_bundle(bundle_path, backend='numpy')
+
+    features = random_features(200, 53, missing_rate=0)
+    expected = xgboost_model.score_features(features)
+    actual = numpy_model.score_features(features)
+
+    assert numpy_model.model is None
+    assert np.allclose(actual, expected, rtol=0, atol=1e-5)
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from ml_models.data_store import get_data_store
+from ml_models.feature_cache import TeamFeatureCache
+from ml_models.micro_batcher import PredictionBatcher
+from ml_models.predict_winner import TeamPredictionModel
+from ml_models.team_contributions import CONTRIBUTION_STATS
+from ml_models.what_if import WhatIfEngine, absence_delta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_bundle.bin')
+
+
+def test_removed_players_are_subtracted_and_rescored():
+    store = get_data_store()
+    engine = WhatIfEngine(store)
+    lebron = store.player_index().player_id("LeBron James")
+
+    baseline = engine.baseline_stats('LAL')
+    adjusted = engine.adjusted_stats('LAL', [lebron])
+    contributions = store.team_contributions()
+    delta = absence_delta(contributions.team_vector(baseline['TEAM_ID']),
+                          contributions.contribution(baseline['TEAM_ID'], lebron))
+    assert adjusted['PTS'] == pytest.approx(baseline['PTS'] - delta[CONTRIBUTION_STATS.index('PTS')])
+    assert adjusted['PTS'] < baseline['PTS']
+    assert adjusted['MIN'] == baseline['MIN']
+    assert adjusted['FGA'] == baseline['FGA']
+    assert adjusted['FG_PCT'] == pytest.approx(adjusted['FGM'] / adjusted['FGA'])
+    assert engine.adjusted_stats('LAL', [lebron]) is adjusted
+    assert engine.adjusted_stats('BOS', [lebron]) is engine.baseline_stats('BOS')
+
+    model = TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy')
+    cache = TeamFeatureCache(model)
+    result = engine.score(PredictionBatcher(cache), cache, 'LAL', 'BOS', [lebron])
+    expected = model.predict(adjusted, engine.baseline_stats('BOS'))
+    assert result['adjusted']['team1_win_prob'] == pytest.approx(expected['team1_win_prob'], rel=1e-5)
+    assert result['baseline']['team1_win_prob'] == pytest.approx(
+        model.predict(baseline, engine.baseline_stats('BOS'))['team1_win_prob'], rel=1e-5)
+
+
+def test_scan_matches_scoring_each_absence():
+    store = get_data_store()
+    engine = WhatIfEngine(store)
+    model = TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy')
+    cache = TeamFeatureCache(model)
+
+    scan = engine.scan(cache, 'LAL', 'BOS', max_pairs=3)
+    lal_singles = [single for single in scan['singles'] if single['team'] == 'LAL']
+    assert {single['player_ids'][0] for single in lal_singles} == set(store.player_aggregates().team_table('LAL').index)
+    assert len(scan['pairs']) == 6
+
+    for scenario in [lal_singles[0], scan['singles'][-1], scan['pairs'][0], scan['pairs'][-1]]:
+        team1 = engine.adjusted_stats('LAL', scenario['player_ids'] if scenario['team'] == 'LAL' else [])
+        team2 = engine.adjusted_stats('BOS', scenario['player_ids'] if scenario['team'] == 'BOS' else [])
+        expected = model.predict(team1, team2)
+        assert scenario['team1_win_prob'] == pytest.approx(expected['team1_win_prob'], rel=1e-5)
+
+
+def test_scan_pair_candidates_are_capped_at_the_roster():
+    store = get_data_store()
+    engine = WhatIfEngine(store)
+    cache = TeamFeatureCache(TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy'))
+    roster = max(len(store.player_aggregates().team_table(abbr)) for abbr in ['LAL', 'BOS'])
+
+    capped = engine.scan(cache, 'LAL', 'BOS', max_pairs=200, pair_candidates=roster)
+    uncapped = engine.scan(cache, 'LAL', 'BOS', max_pairs=200, pair_candidates=10 ** 6)
+    assert [pair['player_ids'] for pair in uncapped['pairs']] == [pair['player_ids'] for pair in capped['pairs']]
+    assert engine.scan(cache, 'LAL', 'BOS', max_pairs=5, pair_candidates=-3)['pairs'] == []
+
+
+def test_absent_minutes_are_refilled_by_the_rest_of_the_roster():
+    store = get_data_store()
+    contributions = store.team_contributions()
+    team_id = contributions.team_id('LAL')
+    line = contributions.team_vector(team_id)
+    lebron = store.player_index().player_id("LeBron James")
+    removed = contributions.contribution(team_id, lebron)
+    delta = absence_delta(line, removed)
+    column = {stat: i for i, stat in enumerate(CONTRIBUTION_STATS)}
+
+    # The others play his minutes at their own rates and take his shots and rebounds
+    remaining = line - removed
+    assert delta[column['MINUTES']] == pytest.approx(0.0)
+    assert delta[column['AST']] == pytest.approx(
+        removed[column['AST']] - remaining[column['AST']] * removed[column['MINUTES']] / remaining[column['MINUTES']])
+    assert delta[column['REB']] == 0.0 and delta[column['FGA']] == 0.0
+    assert line[column['FGM']] - delta[column['FGM']] == pytest.approx(
+        line[column['FGA']] * remaining[column['FGM']] / remaining[column['FGA']])
+    np.testing.assert_allclose(absence_delta(line, np.vstack([removed, removed * 0])), [delta, np.zeros_like(delta)],
+                               atol=1e-12)
+
+
+def test_single_absences_move_the_matchup_a_bounded_amount():
+    engine = WhatIfEngine(get_data_store())
+    cache = TeamFeatureCache(TeamPredictionModel.from_bundle(BUNDLE_PATH, backend='numpy'))
+    scan = engine.scan(cache, 'LAL', 'BOS')
+    baseline = float(scan['baseline']['team1_win_prob'])
+    swings = {single['player_names'][0]: single['team1_win_prob'] - baseline for single in scan['singles']}
+    assert max(abs(swing) for swing in swings.values()) < 0.1
+    assert swings["LeBron James"] < 0